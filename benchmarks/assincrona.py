@@ -0,0 +1,70 @@
+from pdde.pdde import PDDE
+from utils.leituraentrada import LeituraEntrada
+
+import os
+import logging
+import argparse
+from typing import Tuple
+import coloredlogs  # type: ignore
+logger = logging.getLogger(__name__)
+
+
+def executa(entrada: str,
+            workers: int,
+            assincrona: bool) -> Tuple[int, float, float]:
+    """
+    Resolve um estudo de PDDE de forma síncrona ou assíncrona,
+    retornando o número de cortes gerados, o tempo gasto para
+    gerá-los e o Z_INF final.
+    """
+    e = LeituraEntrada(entrada, "WARNING")
+    e.le_arquivo()
+    pdde = PDDE(e, "WARNING", workers=workers, assincrona=assincrona)
+    pdde.resolve_pdde()
+    # O último limite é o da simulação final
+    return pdde.n_cortes_gerados, pdde.tempo_cortes(), pdde.z_inf[-2]
+
+
+def main():
+    str_descrip = ("Compara a vazão de cortes da PDDE síncrona e " +
+                   "assíncrona.\n")
+    parser = argparse.ArgumentParser(description=str_descrip)
+    parser.add_argument("entradas",
+                        type=str,
+                        nargs="*",
+                        default=["tests/exemplos/EX_PDDE.txt",
+                                 "tests/PMO_DEZ_2020/SE/PDDE_SE_4P.txt"],
+                        help="lista de caminhos relativos das entradas")
+    parser.add_argument("-w", "--workers",
+                        dest="w",
+                        type=int,
+                        default=4,
+                        help="número de processos usados na PDDE")
+    parser.add_argument("-l", "--log",
+                        dest="l",
+                        type=str,
+                        default="INFO",
+                        help="nível de logging desejado ao executar")
+    args = parser.parse_args()
+    coloredlogs.install(logger=logger, level=args.l)
+
+    logger.info("# PDDE SÍNCRONA x ASSÍNCRONA ({} PROCESSOS) #".
+                format(args.w))
+    logger.info("X--------------------X-----------X--------" +
+                "X-----------X-----------X-------------------X")
+    logger.info(" ESTUDO               MODO         CORTES  " +
+                " TEMPO (s)   CORTES/S          Z_INF         ")
+    for entrada in args.entradas:
+        nome = os.path.splitext(os.path.basename(entrada))[0]
+        for assincrona, modo in [(False, "SÍNCRONA"),
+                                 (True, "ASSÍNCRONA")]:
+            n, t, z_inf = executa(entrada, args.w, assincrona)
+            logger.info(" {:19}  {:>10} {:8} {:11.3f} {:11.2f} {:19.6f}".
+                        format(nome[:19], modo, n, t, n / max([t, 1e-9]),
+                               z_inf))
+    logger.info("X--------------------X-----------X--------" +
+                "X-----------X-----------X-------------------X")
+
+
+if __name__ == "__main__":
+    main()
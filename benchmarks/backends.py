@@ -0,0 +1,85 @@
+from modelos.metodo import Metodo
+from modelos.resultado import Resultado
+from resolvedores.backend import Backend
+from utils.leituraentrada import LeituraEntrada
+
+import os
+import time
+import logging
+import argparse
+from glob import glob
+from typing import Dict, List, Tuple
+import coloredlogs  # type: ignore
+logger = logging.getLogger(__name__)
+
+
+def custo_resultado(resultado: Resultado) -> float:
+    """
+    Valor de comparação entre backends: o último Z_inf para os métodos
+    de PDDx e a função objetivo para o PL Único.
+    """
+    if len(resultado.z_inf) > 0:
+        return resultado.z_inf[-1]
+    return resultado.cenarios[0].fobj[0]
+
+
+def executa(entrada: str, backend: Backend) -> Tuple[float, float]:
+    """
+    Resolve um estudo com o backend fornecido, retornando o tempo de
+    solução e o custo obtido.
+    """
+    e = LeituraEntrada(entrada, "WARNING")
+    e.le_arquivo()
+    metodo = Metodo.obtem_metodo_pelo_nome(e.cfg.metodo)
+    ti = time.time()
+    resultado = metodo.resolve(e, "WARNING", backend)
+    tf = time.time()
+    return tf - ti, custo_resultado(resultado)
+
+
+def main():
+    str_descrip = ("Compara o tempo de solução dos estudos de exemplo " +
+                   "com cada backend de PL.\n")
+    parser = argparse.ArgumentParser(description=str_descrip)
+    parser.add_argument("entradas",
+                        type=str,
+                        nargs="*",
+                        default=sorted(glob("tests/exemplos/*.txt")),
+                        help="lista de caminhos relativos das entradas")
+    parser.add_argument("-l", "--log",
+                        dest="l",
+                        type=str,
+                        default="INFO",
+                        help="nível de logging desejado ao executar")
+    args = parser.parse_args()
+    coloredlogs.install(logger=logger, level=args.l)
+
+    backends = [b for b in Backend]
+    logger.info("# COMPARAÇÃO DE BACKENDS DE PL #")
+    logger.info("X--------------------X" + "----------X" * len(backends) +
+                "--------------X")
+    logger.info(" ESTUDO              " +
+                "".join([" {:>9}".format(b.value.upper() + " (s)")
+                         for b in backends]) +
+                "   MAIOR DIF. CUSTO")
+    totais: Dict[Backend, float] = {b: 0.0 for b in backends}
+    for entrada in args.entradas:
+        tempos: List[float] = []
+        custos: List[float] = []
+        for b in backends:
+            t, custo = executa(entrada, b)
+            totais[b] += t
+            tempos.append(t)
+            custos.append(custo)
+        nome = os.path.splitext(os.path.basename(entrada))[0]
+        logger.info(" {:19}".format(nome[:19]) +
+                    "".join([" {:9.3f}".format(t) for t in tempos]) +
+                    "   {:e}".format(max(custos) - min(custos)))
+    logger.info("X--------------------X" + "----------X" * len(backends) +
+                "--------------X")
+    logger.info(" {:19}".format("TOTAL") +
+                "".join([" {:9.3f}".format(totais[b]) for b in backends]))
+
+
+if __name__ == "__main__":
+    main()
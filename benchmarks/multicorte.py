@@ -0,0 +1,66 @@
+from pdde.pdde import PDDE
+from utils.leituraentrada import LeituraEntrada
+
+import os
+import time
+import logging
+import argparse
+from glob import glob
+from typing import Tuple
+import coloredlogs  # type: ignore
+logger = logging.getLogger(__name__)
+
+
+def executa(entrada: str, multicorte: bool) -> Tuple[int, float, float]:
+    """
+    Resolve um estudo de PDDE com corte único ou multicorte,
+    retornando o número de iterações, o tempo e o Z_INF final.
+    """
+    e = LeituraEntrada(entrada, "WARNING")
+    e.le_arquivo()
+    e.cfg.multicorte = multicorte
+    pdde = PDDE(e, "WARNING")
+    ti = time.time()
+    pdde.resolve_pdde()
+    tf = time.time()
+    # O último limite é o da simulação final
+    iteracoes = len(pdde.z_inf) - 1
+    return iteracoes, tf - ti, pdde.z_inf[-2]
+
+
+def main():
+    str_descrip = ("Compara as iterações e o tempo da PDDE com corte " +
+                   "único e multicorte.\n")
+    parser = argparse.ArgumentParser(description=str_descrip)
+    parser.add_argument("entradas",
+                        type=str,
+                        nargs="*",
+                        default=sorted(glob("tests/exemplos/" +
+                                            "EX_PDDE_CVAR*.txt")),
+                        help="lista de caminhos relativos das entradas")
+    parser.add_argument("-l", "--log",
+                        dest="l",
+                        type=str,
+                        default="INFO",
+                        help="nível de logging desejado ao executar")
+    args = parser.parse_args()
+    coloredlogs.install(logger=logger, level=args.l)
+
+    logger.info("# CORTE ÚNICO x MULTICORTE NA PDDE #")
+    logger.info("X--------------------X------------X------" +
+                "X-----------X-------------------X")
+    logger.info(" ESTUDO               FORMULAÇÃO     IT.  " +
+                " TEMPO (s)         Z_INF         ")
+    for entrada in args.entradas:
+        nome = os.path.splitext(os.path.basename(entrada))[0]
+        for multicorte, formulacao in [(False, "CORTE ÚNICO"),
+                                       (True, "MULTICORTE")]:
+            it, t, z_inf = executa(entrada, multicorte)
+            logger.info(" {:19}  {:>11} {:6} {:11.3f} {:19.6f}".
+                        format(nome[:19], formulacao, it, t, z_inf))
+    logger.info("X--------------------X------------X------" +
+                "X-----------X-------------------X")
+
+
+if __name__ == "__main__":
+    main()
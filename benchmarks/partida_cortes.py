@@ -0,0 +1,95 @@
+from modelos.resultado import Resultado
+from pddd.pddd import PDDD
+from pdde.pdde import PDDE
+from utils.arquivocortes import ArquivoCortes
+from utils.leituraentrada import LeituraEntrada
+
+import os
+import logging
+import argparse
+import tempfile
+from typing import Optional
+import coloredlogs  # type: ignore
+logger = logging.getLogger(__name__)
+
+
+def executa(entrada: str,
+            cortes_iniciais: Optional[ArquivoCortes] = None) -> Resultado:
+    """
+    Resolve um estudo de PDDD ou PDDE, opcionalmente partindo de
+    cortes de um estudo anterior.
+    """
+    e = LeituraEntrada(entrada, "WARNING")
+    e.le_arquivo()
+    if e.cfg.metodo == "PDDD":
+        return PDDD(e,
+                    "WARNING",
+                    cortes_iniciais=cortes_iniciais).resolve_pddd()
+    elif e.cfg.metodo == "PDDE":
+        return PDDE(e,
+                    "WARNING",
+                    cortes_iniciais=cortes_iniciais).resolve_pdde()
+    raise Exception("Método sem cortes: {}".format(e.cfg.metodo))
+
+
+def main():
+    str_descrip = ("Compara as iterações de um estudo partindo do zero " +
+                   "e partindo dos cortes de um estudo anterior.\n")
+    parser = argparse.ArgumentParser(description=str_descrip)
+    parser.add_argument("entradas",
+                        type=str,
+                        nargs="*",
+                        default=["tests/PMO_DEZ_2020/SE/PDDD_SE_4P.txt",
+                                 "tests/PMO_DEZ_2020/SE/PDDE_SE_4P.txt"],
+                        help="lista de caminhos relativos das entradas")
+    parser.add_argument("--anterior",
+                        dest="a",
+                        type=str,
+                        default="",
+                        help="estudo anterior que gera os cortes " +
+                        "(por padrão, o próprio estudo)")
+    parser.add_argument("--deslocamento-cortes",
+                        dest="dc",
+                        type=int,
+                        default=0,
+                        help="períodos que o horizonte avançou em " +
+                        "relação ao estudo anterior")
+    parser.add_argument("-l", "--log",
+                        dest="l",
+                        type=str,
+                        default="INFO",
+                        help="nível de logging desejado ao executar")
+    args = parser.parse_args()
+    coloredlogs.install(logger=logger, level=args.l)
+
+    logger.info("# PARTIDA A PARTIR DE CORTES ANTERIORES #")
+    logger.info("X--------------------X----------X----------X" +
+                "----------X")
+    logger.info(" ESTUDO                  IT. FRIA  IT. CORTES" +
+                "  ECONOMIA ")
+    with tempfile.TemporaryDirectory() as diretorio:
+        for entrada in args.entradas:
+            nome = os.path.splitext(os.path.basename(entrada))[0]
+            # O último limite é o da simulação final
+            fria = executa(entrada)
+            it_fria = len(fria.z_inf) - 1
+            anterior = fria
+            if args.a != "":
+                anterior = executa(args.a)
+            arquivo = ArquivoCortes(os.path.join(diretorio,
+                                                 nome + ".npz"),
+                                    args.dc)
+            arquivo.escreve(anterior)
+            quente = executa(entrada, arquivo)
+            it_quente = len(quente.z_inf) - 1
+            logger.info(" {:19}  {:10} {:10} {:10}".
+                        format(nome[:19],
+                               it_fria,
+                               it_quente,
+                               it_fria - it_quente))
+    logger.info("X--------------------X----------X----------X" +
+                "----------X")
+
+
+if __name__ == "__main__":
+    main()
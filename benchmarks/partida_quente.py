@@ -0,0 +1,82 @@
+from modelos.subproblema import Subproblema
+from pddd.pddd import PDDD
+from pdde.pdde import PDDE
+from resolvedores.backend import Backend
+from utils.leituraentrada import LeituraEntrada
+
+import os
+import time
+import logging
+import argparse
+from typing import List, Tuple
+import coloredlogs  # type: ignore
+logger = logging.getLogger(__name__)
+
+
+def executa(entrada: str, backend: Backend) -> Tuple[float, int, int]:
+    """
+    Resolve um estudo de PDDD ou PDDE com o backend fornecido,
+    retornando o tempo, o total de iterações do simplex e o número
+    de PLs resolvidos.
+    """
+    e = LeituraEntrada(entrada, "WARNING")
+    e.le_arquivo()
+    if e.cfg.metodo == "PDDD":
+        pddd = PDDD(e, "WARNING", backend)
+        ti = time.time()
+        pddd.resolve_pddd()
+        subproblemas: List[Subproblema] = pddd.subproblemas
+    elif e.cfg.metodo == "PDDE":
+        pdde = PDDE(e, "WARNING", backend)
+        ti = time.time()
+        pdde.resolve_pdde()
+        subproblemas = pdde.subproblemas
+    else:
+        raise Exception("Método sem subproblemas: {}".format(e.cfg.metodo))
+    tf = time.time()
+    iteracoes = sum([s.iteracoes for s in subproblemas])
+    solucoes = sum([s.n_solucoes for s in subproblemas])
+    return tf - ti, iteracoes, solucoes
+
+
+def main():
+    str_descrip = ("Compara as iterações do simplex com e sem partida " +
+                   "quente entre as soluções de um mesmo subproblema.\n")
+    parser = argparse.ArgumentParser(description=str_descrip)
+    parser.add_argument("entradas",
+                        type=str,
+                        nargs="*",
+                        default=["tests/exemplos/EX_PDDD.txt",
+                                 "tests/exemplos/EX_PDDE.txt",
+                                 "tests/PMO_DEZ_2020/SE/PDDE_SE_4P.txt"],
+                        help="lista de caminhos relativos das entradas")
+    parser.add_argument("-l", "--log",
+                        dest="l",
+                        type=str,
+                        default="INFO",
+                        help="nível de logging desejado ao executar")
+    args = parser.parse_args()
+    coloredlogs.install(logger=logger, level=args.l)
+
+    logger.info("# PARTIDA QUENTE DO SIMPLEX (HIGHSPY) #")
+    logger.info("X--------------------X-------X-----------X" +
+                "-------------X---------X")
+    logger.info(" ESTUDO               PARTIDA  TEMPO (s)  " +
+                "  ITERAÇÕES    IT./PL ")
+    for entrada in args.entradas:
+        nome = os.path.splitext(os.path.basename(entrada))[0]
+        for backend, partida in [(Backend.HIGHSPY_FRIO, "FRIA"),
+                                 (Backend.HIGHSPY, "QUENTE")]:
+            t, iteracoes, solucoes = executa(entrada, backend)
+            logger.info(" {:19}  {:>6} {:11.3f} {:13} {:9.2f}".
+                        format(nome[:19],
+                               partida,
+                               t,
+                               iteracoes,
+                               iteracoes / max([solucoes, 1])))
+    logger.info("X--------------------X-------X-----------X" +
+                "-------------X---------X")
+
+
+if __name__ == "__main__":
+    main()
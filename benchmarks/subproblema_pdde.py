@@ -0,0 +1,167 @@
+from modelos.conjuntocortes import ConjuntoCortes
+from modelos.subproblema import Subproblema
+from pdde.pdde import PDDE
+from utils.leituraentrada import LeituraEntrada
+
+import time
+import logging
+import argparse
+from typing import List, Tuple
+import coloredlogs  # type: ignore
+from cvxopt.modeling import variable, op, solvers  # type: ignore
+solvers.options['glpk'] = {'msg_lev': 'GLP_MSG_OFF'}
+logger = logging.getLogger(__name__)
+
+# Instância de subproblema: (período, volumes iniciais, afluências, cortes)
+Instancia = Tuple[int, List[float], List[float], ConjuntoCortes]
+
+
+def coleta_instancias(pdde: PDDE) -> List[Instancia]:
+    """
+    Extrai, a partir de um estudo de PDDE já resolvido, os subproblemas
+    de todas as aberturas da backward de cada dente e período.
+    """
+    cfg = pdde.cfg
+    instancias: List[Instancia] = []
+    for p in range(cfg.n_periodos):
+        for dente in pdde.pente.dentes:
+            if p == 0:
+                vis = [float(uh.vol_inicial) for uh in pdde.uhes]
+            else:
+                vis = dente[p - 1].volumes_finais
+            cortes = ConjuntoCortes(len(pdde.uhes))
+            if p < cfg.n_periodos - 1:
+                cortes = dente[p + 1].cortes
+            for a in range(cfg.aberturas_periodo):
+                afls = pdde.pente.afluencias_abertura(p, a)
+                instancias.append((p, vis, afls, cortes))
+    return instancias
+
+
+def resolve_legado(pdde: PDDE, instancias: List[Instancia]) -> List[float]:
+    """
+    Resolve as instâncias reconstruindo o PL com cvxopt.modeling a cada
+    solução, como era feito antes dos subproblemas persistentes.
+    """
+    uhes = pdde.uhes
+    utes = pdde.utes
+    fobjs: List[float] = []
+    for p, vis, afls, cortes in instancias:
+        vf = variable(len(uhes), "Volume final (hm3)")
+        vt = variable(len(uhes), "Volume turbinado (hm3)")
+        vv = variable(len(uhes), "Volume vertido (hm3)")
+        gt = variable(len(utes), "Geração térmica (MWmed)")
+        deficit = variable(1, "Déficit (MWmed)")
+        alpha = variable(1, "Custo futuro ($)")
+        func_objetivo = 0
+        for i, ut in enumerate(utes):
+            func_objetivo += ut.custo * gt[i]
+        func_objetivo += pdde.cfg.custo_deficit * deficit[0]
+        for i in range(len(uhes)):
+            func_objetivo += 0.01 * vv[i]
+        func_objetivo += 1.0 * alpha[0]
+        cons = []
+        for i in range(len(uhes)):
+            cons.append(vf[i] == float(vis[i]) + float(afls[i]) -
+                        vt[i] - vv[i])
+        gerado = 0
+        for i, uh in enumerate(uhes):
+            gerado += float(uh.produtividade) * vt[i]
+        for i in range(len(utes)):
+            gerado += gt[i]
+        gerado += deficit[0]
+        cons.append(gerado == float(pdde.demandas[p].demanda))
+        for i, uh in enumerate(uhes):
+            cons.append(vf[i] <= uh.vol_maximo)
+            cons.append(vf[i] >= uh.vol_minimo)
+            cons.append(vt[i] <= uh.engolimento)
+            cons.append(vt[i] >= 0)
+            cons.append(vv[i] >= 0)
+        for i, ut in enumerate(utes):
+            cons.append(gt[i] >= 0)
+            cons.append(gt[i] <= ut.capacidade)
+        cons.append(deficit[0] >= 0)
+        cons.append(alpha[0] >= 0)
+        for coefs, termo in zip(cortes.coefs, cortes.termos):
+            eq = 0.
+            for i in range(len(uhes)):
+                eq += float(coefs[i]) * vf[i]
+            eq += float(termo)
+            cons.append(alpha[0] >= eq)
+        pl = op(func_objetivo, cons)
+        pl.solve("dense", "glpk")
+        fobjs.append(func_objetivo.value()[0])
+    return fobjs
+
+
+def resolve_subproblemas(pdde: PDDE,
+                         instancias: List[Instancia]) -> List[float]:
+    """
+    Resolve as instâncias com um subproblema persistente por período,
+    alterando somente o lado direito e os cortes entre as soluções.
+    """
+    subproblemas = [Subproblema(pdde.cfg,
+                                pdde.uhes,
+                                pdde.utes,
+                                pdde.demandas[p])
+                    for p in range(pdde.cfg.n_periodos)]
+    fobjs: List[float] = []
+    for p, vis, afls, cortes in instancias:
+        subproblema = subproblemas[p]
+        subproblema.sincroniza_cortes(cortes.coefs, cortes.termos)
+        subproblema.atualiza_rhs(vis, afls)
+        subproblema.resolve()
+        fobjs.append(subproblema.fobj)
+    return fobjs
+
+
+def main():
+    str_descrip = ("Compara as soluções por segundo dos subproblemas da " +
+                   "PDDE reconstruídos a cada solução e persistentes.\n")
+    parser = argparse.ArgumentParser(description=str_descrip)
+    parser.add_argument("entrada",
+                        type=str,
+                        nargs="?",
+                        default="tests/PMO_DEZ_2020/SE/PDDE_SE_4P.txt",
+                        help="caminho relativo da entrada")
+    parser.add_argument("-l", "--log",
+                        dest="l",
+                        type=str,
+                        default="INFO",
+                        help="nível de logging desejado ao executar")
+    args = parser.parse_args()
+    coloredlogs.install(logger=logger, level=args.l)
+
+    e = LeituraEntrada(args.entrada, "WARNING")
+    e.le_arquivo()
+    pdde = PDDE(e, "WARNING")
+    pdde.resolve_pdde()
+    instancias = coleta_instancias(pdde)
+    n = len(instancias)
+
+    ti = time.time()
+    fobjs_legado = resolve_legado(pdde, instancias)
+    t_legado = time.time() - ti
+    ti = time.time()
+    fobjs_subproblemas = resolve_subproblemas(pdde, instancias)
+    t_subproblemas = time.time() - ti
+    desvio = max([abs(f1 - f2) for f1, f2 in zip(fobjs_legado,
+                                                 fobjs_subproblemas)])
+
+    logger.info("# SUBPROBLEMAS DA PDDE: {} #".format(args.entrada))
+    logger.info("X-----------------X--------------X--------------X")
+    logger.info("      MODELO         TEMPO (s)      PLs / s     ")
+    logger.info(" {:16} {:14.4f} {:14.2f}".format("RECONSTRUÍDO",
+                                                  t_legado,
+                                                  n / t_legado))
+    logger.info(" {:16} {:14.4f} {:14.2f}".format("PERSISTENTE",
+                                                  t_subproblemas,
+                                                  n / t_subproblemas))
+    logger.info("X-----------------X--------------X--------------X")
+    logger.info(" NÚM. PLs: {}   ACELERAÇÃO: {:6.2f}x".
+                format(n, t_legado / t_subproblemas))
+    logger.info(" MAIOR DIFERENÇA NA FUNÇÃO OBJETIVO: {:e}".format(desvio))
+
+
+if __name__ == "__main__":
+    main()
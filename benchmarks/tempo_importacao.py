@@ -0,0 +1,106 @@
+import os
+import sys
+import logging
+import argparse
+import subprocess
+from typing import Dict, List
+import coloredlogs  # type: ignore
+logger = logging.getLogger(__name__)
+
+# Módulos que não devem ser importados na inicialização do main.py,
+# somente quando o respectivo método ou os gráficos forem utilizados
+PROIBIDOS = ["matplotlib",
+             "cvxopt",
+             "scipy",
+             "highspy",
+             "plunico.plunico",
+             "pddd.pddd",
+             "pdde.pdde",
+             "utils.graficos",
+             "utils.visual",
+             "utils.multivisual"]
+
+
+def tempos_importacao(modulo: str) -> Dict[str, int]:
+    """
+    Importa um módulo em um novo interpretador com -X importtime e
+    retorna o tempo acumulado de importação de cada módulo, em us.
+    """
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    processo = subprocess.run([sys.executable,
+                               "-X",
+                               "importtime",
+                               "-c",
+                               "import {}".format(modulo)],
+                              cwd=raiz,
+                              stdout=subprocess.PIPE,
+                              stderr=subprocess.PIPE,
+                              universal_newlines=True)
+    if processo.returncode != 0:
+        raise Exception("Erro ao importar {}:\n{}".format(modulo,
+                                                          processo.stderr))
+    # Linhas no formato "import time: self | acumulado | módulo"
+    tempos: Dict[str, int] = {}
+    for linha in processo.stderr.splitlines():
+        if not linha.startswith("import time:"):
+            continue
+        campos = linha[len("import time:"):].split("|")
+        if len(campos) != 3 or not campos[1].strip().isdigit():
+            continue
+        tempos[campos[2].strip()] = int(campos[1])
+    return tempos
+
+
+def main():
+    str_descrip = ("Verifica o tempo de importação do main.py e se " +
+                   "os métodos e os gráficos são importados somente " +
+                   "quando utilizados. Termina com erro se o " +
+                   "orçamento for excedido.\n")
+    parser = argparse.ArgumentParser(description=str_descrip)
+    parser.add_argument("-o", "--orcamento",
+                        dest="o",
+                        type=float,
+                        default=1000.0,
+                        help="tempo máximo de importação (ms)")
+    parser.add_argument("-n", "--repeticoes",
+                        dest="n",
+                        type=int,
+                        default=5,
+                        help="número de medições, das quais vale a menor")
+    parser.add_argument("-l", "--log",
+                        dest="l",
+                        type=str,
+                        default="INFO",
+                        help="nível de logging desejado ao executar")
+    args = parser.parse_args()
+    coloredlogs.install(logger=logger, level=args.l)
+
+    medicoes: List[Dict[str, int]] = [tempos_importacao("main")
+                                      for _ in range(args.n)]
+    tempo = min([m["main"] for m in medicoes]) / 1000
+    importados = [p for p in PROIBIDOS
+                  if any([p in m for m in medicoes])]
+    logger.info("# TEMPO DE IMPORTAÇÃO DO main.py #")
+    logger.info(" MENOR TEMPO (ms):   {:9.1f}".format(tempo))
+    logger.info(" ORÇAMENTO (ms):     {:9.1f}".format(args.o))
+    # Os módulos mais lentos, para orientar a investigação
+    mais_lentos = sorted(medicoes[0].items(),
+                         key=lambda t: t[1],
+                         reverse=True)[1:6]
+    for nome, t in mais_lentos:
+        logger.info(" {:19} {:9.1f}".format(nome[:19], t / 1000))
+    falhou = False
+    if len(importados) > 0:
+        logger.error("Módulos importados na inicialização: {}".
+                     format(", ".join(importados)))
+        falhou = True
+    if tempo > args.o:
+        logger.error("Tempo de importação acima do orçamento: " +
+                     "{:.1f} ms > {:.1f} ms".format(tempo, args.o))
+        falhou = True
+    if falhou:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
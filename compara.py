@@ -0,0 +1,94 @@
+from modelos.resultado import Resultado
+from utils.arquivoresultado import MANIFESTO, ArquivoResultado
+
+import os
+import time
+import logging
+import argparse
+from typing import List
+import coloredlogs  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+
+def diretorio_resultado(caminho: str) -> str:
+    """
+    Retorna o diretório de resultados a partir do próprio diretório
+    ou do diretório de saída do estudo, que contém resultado/.
+    """
+    if os.path.isfile(os.path.join(caminho, MANIFESTO)):
+        return caminho
+    subdiretorio = os.path.join(caminho, "resultado")
+    if os.path.isfile(os.path.join(subdiretorio, MANIFESTO)):
+        return subdiretorio
+    raise Exception("Resultado não encontrado em {}".format(caminho))
+
+
+def main():
+    # Configura a interface de chamada do programa via linha de
+    # comando (CLI)
+    str_descrip = ("Compara estudos de Planejamento Energético já " +
+                   "resolvidos, a partir dos resultados armazenados " +
+                   "pelo main.py, sem resolvê-los novamente.\n")
+    parser = argparse.ArgumentParser(description=str_descrip)
+    parser.add_argument("resultados",
+                        type=str,
+                        nargs="+",
+                        help="diretórios de saída dos estudos ou os " +
+                        "respectivos diretórios resultado/")
+    parser.add_argument("-l", "--log",
+                        dest="l",
+                        type=str,
+                        default="WARNING",
+                        help="nível de logging desejado ao executar")
+    parser.add_argument("-s", "--saida",
+                        dest="s",
+                        type=str,
+                        default="results/",
+                        help="diretorio raiz dos arquivos de saída")
+    parser.add_argument("-f", "--familias",
+                        dest="f",
+                        type=str,
+                        nargs="+",
+                        default=None,
+                        help="famílias de gráficos geradas (padrão: todas)")
+    parser.add_argument("--plot-workers",
+                        dest="pw",
+                        type=int,
+                        default=1,
+                        help="número de processos usados nos gráficos")
+    # Extrai os parâmetros fornecidos para a execução do programa
+    args = parser.parse_args()
+    if args.l not in ["CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG"]:
+        raise Exception("Nível de LOG fornecido inválido")
+    if args.pw < 1:
+        raise Exception("Número de processos dos gráficos inválido")
+    LOG_LEVEL = args.l
+    coloredlogs.install(logger=logger, level=args.l)
+
+    # Lê somente o cenário médio e os históricos de cada estudo. Os
+    # demais arrays permanecem no disco.
+    resultados: List[Resultado] = []
+    for caminho in args.resultados:
+        arquivo = ArquivoResultado(diretorio_resultado(caminho), LOG_LEVEL)
+        resultados.append(arquivo.le(cortes=False, cenarios=False))
+    logger.info("{} estudos lidos".format(len(resultados)))
+
+    # Os módulos de gráficos só são importados após a leitura
+    from utils.graficos import desenha_graficos
+    from utils.multivisual import MultiVisual
+
+    caminho_saida = os.path.join(args.s,
+                                 "compara/{}/".format(int(time.time())))
+    visualizador = MultiVisual(resultados,
+                               caminho_saida,
+                               LOG_LEVEL)
+    graficos = visualizador.graficos(args.f)
+    logger.info("Desenhando {} gráficos com {} processos".
+                format(len(graficos), args.pw))
+    desenha_graficos(graficos, args.pw)
+    logger.info("#### FIM DA COMPARAÇÃO ####")
+
+
+if __name__ == "__main__":
+    main()
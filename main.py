@@ -1,21 +1,58 @@
 # from modelos.configgeral import ConfigGeral
 from modelos.metodo import Metodo
 from modelos.resultado import Resultado
+from resolvedores.backend import Backend
+from utils.arquivocortes import ArquivoCortes
+from utils.arquivoresultado import ArquivoResultado
+from utils.checkpoint import Checkpoint
 from utils.leituraentrada import LeituraEntrada
-from utils.visual import Visual
-from utils.multivisual import MultiVisual
 from utils.escrevesaida import EscreveSaida
 
 import os
 import time
 import logging
 import argparse
-from typing import List
+from typing import List, Optional
 import coloredlogs  # type: ignore
 
 logger = logging.getLogger(__name__)
 
 
+def gera_graficos(resultados: List[Resultado],
+                  caminhos_saida: List[str],
+                  caminho_raiz: str,
+                  workers: int,
+                  completo: bool,
+                  max_trajetorias: int,
+                  LOG_LEVEL: str):
+    """
+    Gera os gráficos de cada estudo e os de comparação entre os
+    estudos, desenhando todos de uma só vez. Os módulos de gráficos,
+    e portanto o matplotlib, só são importados aqui.
+    """
+    from utils.graficos import Grafico, desenha_graficos
+    from utils.visual import Visual
+    from utils.multivisual import MultiVisual
+
+    graficos: List[Grafico] = []
+    for resultado, caminho_saida in zip(resultados, caminhos_saida):
+        visualizador = Visual(resultado,
+                              caminho_saida,
+                              LOG_LEVEL,
+                              completo=completo,
+                              max_trajetorias=max_trajetorias)
+        graficos += visualizador.graficos()
+    caminho_saida = os.path.join(caminho_raiz,
+                                 "multi/{}/".format(int(time.time())))
+    multivisualizador = MultiVisual(resultados,
+                                    caminho_saida,
+                                    LOG_LEVEL)
+    graficos += multivisualizador.graficos()
+    logger.info("Desenhando {} gráficos com {} processos".
+                format(len(graficos), workers))
+    desenha_graficos(graficos, workers)
+
+
 def main():
     # Configura a interface de chamada do programa via linha de
     # comando (CLI)
@@ -36,13 +73,112 @@ def main():
                         type=str,
                         default="results/",
                         help="diretorio raiz dos arquivos de saída")
+    parser.add_argument("-b", "--backend",
+                        dest="b",
+                        type=str,
+                        default="glpk",
+                        choices=[b.value for b in Backend],
+                        help="biblioteca utilizada para resolver os PLs")
+    parser.add_argument("-w", "--workers",
+                        dest="w",
+                        type=int,
+                        default=1,
+                        help="número de processos usados na PDDE")
+    parser.add_argument("-a", "--assincrona",
+                        dest="a",
+                        action="store_true",
+                        help="resolve a PDDE de forma assíncrona")
+    parser.add_argument("-c", "--checkpoint",
+                        dest="c",
+                        type=str,
+                        default="",
+                        help="diretório dos checkpoints da PDDD e da PDDE")
+    parser.add_argument("-i", "--intervalo-checkpoint",
+                        dest="i",
+                        type=int,
+                        default=1,
+                        help="número de iterações entre checkpoints")
+    parser.add_argument("-r", "--resume",
+                        dest="r",
+                        action="store_true",
+                        help="retoma cada estudo do último checkpoint")
+    parser.add_argument("--cortes-iniciais",
+                        dest="ci",
+                        type=str,
+                        default="",
+                        help="arquivo de cortes usados como partida")
+    parser.add_argument("--deslocamento-cortes",
+                        dest="dc",
+                        type=int,
+                        default=0,
+                        help="períodos que o horizonte avançou em " +
+                        "relação aos cortes iniciais")
+    parser.add_argument("--exporta-cortes",
+                        dest="ec",
+                        action="store_true",
+                        help="escreve os cortes finais em cortes.npz")
+    parser.add_argument("--gzip",
+                        dest="gz",
+                        action="store_true",
+                        help="compacta os relatórios de texto com gzip")
+    parser.add_argument("--cenarios-por-arquivo",
+                        dest="cpa",
+                        type=int,
+                        default=0,
+                        help="máximo de cenários detalhados por arquivo " +
+                        "do relatório (0 = todos no relatório principal)")
+    parser.add_argument("--plot-workers",
+                        dest="pw",
+                        type=int,
+                        default=1,
+                        help="número de processos usados nos gráficos")
+    parser.add_argument("--modo-graficos",
+                        dest="mg",
+                        type=str,
+                        default="rapido",
+                        choices=["rapido", "completo"],
+                        help="desenha cada cenário com rótulo e " +
+                        "marcadores (completo) ou uma amostra das " +
+                        "trajetórias com as faixas de quantis (rapido)")
+    parser.add_argument("--max-trajetorias",
+                        dest="mt",
+                        type=int,
+                        default=100,
+                        help="máximo de trajetórias desenhadas por " +
+                        "gráfico no modo rápido")
+    parser.add_argument("--no-plots",
+                        dest="np",
+                        action="store_true",
+                        help="não gera os gráficos")
+    parser.add_argument("--only-report",
+                        dest="sr",
+                        action="store_true",
+                        help="gera somente os relatórios de texto, sem " +
+                        "os gráficos e o resultado binário")
     # Extrai os parâmetros fornecidos para a execução do programa
     args = parser.parse_args()
     if args.l not in ["CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG"]:
         raise Exception("Nível de LOG fornecido inválido")
+    if args.w < 1:
+        raise Exception("Número de processos fornecido inválido")
+    if args.i < 1:
+        raise Exception("Intervalo entre checkpoints fornecido inválido")
+    if args.r and args.c == "":
+        raise Exception("A retomada exige o diretório dos checkpoints")
+    if args.cpa < 0:
+        raise Exception("Número de cenários por arquivo fornecido inválido")
+    if args.pw < 1:
+        raise Exception("Número de processos dos gráficos inválido")
+    if args.mt < 1:
+        raise Exception("Número máximo de trajetórias fornecido inválido")
 
     # Atualiza o nível de LOG desejado
     LOG_LEVEL = args.l
+    backend = Backend.obtem_backend_pelo_nome(args.b)
+    # Cortes de um estudo anterior, usados como partida
+    cortes_iniciais: Optional[ArquivoCortes] = None
+    if args.ci != "":
+        cortes_iniciais = ArquivoCortes(args.ci, args.dc, LOG_LEVEL)
     coloredlogs.install(logger=logger, level=args.l)
 
     # Inicia a execução
@@ -53,29 +189,51 @@ def main():
 
         e = LeituraEntrada(entrada, LOG_LEVEL)
         e.le_arquivo()
+        # Cada estudo tem o seu arquivo de checkpoint
+        checkpoint: Optional[Checkpoint] = None
+        if args.c != "":
+            checkpoint = Checkpoint(os.path.join(args.c,
+                                                 "{}.npz".format(e.cfg.nome)),
+                                    args.i,
+                                    args.r,
+                                    LOG_LEVEL)
         # Determina o método de solução
         metodo = Metodo.obtem_metodo_pelo_nome(e.cfg.metodo)
-        resultados.append(metodo.resolve(e, LOG_LEVEL))
+        resultados.append(metodo.resolve(e,
+                                         LOG_LEVEL,
+                                         backend,
+                                         args.w,
+                                         args.a,
+                                         checkpoint,
+                                         cortes_iniciais))
 
     # Gera relatórios e gráficos de saída
+    caminhos_saida: List[str] = []
     for resultado in resultados:
         caminho_saida = os.path.join(args.s,
                                      "{}/{}/".format(resultado.cfg.nome,
                                                      int(time.time())))
+        caminhos_saida.append(caminho_saida)
         relator = EscreveSaida(resultado,
                                caminho_saida,
-                               LOG_LEVEL)
+                               LOG_LEVEL,
+                               args.gz,
+                               args.cpa)
         relator.escreve_relatorio()
-        visualizador = Visual(resultado,
-                              caminho_saida,
-                              LOG_LEVEL)
-        visualizador.visualiza()
-    caminho_saida = os.path.join(args.s,
-                                 "multi/{}/".format(int(time.time())))
-    visualizador = MultiVisual(resultados,
-                               caminho_saida,
-                               LOG_LEVEL)
-    visualizador.visualiza()
+        if not args.sr:
+            ArquivoResultado(os.path.join(caminho_saida, "resultado"),
+                             LOG_LEVEL).escreve(resultado)
+        if args.ec and resultado.cfg.metodo in ["PDDD", "PDDE"]:
+            ArquivoCortes(os.path.join(caminho_saida, "cortes.npz"),
+                          LOG_LEVEL=LOG_LEVEL).escreve(resultado)
+    if not (args.np or args.sr):
+        gera_graficos(resultados,
+                      caminhos_saida,
+                      args.s,
+                      args.pw,
+                      args.mg == "completo",
+                      args.mt,
+                      LOG_LEVEL)
     logger.info("#### FIM DA EXECUÇÃO ####")
 
 
@@ -1,39 +1,45 @@
-from modelos.cortebenders import CorteBenders
+from modelos.conjuntocortes import ConjuntoCortes
 from modelos.cenario import Cenario
+from modelos.estadonos import EstadoNos
 from utils.leituraentrada import LeituraEntrada
-from modelos.no import No
 
 from copy import deepcopy
-from typing import List
+from typing import List, Optional
 from itertools import product
+import numpy as np  # type: ignore
 
 
 class ArvoreAfluencias:
     """
     Árvore organizada das afluências que definem os cenários
     existentes em um problema de PL Único ou PDDD a ser resolvido.
+    A árvore é implícita: o nó k de um período é definido pelo seu
+    nó anterior, k // c, e pela combinação de afluências do período,
+    k % c, onde c é o número de combinações do período.
     """
     def __init__(self, e: LeituraEntrada):
         self.n_periodos = e.cfg.n_periodos
         self.aberturas_periodo = e.cfg.aberturas_periodo
         self.n_pos_estudo = e.cfg.n_pos_estudo
         self.n_uhes = e.cfg.n_uhes
+        self.n_utes = e.cfg.n_utes
         self.vis = [uh.vol_inicial for uh in e.uhes]
         self.afluencias = deepcopy(e.afluencias)
         self.nos_por_periodo: List[int] = []
-        self.arvore: List[List[No]] = []
+        # Combinações das afluências das UHEs em cada período, com
+        # dimensões [combinação, UHE], compartilhadas pelos nós
+        self.combinacoes: List[np.ndarray] = []
+        # Resultados dos nós de cada período, alocados somente quando
+        # o período é resolvido
+        self.estados: List[Optional[EstadoNos]] = []
+        # Conjuntos de cortes de cada nó, montados somente na PDDD
+        self.cortes: List[List[ConjuntoCortes]] = []
 
     def monta_arvore_afluencias(self):
         """
         Monta uma árvore de afluências a partir dos dados lidos
-        do arquivo de configuração. A árvore é uma lista composta,
-        onde acessar o índice [i][j][k] significa:
-
-        i: ID da UHE
-
-        j: ramo da árvore da UHE i
-
-        k: nó do ramo j
+        do arquivo de configuração, considerando as aberturas de
+        cada período.
         """
         na = self.aberturas_periodo
         # Limite as afluências de cada UHE para o número de aberturas
@@ -42,78 +48,75 @@ class ArvoreAfluencias:
             self.afluencias[i][0] = [self.afluencias[i][0][0]]
             for e in range(1, self.n_periodos):
                 self.afluencias[i][e] = self.afluencias[i][e][:na]
-        # Para cada período de estudo, lista as combinações de afluências
-        combs_periodo: List[List[float]] = []
+        self.__monta_combinacoes()
+
+    def __monta_combinacoes(self):
+        """
+        Lista as combinações das afluências de cada período e conta
+        os nós de cada período.
+        """
+        self.combinacoes = []
         for p in range(self.n_periodos):
             # Varre as afluências de cada UHE
-            afls_periodo: List[float] = []
+            afls_periodo: List[List[float]] = []
             for i in range(1, self.n_uhes + 1):
                 afls_periodo.append(self.afluencias[i][p])
             # Faz o produto para extrair as combinações
             combinacoes = product(*[a for a in afls_periodo])
-            combs_periodo.append([list(c) for c in combinacoes])
-        # Constroi a árvore a partir das combinações de cada período
-        # O primeiro período tem apenas 1 nó:
-        l_no: List[No] = [No(combs_periodo[0][0])]
-        self.arvore.append(l_no)
-        # Cada período seguinte multiplica o número de nós do período
-        # anterior pelo número de combinações do próprio
+            self.combinacoes.append(np.array(list(combinacoes),
+                                             dtype=float))
+        # O primeiro período tem apenas 1 nó e cada período seguinte
+        # multiplica o número de nós do período anterior pelo número
+        # de combinações do próprio
+        self.nos_por_periodo = [1]
         for p in range(1, self.n_periodos):
-            nos_periodo: List[No] = []
-            for nos_periodo_anterior in range(len(self.arvore[p - 1])):
-                for comb_periodo in combs_periodo[p]:
-                    nos_periodo.append(No(comb_periodo))
-            self.arvore.append(nos_periodo)
-        # Faz a contagem de nós por período
-        for a in self.arvore:
-            self.nos_por_periodo.append(len(a))
-        # Força os volumes iniciais do nó do primeiro período
-        self.arvore[0][0].volumes_iniciais = self.vis
+            self.nos_por_periodo.append(self.nos_por_periodo[-1] *
+                                        len(self.combinacoes[p]))
+        self.estados = [None for _ in range(self.n_periodos)]
+
+    def monta_cortes(self):
+        """
+        Cria um conjunto de cortes para cada nó da árvore. Os cortes
+        dos nós irmãos são combinados pela ordem em que foram criados,
+        então os repetidos são mantidos.
+        """
+        self.cortes = [[ConjuntoCortes(self.n_uhes, False)
+                        for _ in range(n_nos)]
+                       for n_nos in self.nos_por_periodo]
 
     def monta_simulacao_final(self, arvore):
         """
+        Monta a árvore da simulação final da PDDD, com os cortes
+        acumulados de todos os nós de cada período da árvore fornecida.
         """
         arvore_atual: ArvoreAfluencias = arvore
         for i in range(1, self.n_uhes + 1):
             # O primeiro período tem apenas uma possível afluência
             self.afluencias[i][0] = [self.afluencias[i][0][0]]
-        # Para cada período de estudo, lista as combinações de afluências
-        combs_periodo: List[List[float]] = []
-        for p in range(self.n_periodos):
-            # Varre as afluências de cada UHE
-            afls_periodo: List[float] = []
-            for i in range(1, self.n_uhes + 1):
-                afls_periodo.append(self.afluencias[i][p])
-            # Faz o produto para extrair as combinações
-            combinacoes = product(*[a for a in afls_periodo])
-            combs_periodo.append([list(c) for c in combinacoes])
-        # Constroi a árvore a partir das combinações de cada período
-        # O primeiro período tem apenas 1 nó:
-        l_no: List[No] = [No(combs_periodo[0][0])]
-        self.arvore.append(l_no)
-        # Cada período seguinte multiplica o número de nós do período
-        # anterior pelo número de combinações do próprio
-        for p in range(1, self.n_periodos):
-            nos_periodo: List[No] = []
-            for nos_periodo_anterior in range(len(self.arvore[p - 1])):
-                for comb_periodo in combs_periodo[p]:
-                    nos_periodo.append(No(comb_periodo))
-            self.arvore.append(nos_periodo)
-        # Faz a contagem de nós por período
-        for a in self.arvore:
-            self.nos_por_periodo.append(len(a))
-        # Força os volumes iniciais do nó do primeiro período
-        self.arvore[0][0].volumes_iniciais = self.vis
-        # Copia os cortes de cada nó da execução anterior
+        self.__monta_combinacoes()
+        # Copia os cortes de cada nó da execução anterior. Todos os
+        # nós de um período da simulação final compartilham o
+        # conjunto com todos os cortes do período.
+        self.cortes = []
         for p in range(self.n_periodos):
-            # Acumula todos os cortes para o período
-            cortes_p: List[CorteBenders] = []
-            for no in arvore_atual.arvore[p]:
-                cortes_p += no.cortes
-            # Atribui todos os cortes a cada nó da árvore de
-            # simulação final
-            for no in self.arvore[p]:
-                no.cortes = cortes_p
+            cortes_p = ConjuntoCortes.concatena(arvore_atual.cortes[p])
+            self.cortes.append([cortes_p] * self.nos_por_periodo[p])
+
+    def estado_periodo(self, periodo: int) -> EstadoNos:
+        """
+        Retorna o armazenamento dos resultados dos nós de um período,
+        indexado pelo nó, alocando-o no primeiro acesso.
+        """
+        estado = self.estados[periodo]
+        if estado is None:
+            n_nos = self.nos_por_periodo[periodo]
+            estado = EstadoNos((n_nos,), self.n_uhes, self.n_utes)
+            estado.afluencias[:] = self.afluencias_nos(periodo)
+            if periodo == 0:
+                # Força os volumes iniciais do nó do primeiro período
+                estado.volumes_iniciais[0, :] = self.vis
+            self.estados[periodo] = estado
+        return estado
 
     def indice_no_anterior(self,
                            periodo: int,
@@ -122,19 +125,42 @@ class ArvoreAfluencias:
         Retorna o índice do nó do período anterior na árvore de afluências
         a partir de um certo nó de um período.
         """
-        n_aberturas_periodo = len(self.afluencias[1][periodo])
-        return int(indice_no / n_aberturas_periodo)
+        return indice_no // len(self.combinacoes[periodo])
+
+    def indices_nos_anteriores(self, periodo: int) -> np.ndarray:
+        """
+        Retorna, para cada nó de um período, o índice do respectivo nó
+        do período anterior na árvore de afluências.
+        """
+        return (np.arange(self.nos_por_periodo[periodo]) //
+                len(self.combinacoes[periodo]))
+
+    def afluencias_no(self, periodo: int, indice_no: int) -> np.ndarray:
+        """
+        Retorna as afluências de cada UHE em um nó de um período.
+        """
+        combinacoes = self.combinacoes[periodo]
+        return combinacoes[indice_no % len(combinacoes)]
+
+    def afluencias_nos(self, periodo: int) -> np.ndarray:
+        """
+        Retorna as afluências de todos os nós de um período, na forma
+        de um array com dimensões [nó, UHE].
+        """
+        combinacoes = self.combinacoes[periodo]
+        indices = np.arange(self.nos_por_periodo[periodo])
+        return combinacoes[indices % len(combinacoes)]
 
     def indices_proximos_nos(self, periodo: int, indice_no: int) -> List[int]:
         """
-        Retorna os índices dos possíveis nós após
+        Retorna os índices dos possíveis nós após um nó de um período.
         """
         if periodo == self.n_periodos - 1:
             return []
         else:
-            n_aberturas_periodo = len(self.afluencias[1][periodo + 1])
-            indice_inicial = n_aberturas_periodo * indice_no
-            indice_final = indice_inicial + n_aberturas_periodo
+            n_combinacoes = len(self.combinacoes[periodo + 1])
+            indice_inicial = n_combinacoes * indice_no
+            indice_final = indice_inicial + n_combinacoes
             return list(range(indice_inicial, indice_final))
 
     def organiza_cenarios(self) -> List[Cenario]:
@@ -143,14 +169,12 @@ class ArvoreAfluencias:
         interesse para cada cenário que aconteceu no estudo realizado.
         """
         n_cenarios = self.nos_por_periodo[-1]
-        cenarios: List[Cenario] = []
-        for c in range(n_cenarios):
-            nos_cenario: List[No] = []
-            indice_no = c
-            for p in range(self.n_periodos - 1, -1, -1):
-                no = self.arvore[p][indice_no]
-                nos_cenario.insert(0, no)
-                indice_no = self.indice_no_anterior(p, indice_no)
-            cen = Cenario.cenario_dos_nos(nos_cenario)
-            cenarios.append(cen)
-        return cenarios
+        # Valores de cada cenário em cada período, com dimensões
+        # [cenário, período, coluna]
+        valores: List[np.ndarray] = []
+        indices_nos = np.arange(n_cenarios)
+        for p in range(self.n_periodos - 1, -1, -1):
+            valores.insert(0, self.estado_periodo(p).valores(indices_nos))
+            indices_nos = indices_nos // len(self.combinacoes[p])
+        return [Cenario.cenario_dos_valores(self.n_uhes, self.n_utes, v)
+                for v in np.stack(valores, axis=1)]
@@ -1,76 +1,104 @@
 from modelos.no import No
 
-from typing import Dict, List
+from typing import List
 import numpy as np  # type: ignore
 
 
 class Cenario:
     """
     Descreve um cenário de operação considerado
-    dentro da árvore de possibilidades.
+    dentro da árvore de possibilidades. Os valores do cenário ficam
+    em um array com dimensões (períodos, colunas), e cada variável é
+    acessada como uma visão desse array: as das usinas com dimensões
+    (usina, período) e as do sistema com dimensão (período,).
     """
     def __init__(self,
                  n_uhes: int,
                  n_utes: int,
-                 afluencias: Dict[int, List[float]],
-                 volumes_finais: Dict[int, List[float]],
-                 volumes_turbinados: Dict[int, List[float]],
-                 volumes_vertidos: Dict[int, List[float]],
-                 custo_agua: Dict[int, List[float]],
-                 geracao_termica: Dict[int, List[float]],
-                 deficit: List[float],
-                 cmo: List[float],
-                 ci: List[float],
-                 alpha: List[float],
-                 fobj: List[float]):
+                 valores: np.ndarray):
 
         self.n_uhes = n_uhes
         self.n_utes = n_utes
-        self.afluencias = afluencias
-        self.volumes_finais = volumes_finais
-        self.volumes_turbinados = volumes_turbinados
-        self.volumes_vertidos = volumes_vertidos
-        self.custo_agua = custo_agua
-        self.geracao_termica = geracao_termica
-        self.deficit: List[float] = deficit
-        self.cmo: List[float] = cmo
-        self.ci = ci
-        self.alpha: List[float] = alpha
-        self.fobj = fobj
+        self.valores = np.asarray(valores, dtype=float)
+
+    def __colunas(self, inicio: int, n_usinas: int) -> np.ndarray:
+        return self.valores[:, inicio:inicio + n_usinas].T
+
+    @property
+    def afluencias(self) -> np.ndarray:
+        return self.__colunas(0, self.n_uhes)
+
+    @property
+    def volumes_finais(self) -> np.ndarray:
+        return self.__colunas(self.n_uhes, self.n_uhes)
+
+    @property
+    def volumes_turbinados(self) -> np.ndarray:
+        return self.__colunas(2 * self.n_uhes, self.n_uhes)
+
+    @property
+    def volumes_vertidos(self) -> np.ndarray:
+        return self.__colunas(3 * self.n_uhes, self.n_uhes)
+
+    @property
+    def custo_agua(self) -> np.ndarray:
+        return self.__colunas(4 * self.n_uhes, self.n_uhes)
+
+    @property
+    def geracao_termica(self) -> np.ndarray:
+        return self.__colunas(5 * self.n_uhes, self.n_utes)
+
+    @property
+    def deficit(self) -> np.ndarray:
+        return self.valores[:, -5]
+
+    @property
+    def cmo(self) -> np.ndarray:
+        return self.valores[:, -4]
+
+    @property
+    def ci(self) -> np.ndarray:
+        return self.valores[:, -3]
+
+    @property
+    def alpha(self) -> np.ndarray:
+        return self.valores[:, -2]
+
+    @property
+    def fobj(self) -> np.ndarray:
+        return self.valores[:, -1]
 
     @classmethod
     def cenario_dos_nos(cls, nos: List[No]):
         """
-        Retorna um objeto cenário a partir de uma lista de cenários,
-        calculando os valores médios para cada parâmetro.
+        Retorna um objeto cenário a partir de uma lista de nós,
+        um para cada período.
         """
         n_uhes = len(nos[0].volumes_finais)
         n_utes = len(nos[0].geracao_termica)
-        afluencias = Cenario.organiza_afluencias(nos)
-        volumes_finais = Cenario.organiza_vol_finais(nos)
-        volumes_turbinados = Cenario.organiza_vol_turbin(nos)
-        volumes_vertidos = Cenario.organiza_vol_vertid(nos)
-        custo_agua = Cenario.organiza_custo_agua(nos)
-        geracao_termica = Cenario.organiza_ger_termica(nos)
-        deficit: List[float] = [n.deficit for n in nos]
-        cmo: List[float] = [n.cmo for n in nos]
-        ci: List[float] = [n.custo_imediato for n in nos]
-        alpha: List[float] = [n.custo_futuro for n in nos]
-        fobj: List[float] = [n.custo_total for n in nos]
-
-        return cls(n_uhes,
-                   n_utes,
-                   afluencias,
-                   volumes_finais,
-                   volumes_turbinados,
-                   volumes_vertidos,
-                   custo_agua,
-                   geracao_termica,
-                   deficit,
-                   cmo,
-                   ci,
-                   alpha,
-                   fobj)
+        sistema = np.array([[n.deficit,
+                             n.cmo,
+                             n.custo_imediato,
+                             n.custo_futuro,
+                             n.custo_total] for n in nos], dtype=float)
+        valores = np.concatenate([Cenario.organiza_afluencias(nos).T,
+                                  Cenario.organiza_vol_finais(nos).T,
+                                  Cenario.organiza_vol_turbin(nos).T,
+                                  Cenario.organiza_vol_vertid(nos).T,
+                                  Cenario.organiza_custo_agua(nos).T,
+                                  Cenario.organiza_ger_termica(nos).T,
+                                  sistema],
+                                 axis=1)
+        return cls(n_uhes, n_utes, valores)
+
+    @staticmethod
+    def valores_cenarios(cens) -> np.ndarray:
+        """
+        Reúne os valores de uma lista de cenários em um único array,
+        com dimensões (cenários, períodos, colunas).
+        """
+        cenarios: List[Cenario] = cens
+        return np.stack([c.valores for c in cenarios])
 
     @classmethod
     def cenario_medio(cls, cens):
@@ -78,68 +106,51 @@ class Cenario:
         Calcula um cenário médio a partir de uma lista de cenários.
         """
         cenarios: List[Cenario] = cens
-        n_uhes = cenarios[0].n_uhes
-        n_utes = cenarios[0].n_utes
-        afluencias_medias: Dict[int, List[float]] = {i: [] for i in
-                                                     range(n_uhes)}
-        vol_finais_medios: Dict[int, List[float]] = {i: [] for i in
-                                                     range(n_uhes)}
-        vol_turbin_medios: Dict[int, List[float]] = {i: [] for i in
-                                                     range(n_uhes)}
-        vol_vertid_medios: Dict[int, List[float]] = {i: [] for i in
-                                                     range(n_uhes)}
-        custo_agua_medios: Dict[int, List[float]] = {i: [] for i in
-                                                     range(n_uhes)}
-        gera_termi_medios: Dict[int, List[float]] = {i: [] for i in
-                                                     range(n_utes)}
-        n_cenarios = len(cenarios)
-        # Calcula os atributos médios das UHEs
-        for i in range(n_uhes):
-            afl_cen = [np.array(c.afluencias[i]) for c in cenarios]
-            vf_cen = [np.array(c.volumes_finais[i]) for c in cenarios]
-            vt_cen = [np.array(c.volumes_turbinados[i]) for c in cenarios]
-            vv_cen = [np.array(c.volumes_vertidos[i]) for c in cenarios]
-            cma_cen = [np.array(c.custo_agua[i]) for c in cenarios]
-            afl_med = sum(afl_cen) / n_cenarios
-            vf_med = sum(vf_cen) / n_cenarios
-            vt_med = sum(vt_cen) / n_cenarios
-            vv_med = sum(vv_cen) / n_cenarios
-            cma_med = sum(cma_cen) / n_cenarios
-            afluencias_medias[i] = list(afl_med)
-            vol_finais_medios[i] = list(vf_med)
-            vol_turbin_medios[i] = list(vt_med)
-            vol_vertid_medios[i] = list(vv_med)
-            custo_agua_medios[i] = list(cma_med)
-        # Calcula os atributos médios das UTEs
-        for i in range(n_utes):
-            ger_cen = [np.array(c.geracao_termica[i]) for c in cenarios]
-            ger_med = sum(ger_cen) / n_cenarios
-            gera_termi_medios[i] = list(ger_med)
-        # Calcula o deficit, cmo, fobj e fcf médios
-        deficit_cen = [np.array(c.deficit) for c in cenarios]
-        cmo_cen = [np.array(c.cmo) for c in cenarios]
-        ci_cen = [np.array(c.ci) for c in cenarios]
-        alpha_cen = [np.array(c.alpha) for c in cenarios]
-        fobj_cen = [np.array(c.fobj) for c in cenarios]
-        deficit_medio = list(sum(deficit_cen) / n_cenarios)
-        cmo_medio = list(sum(cmo_cen) / n_cenarios)
-        ci_medio = list(sum(ci_cen) / n_cenarios)
-        alpha_medio = list(sum(alpha_cen) / n_cenarios)
-        fobj_medio = list(sum(fobj_cen) / n_cenarios)
-        # Constroi o cenário e retorna
-        return cls(n_uhes,
-                   n_utes,
-                   afluencias_medias,
-                   vol_finais_medios,
-                   vol_turbin_medios,
-                   vol_vertid_medios,
-                   custo_agua_medios,
-                   gera_termi_medios,
-                   deficit_medio,
-                   cmo_medio,
-                   ci_medio,
-                   alpha_medio,
-                   fobj_medio)
+        return cls(cenarios[0].n_uhes,
+                   cenarios[0].n_utes,
+                   np.mean(Cenario.valores_cenarios(cenarios), axis=0))
+
+    @classmethod
+    def cenario_quantil(cls, cens, q: float):
+        """
+        Calcula o cenário formado pelo quantil q de cada variável em
+        cada período, a partir de uma lista de cenários.
+        """
+        cenarios: List[Cenario] = cens
+        return cls(cenarios[0].n_uhes,
+                   cenarios[0].n_utes,
+                   np.quantile(Cenario.valores_cenarios(cenarios),
+                               q,
+                               axis=0))
+
+    @classmethod
+    def cenario_mediano(cls, cens):
+        """
+        Calcula o cenário formado pela mediana de cada variável em
+        cada período, a partir de uma lista de cenários.
+        """
+        return Cenario.cenario_quantil(cens, 0.5)
+
+    @staticmethod
+    def n_valores(n_uhes: int, n_utes: int) -> int:
+        """
+        Número de colunas do array de valores de um cenário.
+        """
+        return 5 * n_uhes + n_utes + 5
+
+    @classmethod
+    def cenario_dos_valores(cls,
+                            n_uhes: int,
+                            n_utes: int,
+                            valores: np.ndarray):
+        """
+        Constroi um cenário a partir de um array com dimensões
+        (períodos, colunas). As colunas são as afluências, os volumes
+        finais, turbinados e vertidos e os custos da água de cada UHE,
+        as gerações de cada UTE, o déficit, o CMO, o custo imediato,
+        o custo futuro e o custo total. Os valores são copiados.
+        """
+        return cls(n_uhes, n_utes, np.array(valores, dtype=float))
 
     def __str__(self):
         to_str = ""
@@ -148,119 +159,102 @@ class Cenario:
         return to_str
 
     @classmethod
-    def organiza_afluencias(cls,
-                            nos: List[No]) -> Dict[int, List[float]]:
+    def organiza_afluencias(cls, nos: List[No]) -> np.ndarray:
         """
         Extrai as afluências que ocorreram a partir de uma lista de nós
-        que representam o cenário.
+        que representam o cenário, com dimensões (UHE, período).
         """
-        n_uhes = len(nos[0].volumes_finais)
-        afluencias: Dict[int, List[float]] = {i: [] for i in
-                                              range(n_uhes)}
-        for n in nos:
-            for i in range(n_uhes):
-                afluencias[i].append(n.afluencias[i])
-        return afluencias
+        return np.array([n.afluencias for n in nos], dtype=float).T
 
     @classmethod
-    def organiza_vol_finais(cls,
-                            nos: List[No]) -> Dict[int, List[float]]:
+    def organiza_vol_finais(cls, nos: List[No]) -> np.ndarray:
         """
         Extrai os volumes finais a partir de uma lista de nós
-        que representam o cenário.
+        que representam o cenário, com dimensões (UHE, período).
         """
-        n_uhes = len(nos[0].volumes_finais)
-        vol_finais: Dict[int, List[float]] = {i: [] for i in
-                                              range(n_uhes)}
-        for n in nos:
-            for i in range(n_uhes):
-                vol_finais[i].append(n.volumes_finais[i])
-        return vol_finais
+        return np.array([n.volumes_finais for n in nos], dtype=float).T
 
     @classmethod
-    def organiza_vol_turbin(cls,
-                            nos: List[No]) -> Dict[int, List[float]]:
+    def organiza_vol_turbin(cls, nos: List[No]) -> np.ndarray:
         """
         Extrai os volumes turbinados a partir de uma lista de nós
-        que representam o cenário.
+        que representam o cenário, com dimensões (UHE, período).
         """
-        n_uhes = len(nos[0].volumes_finais)
-        vol_turbin: Dict[int, List[float]] = {i: [] for i in
-                                              range(n_uhes)}
-        for n in nos:
-            for i in range(n_uhes):
-                vol_turbin[i].append(n.volumes_turbinados[i])
-        return vol_turbin
+        return np.array([n.volumes_turbinados for n in nos], dtype=float).T
 
     @classmethod
-    def organiza_vol_vertid(cls,
-                            nos: List[No]) -> Dict[int, List[float]]:
+    def organiza_vol_vertid(cls, nos: List[No]) -> np.ndarray:
         """
         Extrai os volumes vertidos a partir de uma lista de nós
-        que representam o cenário.
+        que representam o cenário, com dimensões (UHE, período).
         """
-        n_uhes = len(nos[0].volumes_finais)
-        vol_vertid: Dict[int, List[float]] = {i: [] for i in
-                                              range(n_uhes)}
-        for n in nos:
-            for i in range(n_uhes):
-                vol_vertid[i].append(n.volumes_vertidos[i])
-        return vol_vertid
+        return np.array([n.volumes_vertidos for n in nos], dtype=float).T
 
     @classmethod
-    def organiza_custo_agua(cls,
-                            nos: List[No]) -> Dict[int, List[float]]:
+    def organiza_custo_agua(cls, nos: List[No]) -> np.ndarray:
         """
         Extrai os custos da água a partir de uma lista de nós
-        que representam o cenário.
+        que representam o cenário, com dimensões (UHE, período).
         """
-        n_uhes = len(nos[0].volumes_finais)
-        custo_agua: Dict[int, List[float]] = {i: [] for i in
-                                              range(n_uhes)}
-        for n in nos:
-            for i in range(n_uhes):
-                custo_agua[i].append(n.custo_agua[i])
-        return custo_agua
+        return np.array([n.custo_agua for n in nos], dtype=float).T
 
     @classmethod
-    def organiza_ger_termica(cls,
-                             nos: List[No]) -> Dict[int, List[float]]:
+    def organiza_ger_termica(cls, nos: List[No]) -> np.ndarray:
         """
         Extrai as gerações de térmicas a partir de uma lista de nós
-        que representam o cenário.
+        que representam o cenário, com dimensões (UTE, período).
         """
         n_utes = len(nos[0].geracao_termica)
-        ger_termica: Dict[int, List[float]] = {i: [] for i in
-                                               range(n_utes)}
-        for n in nos:
-            for i in range(n_utes):
-                ger_termica[i].append(n.geracao_termica[i])
-        return ger_termica
+        return np.array([n.geracao_termica for n in nos],
+                        dtype=float).reshape(len(nos), n_utes).T
+
+    @staticmethod
+    def colunas_tabela(n_uhes: int, n_utes: int) -> np.ndarray:
+        """
+        Índices das colunas dos valores na ordem da tabela de saída:
+        afluência, volumes final, turbinado e vertido e custo da água
+        de cada UHE, seguidos das gerações das UTEs e das variáveis
+        do sistema.
+        """
+        n = n_uhes
+        colunas_uhes = [k * n + i for i in range(n) for k in range(5)]
+        return np.array(colunas_uhes +
+                        list(range(5 * n, 5 * n + n_utes + 5)),
+                        dtype=int)
+
+    @staticmethod
+    def formato_linha_tabela(n_uhes: int, n_utes: int) -> str:
+        """
+        Formato de uma linha da tabela de saída, que recebe o índice
+        do período seguido dos valores na ordem de colunas_tabela().
+        """
+        return (" %13d " + "%19.4f " * Cenario.n_valores(n_uhes, n_utes) +
+                "\n")
+
+    @staticmethod
+    def tabela_cenarios(n_uhes: int,
+                        n_utes: int,
+                        valores: np.ndarray) -> np.ndarray:
+        """
+        Organiza os valores de cenários, com dimensões (cenários,
+        períodos, colunas), na ordem da tabela de saída, com o índice
+        do período como primeira coluna.
+        """
+        n_cenarios, n_periodos, _ = valores.shape
+        periodos = np.tile(np.arange(1, n_periodos + 1, dtype=float),
+                           (n_cenarios, 1))
+        return np.concatenate([periodos[:, :, np.newaxis],
+                               valores[:, :, Cenario.colunas_tabela(n_uhes,
+                                                                    n_utes)]],
+                              axis=2)
 
     def linhas_tabela(self) -> List[str]:
         """
         Retorna as linhas formatadas, relativas ao cenário para
         serem escritas na tabela de saída.
         """
-        n_periodos = len(self.volumes_finais[0])
-        linhas: List[str] = []
-        for i in range(n_periodos):
-            linha = " "
-            ind_periodo = str(i + 1).rjust(13)
-            linha += ind_periodo + " "
-            for j in range(self.n_uhes):
-                linha += "{:19.4f}".format(self.afluencias[j][i]) + " "
-                linha += "{:19.4f}".format(self.volumes_finais[j][i]) + " "
-                linha += "{:19.4f}".format(self.volumes_turbinados[j][i]) + " "
-                linha += "{:19.4f}".format(self.volumes_vertidos[j][i]) + " "
-                linha += "{:19.4f}".format(self.custo_agua[j][i]) + " "
-            for j in range(self.n_utes):
-                linha += "{:19.4f}".format(self.geracao_termica[j][i]) + " "
-            linha += "{:19.4f}".format(self.deficit[i]) + " "
-            linha += "{:19.4f}".format(self.cmo[i]) + " "
-            linha += "{:19.4f}".format(self.ci[i]) + " "
-            linha += "{:19.4f}".format(self.alpha[i]) + " "
-            linha += "{:19.4f}".format(self.fobj[i]) + " "
-            linha += "\n"
-            linhas.append(linha)
-        return linhas
+        formato = Cenario.formato_linha_tabela(self.n_uhes, self.n_utes)
+        tabela = Cenario.tabela_cenarios(self.n_uhes,
+                                         self.n_utes,
+                                         self.valores[np.newaxis, :, :])
+        return [formato % tuple(linha) for linha in tabela[0].tolist()]
@@ -19,7 +19,13 @@ class ConfigGeral:
                  n_pos_estudo: int,
                  custo_deficit: float,
                  n_uhes: int,
-                 n_utes: int):
+                 n_utes: int,
+                 selecao_cortes: bool = False,
+                 max_cortes: int = 0,
+                 contador_atividade: bool = False,
+                 multicorte: bool = False,
+                 cenarios_sim_final: int = 0,
+                 max_cenarios_armazenados: int = 0):
         self.nome = nome
         self.metodo = metodo
         self.min_iter = min_iter
@@ -36,6 +42,19 @@ class ConfigGeral:
         self.custo_deficit = custo_deficit
         self.n_uhes = n_uhes
         self.n_utes = n_utes
+        # Seleção de cortes por dominância (opcional). Um máximo de
+        # cortes igual a 0 indica que não há limite.
+        self.selecao_cortes = selecao_cortes
+        self.max_cortes = max_cortes
+        self.contador_atividade = contador_atividade
+        # Formulação de múltiplos cortes na PDDE, com um alpha
+        # por abertura (opcional)
+        self.multicorte = multicorte
+        # Cenários sorteados na simulação final da PDDE, onde 0 indica
+        # todas as combinações, e máximo de cenários armazenados para
+        # os relatórios, onde 0 indica que não há limite (opcionais)
+        self.cenarios_sim_final = cenarios_sim_final
+        self.max_cenarios_armazenados = max_cenarios_armazenados
         # Inicializa o atributo que indica se é usada aversão
         # a risco no estudo
         self.aversao_risco = False
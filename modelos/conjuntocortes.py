@@ -0,0 +1,388 @@
+from modelos.cortebenders import CorteBenders
+
+from typing import Dict, List, Optional, Tuple
+import numpy as np  # type: ignore
+
+# Número de estados avaliados de uma vez na seleção de cortes, para
+# limitar a memória das matrizes (estados, cortes)
+ESTADOS_POR_BLOCO = 1024
+
+
+def avalia_cortes(coefs: np.ndarray,
+                  termos: np.ndarray,
+                  estados: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Avalia os cortes em cada estado, retornando o índice do corte de
+    maior valor em cada estado e o respectivo valor. Em caso de
+    empate, é mantido o corte mais antigo.
+    """
+    n_estados = estados.shape[0]
+    melhores = np.zeros((n_estados,), dtype=np.int64)
+    valores = np.full((n_estados,), -np.inf)
+    if coefs.shape[0] == 0:
+        return melhores, valores
+    for i in range(0, n_estados, ESTADOS_POR_BLOCO):
+        f = min([i + ESTADOS_POR_BLOCO, n_estados])
+        v = estados[i:f] @ coefs.T + termos
+        melhores[i:f] = np.argmax(v, axis=1)
+        valores[i:f] = v[np.arange(f - i), melhores[i:f]]
+    return melhores, valores
+
+
+def limita_cortes(selecionados: np.ndarray,
+                  pontuacao: np.ndarray,
+                  max_cortes: int) -> np.ndarray:
+    """
+    Mantém somente os max_cortes cortes selecionados de maior
+    pontuação, desempatando pelos mais recentes. Um máximo igual
+    a 0 indica que não há limite.
+    """
+    if max_cortes <= 0 or len(selecionados) <= max_cortes:
+        return selecionados
+    ordem = np.lexsort((-selecionados, -pontuacao[selecionados]))
+    return np.sort(selecionados[ordem[:max_cortes]])
+
+
+def seleciona_dominantes(coefs: np.ndarray,
+                         termos: np.ndarray,
+                         estados: np.ndarray,
+                         max_cortes: int = 0) -> np.ndarray:
+    """
+    Seleciona os cortes que são máximos em algum dos estados
+    visitados (dominância de nível 1), retornando seus índices
+    em ordem crescente.
+    """
+    melhores, _ = avalia_cortes(coefs, termos, estados)
+    contagem = np.bincount(melhores, minlength=coefs.shape[0])
+    selecionados = np.nonzero(contagem)[0]
+    return limita_cortes(selecionados, contagem, max_cortes)
+
+
+class ConjuntoCortes:
+    """
+    Conjunto dos cortes de Benders de um período (PDDE) ou de um
+    nó (PDDD). Os coeficientes angulares, os termos independentes e
+    as funções objetivo são armazenados em arrays cuja capacidade é
+    dobrada quando preenchida, e os cortes repetidos são descartados
+    através de um dicionário indexado pelo conteúdo do corte.
+
+    Na PDDD os cortes dos nós irmãos são combinados na ordem em que
+    foram criados, então a remoção de repetidos pode ser desativada.
+
+    No multicorte da PDDE, cada corte é associado ao alpha da abertura
+    que o gerou, e a dominância é avaliada somente entre os cortes de
+    um mesmo alpha.
+
+    Opcionalmente, os estados visitados na FORWARD podem ser
+    acumulados para a seleção dos cortes por dominância de nível 1.
+    O melhor corte de cada estado é atualizado de forma incremental,
+    avaliando somente os cortes e estados novos a cada seleção.
+    """
+    def __init__(self,
+                 n_uhes: int,
+                 remove_repetidos: bool = True,
+                 capacidade: int = 16,
+                 n_alphas: int = 1):
+        self.n_uhes = n_uhes
+        self.remove_repetidos = remove_repetidos
+        self.n_alphas = n_alphas
+        self.n_cortes = 0
+        self.__coefs = np.zeros((capacidade, n_uhes))
+        self.__termos = np.zeros((capacidade,))
+        self.__fobjs = np.zeros((capacidade,))
+        self.__alphas = np.zeros((capacidade,), dtype=np.int64)
+        self.__indices: Dict[bytes, int] = {}
+        # Estados visitados e o melhor corte de cada alpha em cada um
+        self.n_estados = 0
+        self.__estados = np.zeros((0, n_uhes))
+        self.__melhores = np.zeros((0, n_alphas), dtype=np.int64)
+        self.__valores = np.zeros((0, n_alphas))
+        self.__estados_avaliados = 0
+        self.__cortes_avaliados = 0
+        # Número acumulado de estados em que cada corte foi o melhor
+        self.atividade = np.zeros((capacidade,), dtype=np.int64)
+        # Índices dos cortes selecionados na última seleção
+        self.selecionados: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return self.n_cortes
+
+    @property
+    def coefs(self) -> np.ndarray:
+        """
+        Coeficientes angulares dos cortes, com dimensões (cortes, UHEs).
+        """
+        return self.__coefs[:self.n_cortes]
+
+    @property
+    def termos(self) -> np.ndarray:
+        return self.__termos[:self.n_cortes]
+
+    @property
+    def fobjs(self) -> np.ndarray:
+        return self.__fobjs[:self.n_cortes]
+
+    @property
+    def alphas(self) -> np.ndarray:
+        """
+        Índice do alpha limitado por cada corte.
+        """
+        return self.__alphas[:self.n_cortes]
+
+    def __garante_capacidade(self, n: int):
+        """
+        Aumenta a capacidade dos arrays, se necessário, para que
+        caibam n cortes.
+        """
+        capacidade = self.__termos.shape[0]
+        if n <= capacidade:
+            return
+        while capacidade < n:
+            capacidade = max([2 * capacidade, 1])
+        coefs = np.zeros((capacidade, self.n_uhes))
+        termos = np.zeros((capacidade,))
+        fobjs = np.zeros((capacidade,))
+        alphas = np.zeros((capacidade,), dtype=np.int64)
+        coefs[:self.n_cortes] = self.coefs
+        termos[:self.n_cortes] = self.termos
+        fobjs[:self.n_cortes] = self.fobjs
+        alphas[:self.n_cortes] = self.alphas
+        self.__coefs = coefs
+        self.__termos = termos
+        self.__fobjs = fobjs
+        self.__alphas = alphas
+        atividade = np.zeros((capacidade,), dtype=np.int64)
+        atividade[:self.n_cortes] = self.atividade[:self.n_cortes]
+        self.atividade = atividade
+
+    @staticmethod
+    def __chave(coefs: np.ndarray, termo: float, alpha: int) -> bytes:
+        # Somar 0.0 faz com que -0.0 e 0.0 tenham a mesma chave
+        return (np.append(coefs, [termo, alpha]) + 0.0).tobytes()
+
+    def adiciona(self,
+                 coef_angular: List[float],
+                 termo_indep: float,
+                 fobj: float = 0.0,
+                 alpha: int = 0) -> bool:
+        """
+        Adiciona um corte ao conjunto, retornando se ele foi
+        de fato inserido.
+        """
+        coefs = np.asarray(coef_angular, dtype=float)
+        if self.remove_repetidos:
+            chave = self.__chave(coefs, termo_indep, alpha)
+            if chave in self.__indices:
+                return False
+            self.__indices[chave] = self.n_cortes
+        self.__garante_capacidade(self.n_cortes + 1)
+        self.__coefs[self.n_cortes, :] = coefs
+        self.__termos[self.n_cortes] = termo_indep
+        self.__fobjs[self.n_cortes] = fobj
+        self.__alphas[self.n_cortes] = alpha
+        self.n_cortes += 1
+        return True
+
+    def adiciona_corte(self, corte: CorteBenders, alpha: int = 0) -> bool:
+        return self.adiciona(corte.coef_angular,
+                             corte.termo_indep,
+                             corte.fobj,
+                             alpha)
+
+    def adiciona_cortes(self,
+                        cortes: List[CorteBenders],
+                        alpha: int = 0) -> int:
+        """
+        Adiciona uma lista de cortes ao conjunto, retornando quantos
+        foram de fato inseridos.
+        """
+        return sum([self.adiciona_corte(c, alpha) for c in cortes])
+
+    def corte(self, indice: int) -> CorteBenders:
+        """
+        Retorna um dos cortes do conjunto como objeto CorteBenders.
+        """
+        return CorteBenders(list(self.__coefs[indice, :]),
+                            float(self.__termos[indice]),
+                            float(self.__fobjs[indice]))
+
+    def adiciona_conjunto(self, conjunto: "ConjuntoCortes") -> int:
+        """
+        Adiciona todos os cortes de outro conjunto, retornando quantos
+        foram de fato inseridos.
+        """
+        n = len(conjunto)
+        if self.remove_repetidos:
+            return sum([self.adiciona(conjunto.coefs[i],
+                                      conjunto.termos[i],
+                                      conjunto.fobjs[i],
+                                      conjunto.alphas[i])
+                        for i in range(n)])
+        self.__garante_capacidade(self.n_cortes + n)
+        fim = self.n_cortes + n
+        self.__coefs[self.n_cortes:fim, :] = conjunto.coefs
+        self.__termos[self.n_cortes:fim] = conjunto.termos
+        self.__fobjs[self.n_cortes:fim] = conjunto.fobjs
+        self.__alphas[self.n_cortes:fim] = conjunto.alphas
+        self.n_cortes = fim
+        return n
+
+    def adiciona_estados(self, estados: np.ndarray):
+        """
+        Acumula estados visitados, com dimensões (estados, UHEs), para
+        a seleção de cortes.
+        """
+        estados = np.asarray(estados, dtype=float).reshape(-1, self.n_uhes)
+        self.__estados = np.vstack([self.__estados, estados])
+        novos = (estados.shape[0], self.n_alphas)
+        self.__melhores = np.vstack([self.__melhores,
+                                     np.zeros(novos, dtype=np.int64)])
+        self.__valores = np.vstack([self.__valores,
+                                    np.full(novos, -np.inf)])
+        self.n_estados = self.__estados.shape[0]
+
+    def __atualiza_melhores(self) -> np.ndarray:
+        """
+        Atualiza o melhor corte de cada alpha em cada estado, retornando
+        o número de estados em que cada corte é o melhor.
+        """
+        e0 = self.__estados_avaliados
+        k0 = self.__cortes_avaliados
+        for a in range(self.n_alphas):
+            grupo = np.nonzero(self.alphas == a)[0]
+            novos = grupo[grupo >= k0]
+            # Cortes novos nos estados já avaliados
+            if e0 > 0 and len(novos) > 0:
+                melhores, valores = avalia_cortes(self.coefs[novos],
+                                                  self.termos[novos],
+                                                  self.__estados[:e0])
+                # Em caso de empate, é mantido o corte mais antigo
+                melhora = valores > self.__valores[:e0, a]
+                self.__melhores[:e0, a][melhora] = novos[melhores[melhora]]
+                self.__valores[:e0, a][melhora] = valores[melhora]
+            # Estados novos em todos os cortes
+            if self.n_estados > e0 and len(grupo) > 0:
+                melhores, valores = avalia_cortes(self.coefs[grupo],
+                                                  self.termos[grupo],
+                                                  self.__estados[e0:])
+                self.__melhores[e0:, a] = grupo[melhores]
+                self.__valores[e0:, a] = valores
+        self.__estados_avaliados = self.n_estados
+        self.__cortes_avaliados = self.n_cortes
+        # Alphas sem cortes não têm melhor corte nos estados
+        validos = np.isfinite(self.__valores)
+        return np.bincount(self.__melhores[validos],
+                           minlength=self.n_cortes)
+
+    def seleciona(self,
+                  max_cortes: int = 0,
+                  contador_atividade: bool = False) -> bool:
+        """
+        Seleciona os cortes que são máximos em algum dos estados
+        visitados (dominância de nível 1). Se houver mais cortes que o
+        máximo fornecido, são mantidos os que são máximos em mais
+        estados ou, com o contador de atividade, os que acumularam mais
+        estados ao longo das seleções. Retorna se a seleção mudou.
+        """
+        if self.n_estados == 0 or self.n_cortes == 0:
+            selecionados = np.arange(self.n_cortes)
+        else:
+            contagem = self.__atualiza_melhores()
+            selecionados = np.nonzero(contagem)[0]
+            pontuacao = contagem
+            if contador_atividade:
+                self.atividade[:self.n_cortes] += contagem
+                pontuacao = self.atividade[:self.n_cortes]
+            selecionados = limita_cortes(selecionados,
+                                         pontuacao,
+                                         max_cortes)
+        alterou = (self.selecionados is None or
+                   not np.array_equal(selecionados, self.selecionados))
+        self.selecionados = selecionados
+        return alterou
+
+    @property
+    def coefs_selecionados(self) -> np.ndarray:
+        if self.selecionados is None:
+            return self.coefs
+        return self.coefs[self.selecionados]
+
+    @property
+    def termos_selecionados(self) -> np.ndarray:
+        if self.selecionados is None:
+            return self.termos
+        return self.termos[self.selecionados]
+
+    @property
+    def alphas_selecionados(self) -> np.ndarray:
+        if self.selecionados is None:
+            return self.alphas
+        return self.alphas[self.selecionados]
+
+    def estado(self) -> Dict[str, np.ndarray]:
+        """
+        Retorna os arrays que descrevem o conjunto, incluindo os
+        estados visitados e a última seleção, para serem armazenados
+        em um checkpoint.
+        """
+        estado = {"coefs": self.coefs,
+                  "termos": self.termos,
+                  "fobjs": self.fobjs,
+                  "alphas": self.alphas,
+                  "estados": self.__estados,
+                  "melhores": self.__melhores,
+                  "valores": self.__valores,
+                  "avaliados": np.array([self.__estados_avaliados,
+                                         self.__cortes_avaliados]),
+                  "atividade": self.atividade[:self.n_cortes]}
+        if self.selecionados is not None:
+            estado["selecionados"] = self.selecionados
+        return estado
+
+    def restaura(self, estado: Dict[str, np.ndarray]):
+        """
+        Substitui o conteúdo do conjunto pelo descrito em um estado
+        obtido anteriormente.
+        """
+        n = estado["termos"].shape[0]
+        capacidade = max([n, 1])
+        self.n_cortes = n
+        self.__coefs = np.zeros((capacidade, self.n_uhes))
+        self.__termos = np.zeros((capacidade,))
+        self.__fobjs = np.zeros((capacidade,))
+        self.__alphas = np.zeros((capacidade,), dtype=np.int64)
+        self.atividade = np.zeros((capacidade,), dtype=np.int64)
+        self.__coefs[:n, :] = estado["coefs"].reshape(-1, self.n_uhes)
+        self.__termos[:n] = estado["termos"]
+        self.__fobjs[:n] = estado["fobjs"]
+        self.__alphas[:n] = estado["alphas"]
+        self.atividade[:n] = estado["atividade"]
+        self.__indices = {}
+        if self.remove_repetidos:
+            for i in range(n):
+                chave = self.__chave(self.__coefs[i, :],
+                                     self.__termos[i],
+                                     self.__alphas[i])
+                self.__indices[chave] = i
+        self.__estados = estado["estados"].reshape(-1, self.n_uhes)
+        self.__melhores = estado["melhores"].reshape(-1, self.n_alphas)
+        self.__valores = estado["valores"].reshape(-1, self.n_alphas)
+        self.n_estados = self.__estados.shape[0]
+        self.__estados_avaliados = int(estado["avaliados"][0])
+        self.__cortes_avaliados = int(estado["avaliados"][1])
+        self.selecionados = estado.get("selecionados")
+
+    @classmethod
+    def concatena(cls,
+                  conjuntos: List["ConjuntoCortes"],
+                  remove_repetidos: bool = False) -> "ConjuntoCortes":
+        """
+        Constroi um conjunto com todos os cortes dos conjuntos
+        fornecidos, na ordem em que aparecem.
+        """
+        conjunto = cls(conjuntos[0].n_uhes,
+                       remove_repetidos,
+                       n_alphas=conjuntos[0].n_alphas)
+        for c in conjuntos:
+            conjunto.adiciona_conjunto(c)
+        return conjunto
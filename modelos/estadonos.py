@@ -0,0 +1,110 @@
+from typing import Dict, Tuple
+import numpy as np  # type: ignore
+
+# Grandezas armazenadas por usina
+CAMPOS_UHES = ["afluencias",
+               "volumes_iniciais",
+               "volumes_finais",
+               "volumes_turbinados",
+               "volumes_vertidos",
+               "custo_agua"]
+CAMPOS_UTES = ["geracao_termica"]
+# Grandezas do sistema
+CAMPOS_SISTEMA = ["deficit",
+                  "cmo",
+                  "custo_imediato",
+                  "custo_futuro",
+                  "custo_total"]
+
+
+class EstadoNos:
+    """
+    Armazenamento, em arrays pré-alocados, das afluências e dos
+    resultados de um conjunto de nós de um pente ou de uma árvore de
+    afluências. As grandezas do sistema têm as dimensões fornecidas,
+    como [dente, período] no pente ou [nó] em um período da árvore, e
+    as de cada usina têm uma dimensão a mais, com o índice da usina.
+    """
+    CAMPOS = CAMPOS_UHES + CAMPOS_UTES + CAMPOS_SISTEMA
+
+    def __init__(self,
+                 forma: Tuple[int, ...],
+                 n_uhes: int,
+                 n_utes: int):
+        self.forma = tuple(forma)
+        self.n_uhes = n_uhes
+        self.n_utes = n_utes
+        forma_uhes = self.forma + (n_uhes,)
+        forma_utes = self.forma + (n_utes,)
+        # Os nomes devem acompanhar as listas CAMPOS_*
+        self.afluencias: np.ndarray = np.zeros(forma_uhes)
+        self.volumes_iniciais: np.ndarray = np.zeros(forma_uhes)
+        self.volumes_finais: np.ndarray = np.zeros(forma_uhes)
+        self.volumes_turbinados: np.ndarray = np.zeros(forma_uhes)
+        self.volumes_vertidos: np.ndarray = np.zeros(forma_uhes)
+        self.custo_agua: np.ndarray = np.zeros(forma_uhes)
+        self.geracao_termica: np.ndarray = np.zeros(forma_utes)
+        self.deficit: np.ndarray = np.zeros(self.forma)
+        self.cmo: np.ndarray = np.zeros(self.forma)
+        self.custo_imediato: np.ndarray = np.zeros(self.forma)
+        self.custo_futuro: np.ndarray = np.zeros(self.forma)
+        self.custo_total: np.ndarray = np.zeros(self.forma)
+
+    def __escreve(self, campo: str, indices, valores: np.ndarray):
+        array = getattr(self, campo)
+        array[indices] = np.reshape(valores, array[indices].shape)
+
+    def armazena(self, indices, saidas: np.ndarray):
+        """
+        Armazena as saídas dos nós selecionados pelos índices, com uma
+        linha por nó e as colunas de Subproblema.saidas. Os volumes
+        iniciais são obtidos do balanço hídrico de cada nó.
+        """
+        n = self.n_uhes
+        m = self.n_utes
+        saidas = np.asarray(saidas, dtype=float).reshape(-1, 4 * n + m + 5)
+        vf = saidas[:, :n]
+        vt = saidas[:, n:2 * n]
+        vv = saidas[:, 2 * n:3 * n]
+        afls = self.afluencias[indices].reshape(-1, n)
+        self.__escreve("volumes_iniciais", indices, vf + vt + vv - afls)
+        self.__escreve("volumes_finais", indices, vf)
+        self.__escreve("volumes_turbinados", indices, vt)
+        self.__escreve("volumes_vertidos", indices, vv)
+        self.__escreve("custo_agua", indices, saidas[:, 3 * n:4 * n])
+        self.__escreve("geracao_termica", indices, saidas[:, 4 * n:4 * n + m])
+        k = 4 * n + m
+        for i, campo in enumerate(CAMPOS_SISTEMA):
+            self.__escreve(campo, indices, saidas[:, k + i])
+
+    def valores(self, indices) -> np.ndarray:
+        """
+        Reúne os valores dos nós selecionados pelos índices, com uma
+        dimensão a mais para as colunas, na ordem das colunas de um
+        Cenario.
+        """
+        colunas = [getattr(self, campo)[indices]
+                   for campo in ["afluencias",
+                                 "volumes_finais",
+                                 "volumes_turbinados",
+                                 "volumes_vertidos",
+                                 "custo_agua",
+                                 "geracao_termica"]]
+        colunas += [getattr(self, campo)[indices][..., np.newaxis]
+                    for campo in CAMPOS_SISTEMA]
+        return np.concatenate(colunas, axis=-1)
+
+    def estado(self) -> Dict[str, np.ndarray]:
+        """
+        Retorna os arrays de todas as grandezas armazenadas, para
+        serem salvos em um checkpoint.
+        """
+        return {campo: getattr(self, campo) for campo in EstadoNos.CAMPOS}
+
+    def restaura(self, estado: Dict[str, np.ndarray]):
+        """
+        Restaura as grandezas a partir dos arrays retornados por
+        estado(), que devem ter as mesmas dimensões.
+        """
+        for campo in EstadoNos.CAMPOS:
+            getattr(self, campo)[...] = estado[campo]
@@ -0,0 +1,121 @@
+from modelos.cenario import Cenario
+
+from random import Random
+from typing import Dict, List
+import numpy as np  # type: ignore
+
+
+class EstatisticasCenarios:
+    """
+    Estatísticas dos cenários de uma simulação, agregadas à medida que
+    os cenários são resolvidos, sem que todos sejam armazenados. Cada
+    cenário é descrito por um array com dimensões (períodos, colunas),
+    com as colunas de Cenario.cenario_dos_valores.
+
+    A média e o desvio padrão de cada valor em cada período são exatos,
+    atualizados a cada lote de cenários. Somente uma amostra uniforme
+    de no máximo max_cenarios cenários é armazenada, por amostragem de
+    reservatório, e dela são obtidos os quantis e os cenários
+    detalhados dos relatórios. Um máximo igual a 0 armazena todos.
+    """
+    def __init__(self,
+                 n_uhes: int,
+                 n_utes: int,
+                 n_periodos: int,
+                 max_cenarios: int = 0,
+                 semente: int = 0):
+        self.n_uhes = n_uhes
+        self.n_utes = n_utes
+        self.max_cenarios = max_cenarios
+        self.n_cenarios = 0
+        n_valores = Cenario.n_valores(n_uhes, n_utes)
+        self.media = np.zeros((n_periodos, n_valores))
+        self.__m2 = np.zeros((n_periodos, n_valores))
+        self.amostra: List[np.ndarray] = []
+        self.__gerador = Random(semente)
+
+    def adiciona(self, valores: np.ndarray):
+        """
+        Agrega um lote de cenários, com dimensões (cenários, períodos,
+        colunas).
+        """
+        n_lote = valores.shape[0]
+        if n_lote == 0:
+            return
+        # Combinação da média e dos desvios quadráticos do lote com
+        # os acumulados (Chan et al.)
+        media_lote = np.mean(valores, axis=0)
+        m2_lote = np.sum((valores - media_lote) ** 2, axis=0)
+        n_total = self.n_cenarios + n_lote
+        delta = media_lote - self.media
+        self.media += delta * n_lote / n_total
+        self.__m2 += m2_lote + delta ** 2 * self.n_cenarios * n_lote / n_total
+        # Amostragem de reservatório dos cenários armazenados
+        for i in range(n_lote):
+            vistos = self.n_cenarios + i
+            if self.max_cenarios <= 0 or vistos < self.max_cenarios:
+                self.amostra.append(np.array(valores[i]))
+                continue
+            j = self.__gerador.randrange(vistos + 1)
+            if j < self.max_cenarios:
+                self.amostra[j] = np.array(valores[i])
+        self.n_cenarios = n_total
+
+    def desvio(self) -> np.ndarray:
+        """
+        Desvio padrão populacional de cada valor em cada período.
+        """
+        return np.sqrt(self.__m2 / max([self.n_cenarios, 1]))
+
+    def quantil(self, q: float) -> np.ndarray:
+        """
+        Quantil de cada valor em cada período, estimado a partir dos
+        cenários armazenados.
+        """
+        return np.quantile(np.array(self.amostra), q, axis=0)
+
+    def custo_total_medio(self) -> float:
+        """
+        Média do custo total do primeiro período (Z_INF).
+        """
+        return float(self.media[0, -1])
+
+    def custo_imediato_medio(self) -> float:
+        """
+        Média da soma dos custos imediatos de todos os períodos (Z_SUP).
+        """
+        return float(np.sum(self.media[:, -3]))
+
+    def estado(self) -> Dict[str, np.ndarray]:
+        """
+        Retorna os arrays das estatísticas agregadas, para serem
+        armazenados junto dos cenários da amostra.
+        """
+        return {"media": self.media,
+                "m2": self.__m2,
+                "n_cenarios": np.array(self.n_cenarios)}
+
+    def restaura(self,
+                 estado: Dict[str, np.ndarray],
+                 amostra: np.ndarray):
+        """
+        Restaura as estatísticas a partir dos arrays retornados por
+        estado() e dos cenários da amostra, com dimensões (cenários,
+        períodos, colunas). Os arrays não são copiados.
+        """
+        self.media = estado["media"]
+        self.__m2 = estado["m2"]
+        self.n_cenarios = int(estado["n_cenarios"])
+        self.amostra = [amostra[i] for i in range(amostra.shape[0])]
+
+    def cenario_medio(self) -> Cenario:
+        return Cenario.cenario_dos_valores(self.n_uhes,
+                                           self.n_utes,
+                                           self.media)
+
+    def cenarios(self) -> List[Cenario]:
+        """
+        Retorna os cenários armazenados.
+        """
+        return [Cenario.cenario_dos_valores(self.n_uhes, self.n_utes, v)
+                for v in self.amostra]
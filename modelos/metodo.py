@@ -1,10 +1,11 @@
 from utils.leituraentrada import LeituraEntrada
 from modelos.resultado import Resultado
-from plunico.plunico import PLUnico
-from pddd.pddd import PDDD
-from pdde.pdde import PDDE
+from resolvedores.backend import Backend
+from utils.arquivocortes import ArquivoCortes
+from utils.checkpoint import Checkpoint
 
 from enum import Enum
+from typing import Optional
 
 
 class Metodo(Enum):
@@ -33,10 +34,19 @@ class Metodo(Enum):
 
     def resolve(self,
                 e: LeituraEntrada,
-                LOG_LEVEL: str) -> Resultado:
+                LOG_LEVEL: str,
+                backend: Backend = Backend.GLPK,
+                workers: int = 1,
+                assincrona: bool = False,
+                checkpoint: Optional[Checkpoint] = None,
+                cortes_iniciais: Optional[ArquivoCortes] = None
+                ) -> Resultado:
         """
         Resolve o problema de otimização para o problema descrito,
-        segundo o método escolhido.
+        segundo o método escolhido. O número de processos e o modo
+        assíncrono só são utilizados pela PDDE, e o checkpoint e os
+        cortes iniciais pela PDDD e pela PDDE. O módulo de cada
+        método só é importado quando ele é utilizado.
         """
         # Armazena as UHES e UTES existentes
         self.__uhes = e.uhes
@@ -44,13 +54,26 @@ class Metodo(Enum):
         # Resolve o problema e retorna a lista de cenários avaliados
         r: Resultado = Resultado(e.cfg, [], [], [], [], [], [], [])
         if self == Metodo.PL_UNICO:
-            self.pl = PLUnico(e, LOG_LEVEL)
+            from plunico.plunico import PLUnico
+            self.pl = PLUnico(e, LOG_LEVEL, backend)
             r = self.pl.resolve_pl()
         elif self == Metodo.PDDD:
-            self.pddd = PDDD(e, LOG_LEVEL)
+            from pddd.pddd import PDDD
+            self.pddd = PDDD(e,
+                             LOG_LEVEL,
+                             backend,
+                             checkpoint,
+                             cortes_iniciais)
             r = self.pddd.resolve_pddd()
         elif self == Metodo.PDDE:
-            self.pdde = PDDE(e, LOG_LEVEL)
+            from pdde.pdde import PDDE
+            self.pdde = PDDE(e,
+                             LOG_LEVEL,
+                             backend,
+                             workers,
+                             assincrona,
+                             checkpoint,
+                             cortes_iniciais)
             r = self.pdde.resolve_pdde()
         else:
             raise Exception("Método de solução inválido")
@@ -1,79 +1,65 @@
+from modelos.conjuntocortes import ConjuntoCortes
 from modelos.cortebenders import CorteBenders
+from modelos.estadonos import EstadoNos
 
-from typing import List
+from typing import List, Tuple
+
+
+def _campo(campo: str) -> property:
+    """
+    Cria a propriedade de um nó que lê e escreve uma grandeza na
+    posição do nó no armazenamento do pente ou da árvore.
+    """
+    def le(no):
+        return getattr(no.estado, campo)[no.posicao]
+
+    def escreve(no, valor):
+        getattr(no.estado, campo)[no.posicao] = valor
+
+    return property(le, escreve)
 
 
 class No:
     """
-    Representação de um nó no pente de afluências.
+    Representação de um nó no pente de afluências. O nó não guarda
+    os próprios valores: é uma visão da sua posição [dente, período]
+    no armazenamento compartilhado por todos os nós.
     """
-    def __init__(self, afluencias: List[float]):
-        # Uma lista onde o ID da UHE é usada como índice
-        # para obter a respectiva influência
-        self.afluencias = afluencias
-        self.volumes_iniciais: List[float] = []
-        self.volumes_turbinados: List[float] = []
-        self.volumes_vertidos: List[float] = []
-        self.volumes_finais: List[float] = []
-        self.custo_agua: List[float] = []
-        self.geracao_termica: List[float] = []
-        self.deficit = 0.0
-        self.cmo = 0.0
-        self.custo_imediato = 0.0
-        self.custo_futuro = 0.0
-        self.custo_total = 0.0
-        self.cortes: List[CorteBenders] = []
+    afluencias = _campo("afluencias")
+    volumes_iniciais = _campo("volumes_iniciais")
+    volumes_turbinados = _campo("volumes_turbinados")
+    volumes_vertidos = _campo("volumes_vertidos")
+    volumes_finais = _campo("volumes_finais")
+    custo_agua = _campo("custo_agua")
+    geracao_termica = _campo("geracao_termica")
+    deficit = _campo("deficit")
+    cmo = _campo("cmo")
+    custo_imediato = _campo("custo_imediato")
+    custo_futuro = _campo("custo_futuro")
+    custo_total = _campo("custo_total")
 
-    def adiciona_corte(self,
-                       corte: CorteBenders,
-                       repetidos: bool = False):
-        """
-        Adiciona um novo corte de Benders à lista de cortes
-        do nó.
-        """
-        self.cortes.append(corte)
-        if not repetidos:
-            self.cortes = list(set(self.cortes))
+    def __init__(self,
+                 estado: EstadoNos,
+                 posicao: Tuple[int, ...],
+                 cortes_repetidos: bool = False):
+        self.estado = estado
+        self.posicao = posicao
+        # Conjunto de cortes do nó, que pode ser compartilhado
+        # com outros nós do mesmo período
+        self.cortes = ConjuntoCortes(estado.n_uhes,
+                                     not cortes_repetidos)
 
-    def preenche_resultados(self,
-                            volumes_finais: List[float],
-                            volumes_turbinados: List[float],
-                            volumes_vertidos: List[float],
-                            custo_agua: List[float],
-                            geracao_termica: List[float],
-                            deficit: float,
-                            cmo: float,
-                            ci: float,
-                            alpha: float,
-                            func_objetivo: float):
+    def adiciona_corte(self, corte: CorteBenders):
         """
-        Adiciona ao nó os valores das variáveis após a solução
-        do PL.
+        Adiciona um novo corte de Benders ao conjunto de cortes
+        do nó.
         """
-        # Listas onde o índice é obtido através do ID da respectiva
-        # UHE ou UTE
-        volumes_iniciais: List[float] = []
-        for i in range(len(volumes_finais)):
-            volumes_iniciais.append(volumes_finais[i] +
-                                    volumes_turbinados[i] +
-                                    volumes_vertidos[i] -
-                                    self.afluencias[i])
-        self.volumes_iniciais = volumes_iniciais
-        self.volumes_finais = volumes_finais
-        self.volumes_turbinados = volumes_turbinados
-        self.volumes_vertidos = volumes_vertidos
-        self.custo_agua = custo_agua
-        self.geracao_termica = geracao_termica
-        self.deficit = deficit
-        self.cmo = cmo
-        self.custo_imediato = ci
-        self.custo_futuro = alpha
-        self.custo_total = func_objetivo
+        self.cortes.adiciona_corte(corte)
 
     def __str__(self):
         to_str = ""
-        for k, v in self.__dict__.items():
-            to_str += "{}: {} - ".format(k, v)
+        for k in EstadoNos.CAMPOS:
+            to_str += "{}: {} - ".format(k, getattr(self, k))
         return to_str
 
     def resumo(self) -> str:
@@ -98,11 +84,11 @@ class No:
         """
         linhas: List[str] = []
         n_uhes = len(self.volumes_finais)
-        for corte in self.cortes:
+        for coefs, termo in zip(self.cortes.coefs, self.cortes.termos):
             linha = "               "
-            linha += "{:19.8f}".format(corte.termo_indep) + " "
+            linha += "{:19.8f}".format(termo) + " "
             for i in range(n_uhes):
-                linha += "{:19.8f}".format(corte.coef_angular[i]) + " "
+                linha += "{:19.8f}".format(coefs[i]) + " "
             linha += "\n"
             linhas.append(linha)
         return linhas
@@ -1,10 +1,13 @@
 from utils.leituraentrada import LeituraEntrada
 from modelos.cenario import Cenario
+from modelos.conjuntocortes import ConjuntoCortes
+from modelos.estadonos import EstadoNos
 from modelos.no import No
 
 from itertools import product
-from random import choice, sample, seed
-from typing import List, Set, Tuple
+from random import Random, choice, sample, seed
+from typing import Iterator, List, Set, Tuple
+import numpy as np  # type: ignore
 
 
 class PenteAfluencias:
@@ -18,12 +21,27 @@ class PenteAfluencias:
         self.n_pos_estudo = e.cfg.n_pos_estudo
         self.n_sequencias = e.cfg.n_cenarios
         self.n_uhes = e.cfg.n_uhes
+        self.n_utes = e.cfg.n_utes
         self.semente = e.cfg.semente
         self.vis = [uh.vol_inicial for uh in e.uhes]
         self.afluencias = e.afluencias
+        self.afluencias_por_periodo = e.afluencias_por_periodo
         self.indices_nos_pente: List[List[int]] = []
         self.indices_sequencias: Set[Tuple[int]] = set()
         self.dentes: List[List[No]] = []
+        # Afluências e resultados de todos os nós, indexados por
+        # [dente, período, usina]
+        self.estado = EstadoNos((self.n_sequencias, self.n_periodos),
+                                self.n_uhes,
+                                self.n_utes)
+        # Período de cada posição dos dentes, incluindo o pós-estudo
+        self.periodos_dente = np.arange(self.n_periodos)
+        # Conjunto de cortes de cada período, compartilhado pelos
+        # nós de todos os dentes. No multicorte, há um alpha para
+        # cada abertura.
+        n_alphas = self.aberturas_periodo if e.cfg.multicorte else 1
+        self.cortes = [ConjuntoCortes(self.n_uhes, n_alphas=n_alphas)
+                       for _ in range(self.n_periodos)]
         # Fixa a semente na fornecida pelo usuário
         seed(self.semente)
 
@@ -35,7 +53,7 @@ class PenteAfluencias:
         """
         # 1º Sorteio: índices das afluências que irão existir em cada
         # período
-        nos_por_periodo = LeituraEntrada.afluencias_por_periodo
+        nos_por_periodo = self.afluencias_por_periodo
         for p in range(self.n_periodos):
             self.indices_nos_pente.append(sample(range(nos_por_periodo),
                                           self.aberturas_periodo))
@@ -50,50 +68,77 @@ class PenteAfluencias:
             for indices in self.indices_nos_pente:
                 seq.append(choice(indices))
             self.indices_sequencias.add(tuple(seq))
-        # Monta cada dente do pente de afluências baseado nos
-        # índices que foram sorteados
-        for seq in self.indices_sequencias:
-            nos_seq: List[No] = []
-            for p, indice_no in enumerate(seq):
-                afls: List[float] = []
-                for i in range(1, self.n_uhes + 1):
-                    afls.append(self.afluencias[i][p][indice_no])
-                nos_seq.append(No(afls))
-            self.dentes.append(nos_seq)
+        # Preenche as afluências de cada dente do pente baseado nos
+        # índices que foram sorteados. A tabela de afluências tem
+        # dimensões [período, afluência, UHE].
+        tabela = np.array([self.afluencias[i]
+                           for i in range(1, self.n_uhes + 1)],
+                          dtype=float).transpose(1, 2, 0)
+        indices = np.array(list(self.indices_sequencias), dtype=int)
+        self.estado.afluencias[:] = tabela[np.arange(self.n_periodos),
+                                           indices]
+        self.dentes = [[No(self.estado, (d, p))
+                        for p in range(self.n_periodos)]
+                       for d in range(self.n_sequencias)]
         # Adiciona o período pós-estudo
         for p in range(self.n_pos_estudo):
             for d, dente in enumerate(self.dentes):
                 self.dentes[d] += dente
+            self.periodos_dente = np.concatenate([self.periodos_dente,
+                                                  self.periodos_dente])
         # Força os volumes iniciais nos nós do primeiro período
-        for dente in self.dentes:
-            dente[0].volumes_iniciais = self.vis
-
-    def monta_simulacao_final(self, pente):
-        """
-        """
-        pente_atual: PenteAfluencias = pente
-        afl_periodo = LeituraEntrada.afluencias_por_periodo
-        # Monta a árvore completa de cenários
-        arvore_do_pente = [[0]] + [list(range(afl_periodo))
-                                   for _ in range(self.n_periodos - 1)]
-        combinacoes = product(*arvore_do_pente)
-        self.indices_sequencias = set(combinacoes)
-        # Monta todos os dentes possíveis
-        for seq in self.indices_sequencias:
-            nos_seq: List[No] = []
-            for p, indice_no in enumerate(seq):
-                afls: List[float] = []
-                for i in range(1, self.n_uhes + 1):
-                    afls.append(self.afluencias[i][p][indice_no])
-                nos_seq.append(No(afls))
-            self.dentes.append(nos_seq)
-        # Força os volumes iniciais nos nós do primeiro período
-        for dente in self.dentes:
-            dente[0].volumes_iniciais = self.vis
-        # Adiciona aos nós de cada período os cortes do pente existente
+        self.estado.volumes_iniciais[:, 0, :] = self.vis
+        # Os nós de um período compartilham o mesmo conjunto de cortes
         for dente in self.dentes:
             for p in range(self.n_periodos):
-                dente[p].cortes = pente_atual.dentes[0][p].cortes
+                dente[p].cortes = self.cortes[p]
+
+    def custos_imediatos_dentes(self) -> np.ndarray:
+        """
+        Retorna o custo imediato total de cada dente, somado em todas
+        as posições do dente, incluindo o pós-estudo.
+        """
+        return self.custos_imediatos_trajetorias(self.estado.custo_imediato)
+
+    def custos_imediatos_trajetorias(self, custos: np.ndarray) -> np.ndarray:
+        """
+        Soma os custos imediatos de trajetórias quaisquer, com dimensões
+        (trajetórias, períodos), nas posições de um dente, incluindo o
+        pós-estudo.
+        """
+        return np.sum(custos[:, self.periodos_dente], axis=1)
+
+    def sequencias_simulacao_final(self,
+                                   n_amostras: int = 0
+                                   ) -> Iterator[Tuple[int, ...]]:
+        """
+        Gera, sob demanda, as sequências de índices das afluências de
+        cada período na simulação final, sempre partindo da primeira
+        afluência. Sem número de amostras, percorre todas as
+        combinações da árvore. Caso contrário, sorteia o número de
+        sequências fornecido.
+        """
+        afl_periodo = self.afluencias_por_periodo
+        if n_amostras <= 0:
+            arvore_do_pente = [[0]] + [list(range(afl_periodo))
+                                       for _ in range(self.n_periodos - 1)]
+            for seq in product(*arvore_do_pente):
+                yield seq
+            return
+        gerador = Random(self.semente)
+        for _ in range(n_amostras):
+            yield tuple([0] + [gerador.randrange(afl_periodo)
+                               for _ in range(self.n_periodos - 1)])
+
+    def afluencias_sequencia(self,
+                             seq: Tuple[int, ...]) -> List[List[float]]:
+        """
+        Retorna as afluências de cada período em uma sequência de
+        índices.
+        """
+        return [[self.afluencias[i][p][indice_no]
+                 for i in range(1, self.n_uhes + 1)]
+                for p, indice_no in enumerate(seq)]
 
     def afluencias_abertura(self,
                             periodo: int,
@@ -124,4 +169,10 @@ class PenteAfluencias:
         Para cada dente do pente, monta as séries históricas de cada
         variável de interesse no estudo realizado.
         """
-        return [Cenario.cenario_dos_nos(d) for d in self.dentes]
+        n_dentes = len(self.dentes)
+        nos = np.repeat(np.arange(n_dentes)[:, np.newaxis],
+                        len(self.periodos_dente),
+                        axis=1)
+        periodos = np.tile(self.periodos_dente, (n_dentes, 1))
+        return [Cenario.cenario_dos_valores(self.n_uhes, self.n_utes, v)
+                for v in self.estado.valores((nos, periodos))]
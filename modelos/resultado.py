@@ -1,18 +1,25 @@
 from modelos.cenario import Cenario
 from modelos.configgeral import ConfigGeral
-from modelos.cortebenders import CorteBenders
+from modelos.conjuntocortes import ConjuntoCortes
+from modelos.estatisticascenarios import EstatisticasCenarios
 from modelos.uhe import UHE
 from modelos.ute import UTE
 
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
+import numpy as np  # type: ignore
 
 
 class Resultado:
     """
     Armazena o resultado de execução de um método de
     solução para o problema de despacho, guardando algumas das
-    configurações que foram feitas.
+    configurações que foram feitas. As estatísticas dos cenários
+    usadas nos relatórios e gráficos são calculadas uma única vez
+    e memorizadas no resultado.
     """
+    # Quantis dos cenários desenhados como faixas nos gráficos
+    QUANTIS_FAIXAS = [0.1, 0.25, 0.5, 0.75, 0.9]
+
     def __init__(self,
                  cfg: ConfigGeral,
                  uhes: List[UHE],
@@ -21,7 +28,9 @@ class Resultado:
                  z_sup: List[float],
                  z_inf: List[float],
                  intervalo_conf: List[Tuple[float, float]],
-                 cortes: List[List[List[CorteBenders]]]):
+                 cortes: List[List[ConjuntoCortes]],
+                 estatisticas: Optional[EstatisticasCenarios] = None,
+                 cenario_medio: Optional[Cenario] = None):
 
         self.cfg = cfg
         self.uhes = uhes
@@ -31,3 +40,52 @@ class Resultado:
         self.z_inf = z_inf
         self.intervalo_confianca = intervalo_conf
         self.cortes = cortes
+        # Estatísticas de todos os cenários simulados, quando somente
+        # parte deles é armazenada em cenarios
+        self.estatisticas = estatisticas
+        # Estatísticas memorizadas. O cenário médio pode ser fornecido,
+        # como no resultado lido de um diretório de resultados.
+        self.__valores: Optional[np.ndarray] = None
+        self.__cenario_medio: Optional[Cenario] = cenario_medio
+        self.__quantis: Dict[float, Cenario] = {}
+
+    def valores_cenarios(self) -> np.ndarray:
+        """
+        Retorna os valores dos cenários armazenados em um único array,
+        com dimensões (cenários, períodos, colunas).
+        """
+        if self.__valores is None:
+            self.__valores = Cenario.valores_cenarios(self.cenarios)
+        return self.__valores
+
+    def cenario_medio(self) -> Cenario:
+        """
+        Retorna o cenário médio de todos os cenários simulados.
+        """
+        if self.__cenario_medio is None:
+            if self.estatisticas is not None:
+                self.__cenario_medio = self.estatisticas.cenario_medio()
+            else:
+                self.__cenario_medio = Cenario(self.cfg.n_uhes,
+                                               self.cfg.n_utes,
+                                               np.mean(self.valores_cenarios(),
+                                                       axis=0))
+        return self.__cenario_medio
+
+    def cenarios_quantis(self, quantis: List[float]) -> List[Cenario]:
+        """
+        Retorna os cenários formados pelos quantis fornecidos de cada
+        variável em cada período, estimados a partir dos cenários
+        armazenados. Os quantis ainda não calculados são obtidos de
+        uma só vez.
+        """
+        faltantes = [q for q in quantis if q not in self.__quantis]
+        if len(faltantes) > 0:
+            valores = np.quantile(self.valores_cenarios(),
+                                  faltantes,
+                                  axis=0)
+            for q, v in zip(faltantes, valores):
+                self.__quantis[q] = Cenario(self.cfg.n_uhes,
+                                            self.cfg.n_utes,
+                                            v)
+        return [self.__quantis[q] for q in quantis]
@@ -0,0 +1,373 @@
+from modelos.configgeral import ConfigGeral
+from modelos.demanda import Demanda
+from modelos.uhe import UHE
+from modelos.ute import UTE
+from resolvedores.backend import Backend
+from resolvedores.resolvedor import MatrizCOO
+
+from typing import List, Optional, Union
+import numpy as np  # type: ignore
+
+
+class Subproblema:
+    """
+    Modelo do PL de despacho de um período, montado uma única vez
+    na forma matricial e reaproveitado em todas as soluções do
+    período. Entre duas soluções são alterados somente o volume
+    inicial e a afluência (lado direito do balanço hídrico) e as
+    linhas dos cortes de Benders.
+
+    O vetor de variáveis é organizado como:
+
+    [vf (n_uhes), vt (n_uhes), vv (n_uhes), gt (n_utes), deficit,
+     alpha (n_alphas), eta, s (n_alphas)]
+
+    Na formulação de corte único existe somente um alpha. Na de
+    múltiplos cortes (multicorte), existe um alpha por abertura, e
+    cada corte limita somente o alpha da sua abertura. As variáveis
+    eta e s só existem no multicorte com aversão a risco, e compõem
+    o CVaR dos alphas:
+
+    CVaR = eta + (1 / n_cauda) * sum(s), com s >= alpha - eta, s >= 0
+
+    As restrições de igualdade são o balanço hídrico de cada UHE,
+    seguido do atendimento à demanda.
+    """
+    def __init__(self,
+                 cfg: ConfigGeral,
+                 uhes: List[UHE],
+                 utes: List[UTE],
+                 demanda: Demanda,
+                 backend: Backend = Backend.GLPK,
+                 multicorte: bool = False):
+        self.n_uhes = len(uhes)
+        self.n_utes = len(utes)
+        n = self.n_uhes
+        m = self.n_utes
+        self.n_alphas = cfg.aberturas_periodo if multicorte else 1
+        # Número de aberturas na cauda e peso do CVaR, considerados
+        # como variáveis somente no multicorte
+        n_cauda = int(cfg.aberturas_cauda * cfg.aberturas_periodo)
+        lmbda = cfg.peso_cauda
+        self.cvar = multicorte and n_cauda > 0 and lmbda > 0
+        # Índices de cada grupo de variáveis
+        self.i_vf = 0
+        self.i_vt = n
+        self.i_vv = 2 * n
+        self.i_gt = 3 * n
+        self.i_def = 3 * n + m
+        self.i_alpha = 3 * n + m + 1
+        self.i_eta = self.i_alpha + self.n_alphas
+        self.i_s = self.i_eta + 1
+        self.n_variaveis = self.i_eta
+        if self.cvar:
+            self.n_variaveis = self.i_s + self.n_alphas
+
+        # ----- Função objetivo -----
+        c = np.zeros((self.n_variaveis,))
+        for i, ut in enumerate(utes):
+            c[self.i_gt + i] = ut.custo
+        c[self.i_def] = cfg.custo_deficit
+        c[self.i_vv:self.i_vv + n] = 0.01
+        if not multicorte:
+            c[self.i_alpha] = 1.0
+        else:
+            # Cada abertura é equiprovável
+            prob = 1.0 / self.n_alphas
+            c[self.i_alpha:self.i_eta] = (1 - lmbda) * prob
+            if self.cvar:
+                c[self.i_eta] = lmbda
+                c[self.i_s:self.i_s + self.n_alphas] = lmbda / n_cauda
+        self.c = c
+
+        # ----- Restrições de igualdade -----
+        lin: List[int] = []
+        col: List[int] = []
+        val: List[float] = []
+        # Balanço hídrico: vf + vt + vv = vi + afl
+        for i in range(n):
+            for j in [self.i_vf + i, self.i_vt + i, self.i_vv + i]:
+                lin.append(i)
+                col.append(j)
+                val.append(1.0)
+        # Atendimento à demanda
+        for i, uh in enumerate(uhes):
+            lin.append(n)
+            col.append(self.i_vt + i)
+            val.append(float(uh.produtividade))
+        for i in range(m):
+            lin.append(n)
+            col.append(self.i_gt + i)
+            val.append(1.0)
+        lin.append(n)
+        col.append(self.i_def)
+        val.append(1.0)
+        self.A = MatrizCOO(np.array(lin),
+                           np.array(col),
+                           np.array(val),
+                           (n + 1, self.n_variaveis))
+        self.b = np.zeros((n + 1,))
+        self.b[n] = float(demanda.demanda)
+
+        # ----- Restrições operacionais (desigualdades) -----
+        lin = []
+        col = []
+        val = []
+        h: List[float] = []
+
+        def adiciona_limite(j: int, coef: float, limite: float):
+            lin.append(len(h))
+            col.append(j)
+            val.append(coef)
+            h.append(float(limite))
+
+        for i, uh in enumerate(uhes):
+            # Volume útil do reservatório
+            adiciona_limite(self.i_vf + i, 1.0, uh.vol_maximo)
+            adiciona_limite(self.i_vf + i, -1.0, -uh.vol_minimo)
+            # Engolimento máximo
+            adiciona_limite(self.i_vt + i, 1.0, uh.engolimento)
+            # Factibilidade do problema
+            adiciona_limite(self.i_vt + i, -1.0, 0.0)
+            adiciona_limite(self.i_vv + i, -1.0, 0.0)
+        for i, ut in enumerate(utes):
+            # Geração mínima e máxima de térmica
+            adiciona_limite(self.i_gt + i, -1.0, 0.0)
+            adiciona_limite(self.i_gt + i, 1.0, ut.capacidade)
+        # Factibilidade do problema
+        adiciona_limite(self.i_def, -1.0, 0.0)
+        for a in range(self.n_alphas):
+            adiciona_limite(self.i_alpha + a, -1.0, 0.0)
+        if self.cvar:
+            for a in range(self.n_alphas):
+                adiciona_limite(self.i_s + a, -1.0, 0.0)
+                # alpha - eta - s <= 0
+                lin += [len(h)] * 3
+                col += [self.i_alpha + a, self.i_eta, self.i_s + a]
+                val += [1.0, -1.0, -1.0]
+                h.append(0.0)
+        self.G_base = MatrizCOO(np.array(lin),
+                                np.array(col),
+                                np.array(val),
+                                (len(h), self.n_variaveis))
+        self.h_base = np.array(h)
+
+        # ----- Cortes de Benders -----
+        self.coefs_cortes = np.zeros((0, n))
+        self.termos_cortes = np.zeros((0,))
+        # Índice do alpha limitado por cada corte
+        self.alphas_cortes = np.zeros((0,), dtype=np.int64)
+        # Incrementada a cada substituição dos cortes, para que cópias
+        # do subproblema em outros processos saibam quando refazê-los
+        self.versao_cortes = 0
+        # Cortes já presentes no resolvedor e se eles foram substituídos
+        self.__cortes_sincronizados = 0
+        self.__cortes_alterados = False
+        self.resolvedor = backend.cria_resolvedor()
+        self.resolvedor.monta(self.c,
+                              self.G_base,
+                              self.h_base,
+                              self.A,
+                              self.b)
+
+        # Contadores de soluções e iterações do simplex
+        self.n_solucoes = 0
+        self.iteracoes = 0
+        # Resultados da última solução
+        self.x = np.zeros((self.n_variaveis,))
+        self.y = np.zeros((n + 1,))
+        self.fobj = 0.0
+
+    @property
+    def n_cortes(self) -> int:
+        return self.coefs_cortes.shape[0]
+
+    def define_cortes(self,
+                      coefs: np.ndarray,
+                      termos: np.ndarray,
+                      alphas: Optional[np.ndarray] = None):
+        """
+        Substitui todas as linhas de cortes do modelo pelas fornecidas.
+        Sem os índices dos alphas, todos os cortes limitam o primeiro.
+        """
+        self.coefs_cortes = np.asarray(coefs,
+                                       dtype=float).reshape(-1, self.n_uhes)
+        self.termos_cortes = np.asarray(termos, dtype=float).reshape(-1)
+        if alphas is None:
+            alphas = np.zeros((len(self.termos_cortes),), dtype=np.int64)
+        self.alphas_cortes = np.asarray(alphas, dtype=np.int64).reshape(-1)
+        self.__cortes_alterados = True
+        self.versao_cortes += 1
+
+    def sincroniza_cortes(self,
+                          coefs: np.ndarray,
+                          termos: np.ndarray,
+                          versao: int = -1,
+                          alphas: Optional[np.ndarray] = None):
+        """
+        Faz com que os cortes do subproblema sejam os fornecidos. Se
+        os cortes só foram acrescentados desde a última sincronização,
+        basta incluir as linhas que ainda não existem no modelo. Quando
+        é fornecida uma versão diferente da atual, os cortes foram
+        substituídos e o modelo é refeito.
+        """
+        k = self.n_cortes
+        if len(termos) < k or (versao >= 0 and
+                               versao != self.versao_cortes):
+            self.define_cortes(coefs, termos, alphas)
+            if versao >= 0:
+                self.versao_cortes = versao
+            return
+        if alphas is None:
+            alphas = np.zeros((len(termos),), dtype=np.int64)
+        coefs = np.asarray(coefs, dtype=float).reshape(-1, self.n_uhes)
+        self.acrescenta_cortes(coefs[k:], termos[k:], alphas[k:])
+
+    def acrescenta_cortes(self,
+                          coefs: np.ndarray,
+                          termos: np.ndarray,
+                          alphas: Optional[np.ndarray] = None):
+        """
+        Acrescenta novos cortes aos já existentes no modelo. As linhas
+        só são incluídas no resolvedor na próxima solução.
+        """
+        if alphas is None:
+            alphas = np.zeros((len(termos),), dtype=np.int64)
+        coefs = np.asarray(coefs, dtype=float).reshape(-1, self.n_uhes)
+        self.coefs_cortes = np.vstack([self.coefs_cortes, coefs])
+        self.termos_cortes = np.concatenate([self.termos_cortes,
+                                             np.asarray(termos,
+                                                        dtype=float)])
+        self.alphas_cortes = np.concatenate([self.alphas_cortes,
+                                             np.asarray(alphas,
+                                                        dtype=np.int64)])
+
+    def atualiza_rhs(self,
+                     volumes_iniciais: Union[List[float], np.ndarray],
+                     afluencias: Union[List[float], np.ndarray]):
+        """
+        Atualiza o lado direito das restrições de balanço hídrico
+        com o volume inicial e a afluência do nó a ser resolvido.
+        """
+        n = self.n_uhes
+        self.b[:n] = (np.asarray(volumes_iniciais, dtype=float) +
+                      np.asarray(afluencias, dtype=float))
+
+    def __linhas_cortes(self, inicio: int):
+        """
+        Constroi as linhas de desigualdade dos cortes a partir do
+        índice fornecido, na forma coef * vf - alpha <= - termo_indep.
+        """
+        n = self.n_uhes
+        k = self.n_cortes - inicio
+        linhas = np.repeat(np.arange(k), n + 1)
+        colunas = np.zeros((k, n + 1), dtype=np.int64)
+        colunas[:, :n] = np.arange(self.i_vf, self.i_vf + n)
+        colunas[:, n] = self.i_alpha + self.alphas_cortes[inicio:]
+        valores = np.hstack([self.coefs_cortes[inicio:],
+                             -np.ones((k, 1))]).reshape(-1)
+        G = MatrizCOO(linhas,
+                      colunas.reshape(-1),
+                      valores,
+                      (k, self.n_variaveis))
+        return G, -self.termos_cortes[inicio:]
+
+    def __monta_desigualdades(self):
+        """
+        Atualiza as linhas dos cortes no resolvedor. Cortes novos são
+        somente acrescentados, enquanto uma substituição dos cortes
+        refaz todas as desigualdades.
+        """
+        if self.__cortes_alterados:
+            self.__cortes_alterados = False
+            self.__cortes_sincronizados = self.n_cortes
+            if self.n_cortes == 0:
+                self.resolvedor.atualiza_desigualdades(self.G_base,
+                                                       self.h_base)
+                return
+            G_cortes, h_cortes = self.__linhas_cortes(0)
+            G = MatrizCOO.empilha([self.G_base, G_cortes])
+            h = np.concatenate([self.h_base, h_cortes])
+            self.resolvedor.atualiza_desigualdades(G, h)
+        elif self.n_cortes > self.__cortes_sincronizados:
+            G_cortes, h_cortes = self.__linhas_cortes(
+                self.__cortes_sincronizados)
+            self.__cortes_sincronizados = self.n_cortes
+            self.resolvedor.adiciona_desigualdades(G_cortes, h_cortes)
+
+    def resolve(self):
+        """
+        Resolve o PL com os dados atuais do modelo, armazenando
+        as variáveis primais e os multiplicadores das igualdades.
+        """
+        self.__monta_desigualdades()
+        self.resolvedor.atualiza_igualdades(self.b)
+        sol = self.resolvedor.resolve()
+        self.x = sol.x
+        self.y = sol.y
+        self.fobj = sol.fobj
+        self.n_solucoes += 1
+        # Nem todo backend informa as iterações do simplex
+        if sol.iteracoes > 0:
+            self.iteracoes += sol.iteracoes
+
+    def carrega_solucao(self, x: np.ndarray, y: np.ndarray, fobj: float):
+        """
+        Define como última solução do PL uma obtida em outro processo,
+        para que seja lida pelos mesmos métodos de acesso.
+        """
+        self.x = x
+        self.y = y
+        self.fobj = fobj
+
+    def volumes_finais(self) -> List[float]:
+        return list(self.x[self.i_vf:self.i_vf + self.n_uhes])
+
+    def volumes_turbinados(self) -> List[float]:
+        return list(self.x[self.i_vt:self.i_vt + self.n_uhes])
+
+    def volumes_vertidos(self) -> List[float]:
+        return list(self.x[self.i_vv:self.i_vv + self.n_uhes])
+
+    def geracao_termica(self) -> List[float]:
+        return list(self.x[self.i_gt:self.i_gt + self.n_utes])
+
+    def deficit(self) -> float:
+        return float(self.x[self.i_def])
+
+    def alpha(self) -> float:
+        """
+        Custo futuro da solução, ponderando os alphas de cada abertura
+        (e o CVaR) no multicorte.
+        """
+        return float(np.dot(self.c[self.i_alpha:], self.x[self.i_alpha:]))
+
+    def custo_agua(self) -> List[float]:
+        return list(self.y[:self.n_uhes])
+
+    def saidas(self,
+               xs: np.ndarray,
+               ys: np.ndarray,
+               fobjs: np.ndarray) -> np.ndarray:
+        """
+        Extrai as saídas de um conjunto de soluções do subproblema,
+        dadas as variáveis primais, com dimensões (soluções, variáveis),
+        os multiplicadores das igualdades e as funções objetivo. As
+        colunas seguem a ordem dos valores de um cenário, sem as
+        afluências.
+        """
+        n = self.n_uhes
+        alphas = xs[:, self.i_alpha:] @ self.c[self.i_alpha:]
+        return np.column_stack([xs[:, self.i_vf:self.i_vf + n],
+                                xs[:, self.i_vt:self.i_vt + n],
+                                xs[:, self.i_vv:self.i_vv + n],
+                                ys[:, :n],
+                                xs[:, self.i_gt:self.i_gt + self.n_utes],
+                                xs[:, self.i_def],
+                                np.abs(ys[:, n]),
+                                fobjs - alphas,
+                                alphas,
+                                fobjs])
+
+    def cmo(self) -> float:
+        return abs(float(self.y[self.n_uhes]))
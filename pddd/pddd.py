@@ -1,15 +1,19 @@
 from utils.leituraentrada import LeituraEntrada
 from modelos.arvoreafluencias import ArvoreAfluencias
 from modelos.cenario import Cenario
+from modelos.conjuntocortes import ConjuntoCortes, seleciona_dominantes
 from modelos.cortebenders import CorteBenders
 from modelos.resultado import Resultado
+from modelos.subproblema import Subproblema
+from resolvedores.backend import Backend
+from utils.arquivocortes import ArquivoCortes
+from utils.checkpoint import Checkpoint, exporta_cortes, exporta_nos
+from utils.checkpoint import importa_cortes, importa_nos
 
 import logging
 import coloredlogs  # type: ignore
 import numpy as np  # type: ignore
-from typing import List
-from cvxopt.modeling import variable, op, solvers, _function  # type: ignore
-solvers.options['glpk'] = {'msg_lev': 'GLP_MSG_OFF'}
+from typing import Dict, List, Optional, Tuple
 logger = logging.getLogger(__name__)
 
 
@@ -19,7 +23,12 @@ class PDDD:
     planejamento energético através de Programação
     Dinâmica Dual Determinística.
     """
-    def __init__(self, e: LeituraEntrada, LOG_LEVEL: str):
+    def __init__(self,
+                 e: LeituraEntrada,
+                 LOG_LEVEL: str,
+                 backend: Backend = Backend.GLPK,
+                 checkpoint: Optional[Checkpoint] = None,
+                 cortes_iniciais: Optional[ArquivoCortes] = None):
         self.cfg = e.cfg
         self.uhes = e.uhes
         self.utes = e.utes
@@ -27,116 +36,97 @@ class PDDD:
         coloredlogs.install(logger=logger, level=LOG_LEVEL)
         self.arvore = ArvoreAfluencias(e)
         self.arvore.monta_arvore_afluencias()
+        self.arvore.monta_cortes()
         self.sim_final = ArvoreAfluencias(e)
         self.cenarios: List[Cenario] = []
         self.z_sup: List[float] = []
         self.z_inf: List[float] = []
+        # Subproblemas de cada período, montados uma única vez
+        self.subproblemas = [Subproblema(self.cfg,
+                                         self.uhes,
+                                         self.utes,
+                                         self.demandas[p],
+                                         backend)
+                             for p in range(self.cfg.n_periodos)]
+        # Volumes finais visitados em cada nó, para a seleção de cortes
+        self.estados: List[List[List[List[float]]]] = [
+            [[] for _ in range(n)] for n in self.arvore.nos_por_periodo]
+        # Número de cortes e de selecionados no período em solução
+        self.n_cortes_periodo = [0, 0]
+        # Checkpoint periódico do estado da solução (opcional)
+        self.checkpoint = checkpoint
+        # Cortes de um estudo anterior, usados como partida (opcional)
+        if cortes_iniciais is not None:
+            self.__carrega_cortes_iniciais(cortes_iniciais)
 
-    def __monta_pl(self,
-                   arvore: ArvoreAfluencias,
-                   periodo: int,
-                   indice_no: int) -> op:
+    def __carrega_cortes_iniciais(self, arquivo: ArquivoCortes):
         """
-        Realiza a configuração das variáveis e restrições de um
-        problema de otimização a ser realizado no problema de PDDD.
+        Acrescenta ao conjunto de cada nó os cortes do mesmo nó em
+        um estudo anterior, com a mesma árvore.
         """
-        # ----- Variáveis -----
-        self.vf = variable(len(self.uhes), "Volume final (hm3)")
-        self.vt = variable(len(self.uhes), "Volume turbinado (hm3)")
-        self.vv = variable(len(self.uhes), "Volume vertido (hm3)")
-        self.gt = variable(len(self.utes), "Geração térmica (MWmed)")
-        self.deficit = variable(1, "Déficit (MWmed)")
-        self.alpha = variable(1, "Custo futuro ($)")
-
-        # ----- Função objetivo -----
-        self.func_objetivo: _function = 0
-        for i, ut in enumerate(self.utes):
-            self.func_objetivo += ut.custo * self.gt[i]
-
-        self.func_objetivo += self.cfg.custo_deficit * self.deficit[0]
-
-        for i in range(len(self.uhes)):
-            self.func_objetivo += 0.01 * self.vv[i]
-
-        self.func_objetivo += 1.0 * self.alpha[0]
-
-        # ----- Restrições -----
-        self.cons = []
-        # Balanço hídrico
-        for i, uh in enumerate(self.uhes):
-            if periodo == 0:
-                # O volume inicial é dado no problema
-                vi = float(uh.vol_inicial)
-            else:
-                # O volume inicial é o final do nó anterior
-                ant = arvore.indice_no_anterior(periodo, indice_no)
-                vi = float(arvore.arvore[periodo - 1][ant]
-                           .volumes_finais[i])
-            afl = float(arvore.arvore[periodo][indice_no]
-                        .afluencias[i])
-            self.cons.append(self.vf[i] == vi + afl - self.vt[i] - self.vv[i])
+        nos_por_periodo = self.arvore.nos_por_periodo
+        if not arquivo.compativel(self.cfg, nos_por_periodo):
+            return
+        cortes = arquivo.le(self.cfg, nos_por_periodo)
+        for j, conjuntos in enumerate(cortes):
+            for k, conjunto in enumerate(conjuntos):
+                self.arvore.cortes[j][k].adiciona_conjunto(conjunto)
 
-        # Atendimento à demanda
-        gerado = 0
-        for i, uh in enumerate(self.uhes):
-            gerado += float(uh.produtividade) * self.vt[i]
-        for i, ut in enumerate(self.utes):
-            gerado += self.gt[i]
-        gerado += self.deficit[0]
-        self.cons.append(gerado == float(self.demandas[periodo].demanda))
-        # Restrições operacionais
-        for i, uh in enumerate(self.uhes):
-            # Volume útil do reservatório
-            self.cons.append(self.vf[i] <= uh.vol_maximo)
-            self.cons.append(self.vf[i] >= uh.vol_minimo)
-            # Engolimento máximo
-            self.cons.append(self.vt[i] <= uh.engolimento)
-            # Factibilidade do problema
-            self.cons.append(self.vt[i] >= 0)
-            self.cons.append(self.vv[i] >= 0)
-        for i, ut in enumerate(self.utes):
-            # Geração mínima e máxima de térmica
-            self.cons.append(self.gt[i] >= 0)
-            self.cons.append(self.gt[i] <= ut.capacidade)
-        # Factibilidade do problema
-        self.cons.append(self.deficit[0] >= 0)
+    def __prepara_pl(self,
+                     arvore: ArvoreAfluencias,
+                     periodo: int,
+                     indice_no: int) -> Subproblema:
+        """
+        Atualiza o subproblema do período com o volume inicial, as
+        afluências e os cortes médios dos nós futuros do nó a ser
+        resolvido no problema de PDDD.
+        """
+        if periodo == 0:
+            # O volume inicial é dado no problema
+            vis = [float(uh.vol_inicial) for uh in self.uhes]
+        else:
+            # O volume inicial é o final do nó anterior
+            ant = arvore.indice_no_anterior(periodo, indice_no)
+            vis = arvore.estado_periodo(periodo - 1).volumes_finais[ant]
+        afls = arvore.afluencias_no(periodo, indice_no)
+        subproblema = self.subproblemas[periodo]
+        subproblema.atualiza_rhs(vis, afls)
 
         # Cortes de Benders - exceto se estiver no último período
-        self.cons.append(self.alpha[0] >= 0)
         if periodo == self.cfg.n_periodos - 1:
-            return
+            return subproblema
         num_uhes = len(self.uhes)
         # Obtém o corte médio dos prováveis nós futuros
         indices_futuros = arvore.indices_proximos_nos(periodo,
                                                       indice_no)
-        n_futuros = len(indices_futuros)
-        no_futuro = arvore.arvore[periodo + 1][indices_futuros[0]]
-        num_cortes = len(no_futuro.cortes)
-
-        # Calcula os cortes médios para cada corte existente nos nós futuros
-        cortes_medios: List[CorteBenders] = []
-        for i_corte in range(num_cortes):
-            cma_medios = [0.] * num_uhes
-            termo_indep_medio = 0.
-            for i_futuro in indices_futuros:
-                no_futuro = arvore.arvore[periodo + 1][i_futuro]
-                corte = no_futuro.cortes[i_corte]
-                # Calcula o PI médio
-                for i_uhe in range(num_uhes):
-                    cma_medios[i_uhe] += corte.coef_angular[i_uhe] / n_futuros
-                # Calcula o termo independente médio
-                termo_indep_medio += corte.termo_indep / n_futuros
-            # Caso contrário, se não houver corte igual já no nó, adiciona
-            corte_medio = CorteBenders(cma_medios, termo_indep_medio, 0.0)
-            cortes_medios.append(corte_medio)
-
-        # Armazena os cortes médios como restrições
-        for corte in cortes_medios:
-            eq = 0.
-            for i_uhe in range(num_uhes):
-                eq += corte.coef_angular[i_uhe] * self.vf[i_uhe]
-            eq += float(corte.termo_indep)
-            self.cons.append(self.alpha[0] >= eq)
+        cortes_futuros = [arvore.cortes[periodo + 1][i]
+                          for i in indices_futuros]
+        num_cortes = len(cortes_futuros[0])
+        if num_cortes == 0:
+            subproblema.define_cortes(np.zeros((0, num_uhes)),
+                                      np.zeros((0,)))
+            return subproblema
+        # Calcula os cortes médios para cada corte existente nos nós
+        # futuros. Os arrays têm dimensões [nó futuro, corte, UHE].
+        coefs = np.array([c.coefs for c in cortes_futuros])
+        termos = np.array([c.termos for c in cortes_futuros])
+        coefs = np.mean(coefs, axis=0)
+        termos = np.mean(termos, axis=0)
+        # Seleciona os cortes médios que são máximos em algum dos
+        # volumes finais já visitados pelo nó
+        estados = self.estados[periodo][indice_no]
+        if (self.cfg.selecao_cortes and arvore is self.arvore and
+                len(estados) > 0):
+            selecionados = seleciona_dominantes(coefs,
+                                                termos,
+                                                np.array(estados),
+                                                self.cfg.max_cortes)
+            self.n_cortes_periodo[0] += num_cortes
+            self.n_cortes_periodo[1] += len(selecionados)
+            coefs = coefs[selecionados]
+            termos = termos[selecionados]
+        subproblema.define_cortes(coefs, termos)
+        return subproblema
 
     def resolve_pddd(self) -> Resultado:
         """
@@ -144,10 +134,10 @@ class PDDD:
         PDDD.
         """
         # Erros e condição de parada
-        it = 0
         self.tol = 1e-3
         self.z_sup = []
         self.z_inf = []
+        it = self.__retoma_checkpoint()
         logger.info("# RESOLVENDO PROBLEMA DE PDDD #")
         logger.info("X----X-------------------X-------------------X")
         logger.info("  IT        Z_SUP                 Z_INF       ")
@@ -158,11 +148,11 @@ class PDDD:
                     # Monta e resolve o PL do nó (exceto a partir da
                     # segunda iteração, no período 1 - pois a backward é igual)
                     if it == 0 or j > 0:
-                        self.__monta_pl(self.arvore, j, k)
-                        self.pl = op(self.func_objetivo, self.cons)
-                        self.pl.solve("dense", "glpk")
+                        self.__prepara_pl(self.arvore, j, k).resolve()
                         # Armazena as saídas obtidas no PL no objeto nó
                         self.__armazena_saidas(self.arvore, j, k)
+            if self.cfg.selecao_cortes:
+                self.__armazena_estados()
             # Condição de saída por convergência
             it += 1
             if self.__verifica_convergencia(it):
@@ -173,19 +163,27 @@ class PDDD:
                 break
             # Executa a backward para cada nó
             for j in range(self.cfg.n_periodos - 1, -1, -1):
+                self.n_cortes_periodo = [0, 0]
                 for k in range(self.arvore.nos_por_periodo[j] - 1, -1, -1):
                     # Monta e resolve o PL do nó (não resolve o último período)
                     if j != self.cfg.n_periodos - 1:
-                        self.__monta_pl(self.arvore, j, k)
-                        self.pl = op(self.func_objetivo, self.cons)
-                        self.pl.solve("dense", "glpk")
+                        self.__prepara_pl(self.arvore, j, k).resolve()
                         # Armazena as saídas obtidas no PL no objeto nó
                         self.__armazena_saidas(self.arvore, j, k)
-                    # Gera um novo corte para o nó
-                    self.__cria_corte(j, k)
+                # Gera um novo corte para cada nó
+                self.__cria_cortes(j)
+                if self.cfg.selecao_cortes:
+                    total, selecionados = self.n_cortes_periodo
+                    logger.debug(" IT {:4} - PERÍODO {:3}: {} CORTES, "
+                                 "{} SELECIONADOS".format(it,
+                                                          j + 1,
+                                                          total,
+                                                          selecionados))
+            self.__salva_checkpoint(it)
         # Terminando o loop do método, organiza e retorna os resultados
         logger.info("X----X-------------------X-------------------X")
         self.__simulacao_final()
+        self.__loga_iteracoes_simplex()
         logger.info("# FIM DA SOLUÇÃO #")
         logger.info("----------------------------------------")
         return Resultado(self.cfg,
@@ -197,51 +195,106 @@ class PDDD:
                          [],
                          self.__organiza_cortes())
 
-    def __organiza_cortes(self) -> List[List[List[CorteBenders]]]:
+    def __salva_checkpoint(self, it: int):
+        """
+        Salva o estado da solução ao fim de uma iteração: os cortes e
+        os resultados de cada nó, os estados visitados, o histórico
+        dos limites e os contadores dos subproblemas. Os resultados
+        dos nós são necessários porque a forward seguinte não resolve
+        novamente o primeiro período.
+        """
+        if self.checkpoint is None or not self.checkpoint.deve_salvar(it):
+            return
+        dados: Dict[str, np.ndarray] = {
+            "z_sup": np.array(self.z_sup),
+            "z_inf": np.array(self.z_inf),
+            "iteracoes": np.array([s.iteracoes for s in self.subproblemas]),
+            "n_solucoes": np.array([s.n_solucoes for s in self.subproblemas])
+            }
+        for j in range(self.cfg.n_periodos):
+            dados.update(exporta_nos("nos_{}".format(j),
+                                     self.arvore.estado_periodo(j)))
+            dados["estados_{}".format(j)] = np.array(self.estados[j])
+            for k, cortes in enumerate(self.arvore.cortes[j]):
+                dados.update(exporta_cortes("cortes_{}_{}".format(j, k),
+                                            cortes))
+        self.checkpoint.salva(self.cfg, it, dados)
+
+    def __retoma_checkpoint(self) -> int:
         """
+        Restaura o estado salvo no último checkpoint, se a retomada
+        foi pedida, retornando a iteração a partir da qual a solução
+        continua.
         """
-        cortes: List[List[List[CorteBenders]]] = []
-        for p in range(self.cfg.n_periodos):
-            cortes.append([])
-            for n in range(self.arvore.nos_por_periodo[p]):
-                no = self.arvore.arvore[p][n]
-                cortes[-1].append(no.cortes)
-        return cortes
+        if self.checkpoint is None:
+            return 0
+        dados = self.checkpoint.carrega(self.cfg)
+        if dados is None:
+            return 0
+        self.z_sup = [float(z) for z in dados["z_sup"]]
+        self.z_inf = [float(z) for z in dados["z_inf"]]
+        for p, s in enumerate(self.subproblemas):
+            s.iteracoes = int(dados["iteracoes"][p])
+            s.n_solucoes = int(dados["n_solucoes"][p])
+        for j in range(self.cfg.n_periodos):
+            importa_nos("nos_{}".format(j),
+                        self.arvore.estado_periodo(j),
+                        dados)
+            self.estados[j] = [[[float(v) for v in estado]
+                                for estado in estados_no]
+                               for estados_no in dados["estados_{}".
+                                                       format(j)]]
+            for k, cortes in enumerate(self.arvore.cortes[j]):
+                importa_cortes("cortes_{}_{}".format(j, k), cortes, dados)
+        return int(dados["it"])
 
-    def __cria_corte(self, j: int, k: int):
+    def __armazena_estados(self):
         """
-        Cria um novo corte de Benders para um nó, tomando a média
-        dos cortes dos nós futuros (exceto no último período).
+        Acumula os volumes finais de cada nó obtidos na FORWARD, que
+        são os estados usados na seleção de cortes.
         """
-        no = self.arvore.arvore[j][k]
-        coefs_angulares: List[float] = []
-        termo_indep = no.custo_total
-        for i, uh in enumerate(self.uhes):
-            coefs_angulares.append(-no.custo_agua[i])
-            if j == 0:
-                vi = uh.vol_inicial
-            else:
-                indice_ant = self.arvore.indice_no_anterior(j, k)
-                ant = self.arvore.arvore[j - 1][indice_ant]
-                vi = ant.volumes_finais[i]
-            termo_indep -= vi * coefs_angulares[i]
-        corte = CorteBenders(coefs_angulares, termo_indep, no.custo_total)
-        no.adiciona_corte(corte, True)
+        for j in range(self.cfg.n_periodos):
+            volumes_finais = self.arvore.estado_periodo(j).volumes_finais
+            for k in range(self.arvore.nos_por_periodo[j]):
+                self.estados[j][k].append(list(volumes_finais[k, :]))
+
+    def __organiza_cortes(self) -> List[List[ConjuntoCortes]]:
+        """
+        """
+        return self.arvore.cortes
+
+    def __cria_cortes(self, j: int):
+        """
+        Cria um novo corte de Benders para cada nó de um período, a
+        partir do custo total e dos custos da água armazenados, com
+        os volumes iniciais dos nós como ponto de linearização.
+        """
+        estado = self.arvore.estado_periodo(j)
+        n_nos = self.arvore.nos_por_periodo[j]
+        coefs = -estado.custo_agua
+        fobjs = estado.custo_total
+        if j == 0:
+            vis = np.array([[uh.vol_inicial for uh in self.uhes]],
+                           dtype=float)
+        else:
+            anteriores = self.arvore.indices_nos_anteriores(j)
+            estado_anterior = self.arvore.estado_periodo(j - 1)
+            vis = estado_anterior.volumes_finais[anteriores, :]
+        termos = fobjs.copy()
+        for i in range(len(self.uhes)):
+            termos -= vis[:, i] * coefs[:, i]
+        for k in range(n_nos - 1, -1, -1):
+            corte = CorteBenders(list(coefs[k, :]),
+                                 float(termos[k]),
+                                 float(fobjs[k]))
+            self.arvore.cortes[j][k].adiciona_corte(corte)
 
     def __verifica_convergencia(self, it: int) -> bool:
         """
         Verifica se houve a convergência para a PDDD, conferindo
         os limites inferior e superior e a tolerância.
         """
-        z_sup = 0.0
-        z_inf = 0.0
-        for j in range(self.cfg.n_periodos):
-            nos_periodo = self.arvore.nos_por_periodo[j]
-            for k in range(nos_periodo):
-                no = self.arvore.arvore[j][k]
-                z_sup += (1. / nos_periodo) * no.custo_imediato
-                if j == 0:
-                    z_inf = no.custo_total
+        z_sup, z_inf = self.__limites()
         self.z_sup.append(z_sup)
         self.z_inf.append(z_inf)
 
@@ -257,37 +310,39 @@ class PDDD:
 
         return False
 
+    def __limites(self) -> Tuple[float, float]:
+        """
+        Calcula os limites superior e inferior a partir dos custos
+        armazenados nos nós da árvore. O Z_sup é a soma, em todos os
+        períodos, do custo imediato médio dos nós do período.
+        """
+        z_sup = float(sum([np.mean(self.arvore.estado_periodo(j).
+                                   custo_imediato)
+                           for j in range(self.cfg.n_periodos)]))
+        z_inf = float(self.arvore.estado_periodo(0).custo_total[0])
+        return z_sup, z_inf
+
     def __armazena_saidas(self, arvore: ArvoreAfluencias, j: int, k: int):
         """
         Processa as saídas do problema e armazena nos nós.
         """
-        vol_finais: List[float] = []
-        vol_turbinados: List[float] = []
-        vol_vertidos: List[float] = []
-        custo_agua: List[float] = []
-        geracao_termica: List[float] = []
-        for i, uh in enumerate(self.uhes):
-            vol_finais.append(self.vf[i].value()[0])
-            vol_turbinados.append(self.vt[i].value()[0])
-            vol_vertidos.append(self.vv[i].value()[0])
-            custo_agua.append(self.cons[i].multiplier.value[0])
-        for i, ut in enumerate(self.utes):
-            geracao_termica.append(self.gt[i].value()[0])
-        deficit = self.deficit[0].value()[0]
-        c_cmo = len(self.uhes)
-        cmo = abs(self.cons[c_cmo].multiplier.value[0])
-        alpha = self.alpha[0].value()[0]
-        func_objetivo = self.func_objetivo.value()[0]
-        arvore.arvore[j][k].preenche_resultados(vol_finais,
-                                                vol_turbinados,
-                                                vol_vertidos,
-                                                custo_agua,
-                                                geracao_termica,
-                                                deficit,
-                                                cmo,
-                                                func_objetivo - alpha,
-                                                alpha,
-                                                func_objetivo)
+        subproblema = self.subproblemas[j]
+        saidas = subproblema.saidas(subproblema.x[np.newaxis, :],
+                                    subproblema.y[np.newaxis, :],
+                                    np.array([subproblema.fobj]))
+        arvore.estado_periodo(j).armazena(k, saidas)
+
+    def __loga_iteracoes_simplex(self):
+        """
+        Faz o logging do total de iterações do simplex em todos os
+        subproblemas, quando informado pelo backend.
+        """
+        iteracoes = sum([s.iteracoes for s in self.subproblemas])
+        solucoes = sum([s.n_solucoes for s in self.subproblemas])
+        if iteracoes == 0 or solucoes == 0:
+            return
+        logger.info(" ITERAÇÕES SIMPLEX: {} EM {} PLs ({:.2f} POR PL)".
+                    format(iteracoes, solucoes, iteracoes / solucoes))
 
     def __simulacao_final(self):
         """
@@ -299,20 +354,10 @@ class PDDD:
         for j in range(self.cfg.n_periodos):
             nos_periodo = self.arvore.nos_por_periodo[j]
             for k in range(nos_periodo):
-                self.__monta_pl(self.sim_final, j, k)
-                self.pl = op(self.func_objetivo, self.cons)
-                self.pl.solve("dense", "glpk")
+                self.__prepara_pl(self.sim_final, j, k).resolve()
                 # Armazena as saídas obtidas no PL no objeto nó
                 self.__armazena_saidas(self.sim_final, j, k)
-        z_sup = 0.0
-        z_inf = 0.0
-        for j in range(self.cfg.n_periodos):
-            nos_periodo = self.arvore.nos_por_periodo[j]
-            for k in range(nos_periodo):
-                no = self.arvore.arvore[j][k]
-                z_sup += (1. / nos_periodo) * no.custo_imediato
-                if j == 0:
-                    z_inf = no.custo_total
+        z_sup, z_inf = self.__limites()
         self.z_sup.append(z_sup)
         self.z_inf.append(z_inf)
         logger.info(" {:19.6f} {:19.6f}".format(z_sup, z_inf))
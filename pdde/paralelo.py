@@ -0,0 +1,327 @@
+from modelos.configgeral import ConfigGeral
+from modelos.conjuntocortes import ConjuntoCortes
+from modelos.cortebenders import CorteBenders
+from modelos.demanda import Demanda
+from modelos.subproblema import Subproblema
+from modelos.uhe import UHE
+from modelos.ute import UTE
+from resolvedores.backend import Backend
+
+from multiprocessing import Queue
+from queue import Empty
+from random import Random
+from typing import List, Tuple
+import numpy as np  # type: ignore
+
+# Subproblemas de cada período, montados uma vez em cada processo
+# do pool de execução paralela
+_subproblemas: List[Subproblema] = []
+# Cortes de cada subproblema na PDDE assíncrona, usados para descartar
+# os repetidos antes de incluí-los no PL
+_conjuntos: List[ConjuntoCortes] = []
+
+
+def resolve_aberturas(subproblema: Subproblema,
+                      vis_dentes: np.ndarray,
+                      afls_aberturas: List[List[float]]
+                      ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Resolve o subproblema para todas as aberturas de cada dente,
+    na ordem dos dentes e das aberturas. Retorna as funções objetivo,
+    com dimensões (dentes, aberturas), e os custos da água, com
+    dimensões (dentes, aberturas, uhes).
+    """
+    n_dentes = len(vis_dentes)
+    n_aberturas = len(afls_aberturas)
+    fobjs = np.zeros((n_dentes, n_aberturas))
+    custos_agua = np.zeros((n_dentes, n_aberturas, subproblema.n_uhes))
+    for d, vis in enumerate(vis_dentes):
+        for a, afls in enumerate(afls_aberturas):
+            subproblema.atualiza_rhs(vis, afls)
+            subproblema.resolve()
+            fobjs[d, a] = subproblema.fobj
+            custos_agua[d, a, :] = subproblema.custo_agua()
+    return fobjs, custos_agua
+
+
+def resolve_trajetorias(subproblemas: List[Subproblema],
+                        vis_iniciais: List[float],
+                        afls_dentes: np.ndarray
+                        ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Resolve a trajetória completa de cada dente, período a período,
+    partindo dos volumes iniciais do estudo. Retorna as variáveis
+    primais, com dimensões (dentes, períodos, variáveis), os
+    multiplicadores das igualdades, com dimensões (dentes, períodos,
+    igualdades), e as funções objetivo, com dimensões (dentes, períodos).
+    """
+    n_dentes = len(afls_dentes)
+    n_periodos = len(subproblemas)
+    n_variaveis = subproblemas[0].n_variaveis
+    n_igualdades = subproblemas[0].n_uhes + 1
+    xs = np.zeros((n_dentes, n_periodos, n_variaveis))
+    ys = np.zeros((n_dentes, n_periodos, n_igualdades))
+    fobjs = np.zeros((n_dentes, n_periodos))
+    for d, afls_periodos in enumerate(afls_dentes):
+        vis = vis_iniciais
+        for p, subproblema in enumerate(subproblemas):
+            subproblema.atualiza_rhs(vis, afls_periodos[p])
+            subproblema.resolve()
+            xs[d, p, :] = subproblema.x
+            ys[d, p, :] = subproblema.y
+            fobjs[d, p] = subproblema.fobj
+            # O volume inicial do próximo período é o final deste
+            vis = subproblema.volumes_finais()
+    return xs, ys, fobjs
+
+
+def obtem_corte(vis: List[float],
+                custo_total: float,
+                custo_agua: np.ndarray) -> CorteBenders:
+    """
+    Obtém o corte de Benders a partir do resultado de um PL
+    backward da PDDE.
+    """
+    coef_angular: List[float] = []
+    termo_indep = custo_total
+    for i in range(len(vis)):
+        coef_angular.append(-float(custo_agua[i]))
+        termo_indep -= vis[i] * coef_angular[i]
+    corte = CorteBenders(coef_angular, termo_indep, custo_total)
+    return corte
+
+
+def cria_corte(cfg: ConfigGeral,
+               cortes: List[CorteBenders]) -> CorteBenders:
+    """
+    Cria o corte de Benders médio para um nó, ponderando a média
+    de todas as aberturas e a média das aberturas da cauda.
+    """
+    num_uhes = len(cortes[0].coef_angular)
+    num_cortes = cfg.aberturas_periodo
+
+    # Calcula o corte médio, considerando cauda e não-cauda
+    coef_ang_medio = np.zeros((num_uhes,))
+    termo_indep_medio = 0.
+    for i, corte in enumerate(cortes):
+        # Calcula o coeficente angular médio
+        for i_uhe in range(num_uhes):
+            coef_ang_medio[i_uhe] += corte.coef_angular[i_uhe] / num_cortes
+        # Calcula o termo independente médio
+        termo_indep_medio += corte.termo_indep / num_cortes
+
+    # Obtém o número de cortes na cauda
+    num_cauda = int(cfg.aberturas_cauda * cfg.aberturas_periodo)
+    # Ordena os cortes e extrai os cortes da cauda
+    cortes_ordenados = sorted(cortes, reverse=True)
+    cortes_cauda = cortes_ordenados[:num_cauda]
+    # Calcula o corte médio da cauda
+    coef_ang_cauda = np.zeros((num_uhes,))
+    termo_indep_cauda = 0.
+    for i, corte in enumerate(cortes_cauda):
+        # Calcula o coeficiente angular médio
+        for i_uhe in range(num_uhes):
+            coef_ang_cauda[i_uhe] += corte.coef_angular[i_uhe] / num_cauda
+        # Calcula o termo independente médio
+        termo_indep_cauda += corte.termo_indep / num_cauda
+
+    # Pondera os cortes médios da cauda e não-cauda
+    lmbda = cfg.peso_cauda
+    coef_ang_ponderado = list((1 - lmbda) * coef_ang_medio
+                              + lmbda * coef_ang_cauda)
+    termo_indep_ponderado = ((1 - lmbda) * termo_indep_medio
+                             + lmbda * termo_indep_cauda)
+    corte_ponderado = CorteBenders(coef_ang_ponderado,
+                                   termo_indep_ponderado,
+                                   0.0)
+    return corte_ponderado
+
+
+def cortes_dente(cfg: ConfigGeral,
+                 vis: List[float],
+                 fobjs: np.ndarray,
+                 custos_agua: np.ndarray) -> List[Tuple[CorteBenders, int]]:
+    """
+    Obtém os cortes de um dente a partir das soluções de todas as
+    aberturas, junto do índice do alpha que cada corte limita. No
+    multicorte, cada abertura gera o seu corte. Caso contrário, é
+    gerado um único corte médio.
+    """
+    # A BACKWARD na PDDE, para obter um corte,
+    # na verdade é constituída de múltiplos problemas
+    # de despacho e o corte é o médio de todas.
+    cortes = [obtem_corte(vis, float(fobjs[a]), custos_agua[a, :])
+              for a in range(len(fobjs))]
+    if cfg.multicorte:
+        return [(corte, a) for a, corte in enumerate(cortes)]
+    return [(cria_corte(cfg, cortes), 0)]
+
+
+def inicializa_processo(cfg: ConfigGeral,
+                        uhes: List[UHE],
+                        utes: List[UTE],
+                        demandas: List[Demanda],
+                        backend: Backend):
+    """
+    Monta, em um processo do pool, os subproblemas de cada período.
+    """
+    global _subproblemas
+    _subproblemas = [Subproblema(cfg,
+                                 uhes,
+                                 utes,
+                                 demandas[p],
+                                 backend,
+                                 cfg.multicorte)
+                     for p in range(cfg.n_periodos)]
+
+
+def resolve_tarefa_forward(tarefa: tuple
+                           ) -> Tuple[np.ndarray, np.ndarray, np.ndarray,
+                                      List[int]]:
+    """
+    Resolve, em um processo do pool, as trajetórias de um bloco de
+    dentes. A tarefa contém os volumes iniciais do estudo, as
+    afluências de cada dente em cada período e os cortes atuais
+    do subproblema de cada período, com seus alphas e sua versão.
+    """
+    vis_iniciais, afls_dentes, cortes = tarefa
+    for subproblema, corte in zip(_subproblemas, cortes):
+        coefs, termos, alphas, versao = corte
+        subproblema.sincroniza_cortes(coefs, termos, versao, alphas)
+    iteracoes = [s.iteracoes for s in _subproblemas]
+    xs, ys, fobjs = resolve_trajetorias(_subproblemas,
+                                        vis_iniciais,
+                                        afls_dentes)
+    iteracoes = [s.iteracoes - i for s, i in zip(_subproblemas, iteracoes)]
+    return xs, ys, fobjs, iteracoes
+
+
+def resolve_tarefa_backward(tarefa: tuple
+                            ) -> Tuple[np.ndarray, np.ndarray, int]:
+    """
+    Resolve, em um processo do pool, as aberturas de um bloco de
+    dentes em um período. A tarefa contém o período, os volumes
+    iniciais de cada dente, as afluências de cada abertura e os
+    cortes atuais do subproblema do período, com seus alphas e sua
+    versão.
+    """
+    periodo, vis_dentes, afls_aberturas, cortes = tarefa
+    coefs, termos, alphas, versao = cortes
+    subproblema = _subproblemas[periodo]
+    subproblema.sincroniza_cortes(coefs, termos, versao, alphas)
+    iteracoes = subproblema.iteracoes
+    fobjs, custos_agua = resolve_aberturas(subproblema,
+                                           vis_dentes,
+                                           afls_aberturas)
+    return fobjs, custos_agua, subproblema.iteracoes - iteracoes
+
+
+def _acrescenta_cortes(periodo: int,
+                       coefs: np.ndarray,
+                       termos: np.ndarray,
+                       alphas: np.ndarray):
+    """
+    Acrescenta ao subproblema de um período somente os cortes que
+    ainda não estão no seu conjunto.
+    """
+    conjunto = _conjuntos[periodo]
+    novos = [i for i in range(len(termos))
+             if conjunto.adiciona(coefs[i],
+                                  float(termos[i]),
+                                  alpha=int(alphas[i]))]
+    if len(novos) > 0:
+        _subproblemas[periodo].acrescenta_cortes(coefs[novos],
+                                                 termos[novos],
+                                                 alphas[novos])
+
+
+def _recebe_cortes(entrada: Queue) -> bool:
+    """
+    Acrescenta aos subproblemas os cortes já publicados pelos demais
+    processos da PDDE assíncrona, sem aguardar por novos. Cada
+    mensagem contém os cortes de uma trajetória, em todos os períodos.
+    Retorna False se foi recebido o sinal de parada.
+    """
+    ativo = True
+    while True:
+        try:
+            mensagem = entrada.get_nowait()
+        except Empty:
+            return ativo
+        if mensagem is None:
+            ativo = False
+            continue
+        for periodo, coefs, termos, alphas in mensagem:
+            _acrescenta_cortes(periodo, coefs, termos, alphas)
+
+
+def executa_trabalhador(indice: int,
+                        cfg: ConfigGeral,
+                        uhes: List[UHE],
+                        utes: List[UTE],
+                        demandas: List[Demanda],
+                        backend: Backend,
+                        afls_forward: List[List[List[float]]],
+                        afls_aberturas: List[List[List[float]]],
+                        entrada: Queue,
+                        saida: Queue):
+    """
+    Laço de um processo da PDDE assíncrona. A cada passo, sorteia uma
+    trajetória entre as afluências da forward, resolve a forward e a
+    backward e publica, em uma única mensagem, os cortes obtidos em
+    todos os períodos. Antes da forward e da backward, são incluídos
+    os cortes mais recentes recebidos na entrada. O laço termina após
+    receber o sinal de parada.
+    """
+    global _conjuntos
+    inicializa_processo(cfg, uhes, utes, demandas, backend)
+    n_alphas = cfg.aberturas_periodo if cfg.multicorte else 1
+    _conjuntos = [ConjuntoCortes(len(uhes), n_alphas=n_alphas)
+                  for _ in _subproblemas]
+    gerador = Random(cfg.semente + indice + 1)
+    vis_iniciais = [float(uh.vol_inicial) for uh in uhes]
+    n_periodos = len(_subproblemas)
+    ativo = True
+    while ativo:
+        iteracoes = [s.iteracoes for s in _subproblemas]
+        solucoes = [s.n_solucoes for s in _subproblemas]
+        # Forward em uma trajetória sorteada
+        ativo = _recebe_cortes(entrada) and ativo
+        vis = vis_iniciais
+        vis_periodos: List[List[float]] = []
+        custos_imediatos = np.zeros((n_periodos,))
+        for p, subproblema in enumerate(_subproblemas):
+            vis_periodos.append(vis)
+            subproblema.atualiza_rhs(vis, gerador.choice(afls_forward[p]))
+            subproblema.resolve()
+            custos_imediatos[p] = subproblema.fobj - subproblema.alpha()
+            vis = subproblema.volumes_finais()
+        # Backward nos estados visitados
+        ativo = _recebe_cortes(entrada) and ativo
+        cortes_trajetoria: List[tuple] = []
+        for p in range(n_periodos - 1, -1, -1):
+            fobjs, custos_agua = resolve_aberturas(_subproblemas[p],
+                                                   np.array([vis_periodos[p]]),
+                                                   afls_aberturas[p])
+            cortes = cortes_dente(cfg,
+                                  vis_periodos[p],
+                                  fobjs[0],
+                                  custos_agua[0])
+            coefs = np.array([c.coef_angular for c, _ in cortes])
+            termos = np.array([c.termo_indep for c, _ in cortes])
+            fobjs_cortes = np.array([c.fobj for c, _ in cortes])
+            alphas = np.array([a for _, a in cortes], dtype=np.int64)
+            # Os cortes próprios entram no período anterior sem esperar
+            # pela volta da publicação
+            if p > 0:
+                _acrescenta_cortes(p - 1, coefs, termos, alphas)
+            cortes_trajetoria.append((p, coefs, termos, fobjs_cortes,
+                                      alphas))
+        saida.put(("TRAJETORIA", indice, cortes_trajetoria,
+                   custos_imediatos,
+                   np.array(vis_periodos),
+                   [s.iteracoes - i for s, i in zip(_subproblemas,
+                                                    iteracoes)],
+                   [s.n_solucoes - n for s, n in zip(_subproblemas,
+                                                     solucoes)]))
+    saida.put(("FIM", indice))
@@ -1,18 +1,31 @@
-from modelos.cortebenders import CorteBenders
+from modelos.conjuntocortes import ConjuntoCortes
+from modelos.estatisticascenarios import EstatisticasCenarios
 from modelos.penteafluencias import PenteAfluencias
 from modelos.cenario import Cenario
 from modelos.resultado import Resultado
+from modelos.subproblema import Subproblema
+from pdde.paralelo import cortes_dente, executa_trabalhador
+from pdde.paralelo import inicializa_processo
+from pdde.paralelo import resolve_aberturas, resolve_trajetorias
+from pdde.paralelo import resolve_tarefa_backward, resolve_tarefa_forward
+from resolvedores.backend import Backend
+from utils.arquivocortes import ArquivoCortes
+from utils.checkpoint import Checkpoint, exporta_cortes, importa_cortes
 from utils.leituraentrada import LeituraEntrada
 
+import time
 import logging
 import coloredlogs  # type: ignore
-from typing import List, Tuple
+from itertools import islice
+from multiprocessing import Pool, Process, Queue
+from typing import Dict, List, Optional, Tuple
 import numpy as np  # type: ignore
 from statistics import pstdev, mean
-from cvxopt.modeling import variable, op, solvers, _function  # type: ignore
-solvers.options['glpk'] = {'msg_lev': 'GLP_MSG_OFF'}
 logger = logging.getLogger(__name__)
 
+# Número de cenários da simulação final resolvidos de uma vez
+CENARIOS_POR_LOTE = 1024
+
 
 class PDDE:
     """
@@ -20,7 +33,14 @@ class PDDE:
     planejamento energético através de Programação
     Dinâmica Dual Estocástica.
     """
-    def __init__(self, e: LeituraEntrada, LOG_LEVEL: str):
+    def __init__(self,
+                 e: LeituraEntrada,
+                 LOG_LEVEL: str,
+                 backend: Backend = Backend.GLPK,
+                 workers: int = 1,
+                 assincrona: bool = False,
+                 checkpoint: Optional[Checkpoint] = None,
+                 cortes_iniciais: Optional[ArquivoCortes] = None):
         self.cfg = e.cfg
         self.uhes = e.uhes
         self.utes = e.utes
@@ -29,99 +49,73 @@ class PDDE:
         self.pente = PenteAfluencias(e)
         self.pente.monta_pente_afluencias()
         self.sim_final = PenteAfluencias(e)
+        self.estatisticas = EstatisticasCenarios(
+            self.cfg.n_uhes,
+            self.cfg.n_utes,
+            self.cfg.n_periodos,
+            self.cfg.max_cenarios_armazenados,
+            self.cfg.semente)
         self.cenarios: List[Cenario] = []
         self.z_sup: List[float] = []
         self.z_inf: List[float] = []
+        # Subproblemas de cada período, montados uma única vez
+        self.subproblemas = [Subproblema(self.cfg,
+                                         self.uhes,
+                                         self.utes,
+                                         self.demandas[p],
+                                         backend,
+                                         self.cfg.multicorte)
+                             for p in range(self.cfg.n_periodos)]
+        # Processos usados para resolver a FORWARD e a BACKWARD
+        # em paralelo
+        self.backend = backend
+        self.workers = workers
+        self.pool = None
+        # Na PDDE assíncrona, os processos resolvem forward e backward
+        # de forma independente, compartilhando os cortes
+        self.assincrona = assincrona
+        # Tempo total gasto em cada etapa do método
+        etapas = ["ASSÍNCRONA"] if assincrona else ["FORWARD", "BACKWARD"]
+        self.tempos: Dict[str, float] = {etapa: 0.0
+                                         for etapa in etapas +
+                                         ["SIMULAÇÃO FINAL"]}
+        # Total de cortes gerados na backward, para medir a vazão
+        self.n_cortes_gerados = 0
+        # Checkpoint periódico do estado da solução (opcional)
+        self.checkpoint = checkpoint
+        # Cortes de um estudo anterior, usados como partida (opcional)
+        if cortes_iniciais is not None:
+            self.__carrega_cortes_iniciais(cortes_iniciais)
 
-    def __monta_pl(self,
-                   pente: PenteAfluencias,
-                   dente: int,
-                   periodo: int,
-                   abertura: int = -1) -> op:
-        """
-        Realiza a configuração das variáveis e restrições de um
-        problema de otimização a ser realizado no problema de PDDD.
-        """
-        # ----- Variáveis -----
-        self.vf = variable(len(self.uhes), "Volume final (hm3)")
-        self.vt = variable(len(self.uhes), "Volume turbinado (hm3)")
-        self.vv = variable(len(self.uhes), "Volume vertido (hm3)")
-        self.gt = variable(len(self.utes), "Geração térmica (MWmed)")
-        self.deficit = variable(1, "Déficit (MWmed)")
-        self.alpha = variable(1, "Custo futuro ($)")
-
-        # ----- Função objetivo -----
-        self.func_objetivo: _function = 0
-        for i, ut in enumerate(self.utes):
-            self.func_objetivo += ut.custo * self.gt[i]
-
-        self.func_objetivo += self.cfg.custo_deficit * self.deficit[0]
-
-        for i in range(len(self.uhes)):
-            self.func_objetivo += 0.01 * self.vv[i]
-
-        self.func_objetivo += 1.0 * self.alpha[0]
-
-        # ----- Restrições -----
-        self.cons: List[_function] = []
-        # Balanço hídrico
-        for i, uh in enumerate(self.uhes):
-            if periodo == 0:
-                # O volume inicial é dado no problema
-                vi = float(uh.vol_inicial)
-            else:
-                # O volume inicial é o final do nó anterior
-                vi = float(pente.dentes[dente][periodo - 1]
-                           .volumes_finais[i])
-            # Se está executando a FORWARD, a afluência é a do nó
-            # anterior no mesmo dente. Caso contrário, é da abertura
-            # passada à função de montar o PL.
-            if abertura == -1:
-                afl = float(pente.dentes[dente][periodo]
-                            .afluencias[i])
-            else:
-                afl = float(pente
-                            .afluencias_abertura(periodo, abertura)[i])
-            self.cons.append(self.vf[i] == vi + afl - self.vt[i] - self.vv[i])
-
-        # Atendimento à demanda
-        gerado = 0
-        for i, uh in enumerate(self.uhes):
-            gerado += float(uh.produtividade) * self.vt[i]
-        for i, ut in enumerate(self.utes):
-            gerado += self.gt[i]
-        gerado += self.deficit[0]
-        self.cons.append(gerado == float(self.demandas[periodo].demanda))
-        # Restrições operacionais
-        for i, uh in enumerate(self.uhes):
-            # Volume útil do reservatório
-            self.cons.append(self.vf[i] <= uh.vol_maximo)
-            self.cons.append(self.vf[i] >= uh.vol_minimo)
-            # Engolimento máximo
-            self.cons.append(self.vt[i] <= uh.engolimento)
-            # Factibilidade do problema
-            self.cons.append(self.vt[i] >= 0)
-            self.cons.append(self.vv[i] >= 0)
-        for i, ut in enumerate(self.utes):
-            # Geração mínima e máxima de térmica
-            self.cons.append(self.gt[i] >= 0)
-            self.cons.append(self.gt[i] <= ut.capacidade)
-        # Factibilidade do problema
-        self.cons.append(self.deficit[0] >= 0)
-
-        # Cortes de Benders - exceto se estiver no último período
-        self.cons.append(self.alpha[0] >= 0)
-        if periodo == self.cfg.n_periodos - 1:
+    def __carrega_cortes_iniciais(self, arquivo: ArquivoCortes):
+        """
+        Acrescenta ao conjunto de cada período os cortes de um estudo
+        anterior, repassando-os aos subproblemas.
+        """
+        n_alphas = self.pente.cortes[0].n_alphas
+        nos_por_periodo = [1] * self.cfg.n_periodos
+        if not arquivo.compativel(self.cfg, nos_por_periodo, n_alphas):
             return
-        num_uhes = len(self.uhes)
-        # Adiciona os cortes do próximo nó, no mesmo dente
-        no_futuro = pente.dentes[dente][periodo + 1]
-        for corte in no_futuro.cortes:
-            eq = 0.
-            for i_uhe in range(num_uhes):
-                eq += float(corte.coef_angular[i_uhe]) * self.vf[i_uhe]
-            eq += float(corte.termo_indep)
-            self.cons.append(self.alpha[0] >= eq)
+        cortes = arquivo.le(self.cfg, nos_por_periodo, n_alphas)
+        for p, conjuntos in enumerate(cortes):
+            self.pente.cortes[p].adiciona_conjunto(conjuntos[0])
+            if p > 0:
+                self.__atualiza_cortes_subproblema(
+                    p, 0, np.empty((0, self.cfg.n_uhes)))
+
+    def __volumes_iniciais(self,
+                           pente: PenteAfluencias,
+                           periodo: int) -> np.ndarray:
+        """
+        Retorna os volumes iniciais dos nós de todos os dentes em um
+        período, com dimensões (dentes, UHEs).
+        """
+        if periodo == 0:
+            # O volume inicial é dado no problema
+            vis = np.array([float(uh.vol_inicial) for uh in self.uhes])
+            return np.tile(vis, (len(pente.dentes), 1))
+        # O volume inicial é o final do nó anterior
+        return pente.estado.volumes_finais[:, periodo - 1, :]
 
     def resolve_pdde(self) -> Resultado:
         """
@@ -132,19 +126,53 @@ class PDDE:
         logger.info("# RESOLVENDO PROBLEMA DE PDDE #")
         logger.info("X----X-------------------X-------------------X")
         logger.info("  IT        Z_SUP                 Z_INF       ")
-        it = 0
         self.intervalo_conf: List[Tuple[float, float]] = []
+        it = self.__retoma_checkpoint()
+        try:
+            if self.assincrona:
+                ti = time.time()
+                self.__resolve_assincrona(it)
+                self.__registra_tempo("ASSÍNCRONA", ti)
+                self.__abre_pool()
+            else:
+                self.__abre_pool()
+                self.__resolve_sincrona(it)
+            # Terminando o loop do método, realiza a simulação final e
+            # organiza os cenários de saída
+            logger.info("X----X-------------------X-------------------X")
+            ti = time.time()
+            self.__simulacao_final()
+            self.__registra_tempo("SIMULAÇÃO FINAL", ti)
+        finally:
+            self.__fecha_pool()
+        self.__loga_iteracoes_simplex()
+        self.__loga_tempos()
+        self.__loga_selecao_cortes()
+        logger.info("# FIM DA SOLUÇÃO #")
+        logger.info("----------------------------------------")
+        return Resultado(self.cfg,
+                         self.uhes,
+                         self.utes,
+                         self.estatisticas.cenarios(),
+                         self.z_sup,
+                         self.z_inf,
+                         self.intervalo_conf,
+                         self.__organiza_cortes(),
+                         self.estatisticas)
+
+    def __resolve_sincrona(self, it: int):
+        """
+        Realiza as iterações da PDDE, a partir da iteração fornecida,
+        com a forward de todos os dentes seguida da backward de cada
+        período, até a convergência.
+        """
         while True:
             # Realiza, para cada dente, a parte FORWARD
             if self.cfg.reamostrar and it > 0:
                 self.pente.reamostrar()
-            for p in range(self.cfg.n_periodos):
-                for d, dente in enumerate(self.pente.dentes):
-                    self.__monta_pl(self.pente, d, p)
-                    self.pl = op(self.func_objetivo, self.cons)
-                    self.pl.solve("dense", "glpk")
-                    # Armazena as saídas obtidas no PL no objeto nó
-                    self.__armazena_saidas(self.pente, d, p)
+            ti = time.time()
+            self.__forward(self.pente)
+            self.__registra_tempo("FORWARD", ti, it)
             # Condição de saída por convergência
             if self.__verifica_convergencia(it):
                 break
@@ -154,105 +182,365 @@ class PDDE:
                 logger.warning("   LIMITE DE ITERAÇÕES ATINGIDO!")
                 break
             # Realiza, para cada dente, a parte BACKWARD
+            ti = time.time()
             for p in range(self.cfg.n_periodos - 1, -1, -1):
-                cortes_periodo: List[CorteBenders] = []
-                for d, _ in enumerate(self.pente.dentes):
-                    # A BACKWARD na PDDE, para obter um corte,
-                    # na verdade é constituída de múltiplos problemas
-                    # de despacho e o corte é o médio de todas.
-                    cortes_no: List[CorteBenders] = []
-                    for a in range(self.cfg.aberturas_periodo):
-                        self.__monta_pl(self.pente, d, p, a)
-                        self.pl = op(self.func_objetivo, self.cons)
-                        self.pl.solve("dense", "glpk")
-                        # Armazena as saídas obtidas no nó
-                        self.__armazena_saidas(self.pente, d, p)
-                        # Armazena o corte produzido pelo nó
-                        cortes_no.append(self.__obtem_corte(d, p))
-                    # Cria o corte médio para o nó, referente ao dente
-                    cortes_periodo.append(self.__cria_corte(cortes_no))
-                # Adiciona os cortes do período para os nós do período,
-                # em cada dente
-                for d, dente in enumerate(self.pente.dentes):
-                    for c in cortes_periodo:
-                        self.pente.dentes[d][p].adiciona_corte(c)
-        # Terminando o loop do método, realiza a simulação final e
-        # organiza os cenários de saída
-        logger.info("X----X-------------------X-------------------X")
-        self.__simulacao_final()
-        logger.info("# FIM DA SOLUÇÃO #")
-        logger.info("----------------------------------------")
-        return Resultado(self.cfg,
-                         self.uhes,
-                         self.utes,
-                         self.sim_final.organiza_cenarios(),
-                         self.z_sup,
-                         self.z_inf,
-                         self.intervalo_conf,
-                         self.__organiza_cortes())
+                self.__backward_periodo(p)
+                # Acrescenta os cortes ao subproblema do período
+                # anterior
+                if p > 0:
+                    estados = self.pente.estado.volumes_finais[:, p - 1, :]
+                    self.__atualiza_cortes_subproblema(p, it, estados)
+            self.__registra_tempo("BACKWARD", ti, it - 1)
+            self.__salva_checkpoint(it)
 
-    def __obtem_corte(self, d: int, p: int) -> CorteBenders:
+    def __resolve_assincrona(self, it: int):
         """
-        Obtém o corte de Benders a partir do resultado de um PL
-        backward da PDDE.
+        Realiza a PDDE de forma assíncrona, a partir da iteração
+        fornecida. Cada processo resolve
+        trajetórias sorteadas e publica seus cortes, que aqui são
+        reunidos no conjunto de cada período e repassados aos demais
+        processos. Cada lote com tantas trajetórias quanto o número
+        de dentes do pente conta como uma iteração, para a qual são
+        calculados os limites e verificada a parada.
         """
-        no = self.pente.dentes[d][p]
-        coef_angular: List[float] = []
-        termo_indep = no.custo_total
-        for i, uh in enumerate(self.uhes):
-            coef_angular.append(-no.custo_agua[i])
-            if p == 0:
-                vi = uh.vol_inicial
-            else:
-                ant = self.pente.dentes[d][p - 1]
-                vi = ant.volumes_finais[i]
-            termo_indep -= vi * coef_angular[i]
-        corte = CorteBenders(coef_angular, termo_indep, no.custo_total)
-        return corte
-
-    def __cria_corte(self,
-                     cortes: List[CorteBenders]) -> CorteBenders:
-        """
-        Armazena o corte de Benders médio para um nó.
-        """
-        num_uhes = len(self.uhes)
-        num_cortes = self.cfg.aberturas_periodo
-
-        # Calcula o corte médio, considerando cauda e não-cauda
-        coef_ang_medio = np.zeros((num_uhes,))
-        termo_indep_medio = 0.
-        for i, corte in enumerate(cortes):
-            # Calcula o coeficente angular médio
-            for i_uhe in range(num_uhes):
-                coef_ang_medio[i_uhe] += corte.coef_angular[i_uhe] / num_cortes
-            # Calcula o termo independente médio
-            termo_indep_medio += corte.termo_indep / num_cortes
-
-        # Obtém o número de cortes na cauda
-        num_cauda = int(self.cfg.aberturas_cauda * self.cfg.aberturas_periodo)
-        # Ordena os cortes e extrai os cortes da cauda
-        cortes_ordenados = sorted(cortes, reverse=True)
-        cortes_cauda = cortes_ordenados[:num_cauda]
-        # Calcula o corte médio da cauda
-        coef_ang_cauda = np.zeros((num_uhes,))
-        termo_indep_cauda = 0.
-        for i, corte in enumerate(cortes_cauda):
-            # Calcula o coeficiente angular médio
-            for i_uhe in range(num_uhes):
-                coef_ang_cauda[i_uhe] += corte.coef_angular[i_uhe] / num_cauda
-            # Calcula o termo independente médio
-            termo_indep_cauda += corte.termo_indep / num_cauda
-
-        # Pondera os cortes médios da cauda e não-cauda
-        lmbda = self.cfg.peso_cauda
-        coef_ang_ponderado = list((1 - lmbda) * coef_ang_medio
-                                  + lmbda * coef_ang_cauda)
-        termo_indep_ponderado = ((1 - lmbda) * termo_indep_medio
-                                 + lmbda * termo_indep_cauda)
-        corte_ponderado = CorteBenders(coef_ang_ponderado,
-                                       termo_indep_ponderado,
-                                       0.0)
-        return corte_ponderado
+        n_periodos = self.cfg.n_periodos
+        afls_forward = [[self.pente.afluencias_abertura(p, k)
+                         for k in self.pente.indices_nos_pente[p]]
+                        for p in range(n_periodos)]
+        afls_aberturas = [[self.pente.afluencias_abertura(p, a)
+                           for a in range(self.cfg.aberturas_periodo)]
+                          for p in range(n_periodos)]
+        entradas: List[Queue] = [Queue() for _ in range(self.workers)]
+        saida: Queue = Queue()
+        processos = [Process(target=executa_trabalhador,
+                             args=(w,
+                                   self.cfg,
+                                   self.uhes,
+                                   self.utes,
+                                   self.demandas,
+                                   self.backend,
+                                   afls_forward,
+                                   afls_aberturas,
+                                   entradas[w],
+                                   saida))
+                     for w in range(self.workers)]
+        # Os processos partem dos cortes já existentes, de uma
+        # execução retomada
+        iniciais = [(p - 1,
+                     self.pente.cortes[p].coefs,
+                     self.pente.cortes[p].termos,
+                     self.pente.cortes[p].alphas)
+                    for p in range(1, n_periodos)
+                    if len(self.pente.cortes[p]) > 0]
+        if len(iniciais) > 0:
+            for entrada in entradas:
+                entrada.put(iniciais)
+        for processo in processos:
+            processo.start()
+        lote: List[tuple] = []
+        ativos = self.workers
+        parar = False
+        try:
+            while ativos > 0:
+                mensagem = saida.get()
+                if mensagem[0] == "TRAJETORIA":
+                    # Após a parada, os cortes só são armazenados
+                    self.__publica_cortes(mensagem,
+                                          [] if parar else entradas)
+                    if parar:
+                        continue
+                    lote.append(mensagem[3:])
+                    if len(lote) < len(self.pente.dentes):
+                        continue
+                    parar = self.__avalia_lote(lote, it)
+                    lote = []
+                    it += 1
+                    if parar:
+                        for entrada in entradas:
+                            entrada.put(None)
+                elif mensagem[0] == "FIM":
+                    ativos -= 1
+        except BaseException:
+            for processo in processos:
+                processo.terminate()
+            raise
+        for processo in processos:
+            processo.join()
+
+    def __publica_cortes(self, mensagem: tuple, entradas: List[Queue]):
+        """
+        Armazena os cortes de uma trajetória publicada por um processo
+        no conjunto de cada período e repassa os que são novos aos
+        demais processos, em uma única mensagem.
+        """
+        origem, cortes_trajetoria = mensagem[1:3]
+        novos_trajetoria: List[tuple] = []
+        for p, coefs, termos, fobjs, alphas in cortes_trajetoria:
+            cortes = self.pente.cortes[p]
+            novos = [i for i in range(len(termos))
+                     if cortes.adiciona(coefs[i],
+                                        float(termos[i]),
+                                        float(fobjs[i]),
+                                        int(alphas[i]))]
+            self.n_cortes_gerados += len(termos)
+            if p > 0 and len(novos) > 0:
+                novos_trajetoria.append((p - 1,
+                                         coefs[novos],
+                                         termos[novos],
+                                         alphas[novos]))
+        if len(novos_trajetoria) == 0:
+            return
+        for w, entrada in enumerate(entradas):
+            if w != origem:
+                entrada.put(novos_trajetoria)
+
+    def __avalia_lote(self, lote: List[tuple], it: int) -> bool:
+        """
+        Calcula os limites de um lote de trajetórias da PDDE
+        assíncrona e atualiza os subproblemas locais, que são usados
+        na simulação final. Retorna se a solução deve parar.
+
+        Os limites seguem as definições da PDDE síncrona. O Z_INF é a
+        média do primeiro período dos dentes do pente, resolvido pelo
+        subproblema local com todos os cortes já recebidos. O Z_SUP
+        soma os custos imediatos de cada período nas posições dos
+        dentes, incluindo o pós-estudo.
+        """
+        for p, s in enumerate(self.subproblemas):
+            s.iteracoes += sum([t[2][p] for t in lote])
+            s.n_solucoes += sum([t[3][p] for t in lote])
+        for p in range(1, self.cfg.n_periodos):
+            self.__atualiza_cortes_subproblema(p,
+                                               it + 1,
+                                               np.array([t[1][p]
+                                                         for t in lote]))
+        # Cada afluência do primeiro período é resolvida uma única vez
+        vis = [float(uh.vol_inicial) for uh in self.uhes]
+        afls, contagem = np.unique(self.pente.estado.afluencias[:, 0, :],
+                                   axis=0,
+                                   return_counts=True)
+        subproblema = self.subproblemas[0]
+        z_inf = 0.0
+        for afl, n in zip(afls, contagem):
+            subproblema.atualiza_rhs(vis, afl)
+            subproblema.resolve()
+            z_inf += subproblema.fobj * n / np.sum(contagem)
+        custos = self.pente.custos_imediatos_trajetorias(
+            np.array([t[0] for t in lote]))
+        if self.__avalia_limites(it, z_inf, custos.tolist()):
+            return True
+        # Condição de saída por iterações
+        if it + 1 >= self.cfg.max_iter:
+            logger.warning("   LIMITE DE ITERAÇÕES ATINGIDO!")
+            return True
+        self.__salva_checkpoint(it + 1)
+        return False
+
+    def __salva_checkpoint(self, it: int):
+        """
+        Salva o estado da solução ao fim de uma iteração: os conjuntos
+        de cortes, o histórico dos limites, os índices e as afluências
+        do pente e os contadores dos subproblemas.
+        """
+        if self.checkpoint is None or not self.checkpoint.deve_salvar(it):
+            return
+        dados = {"z_sup": np.array(self.z_sup),
+                 "z_inf": np.array(self.z_inf),
+                 "intervalo_conf": np.array(self.intervalo_conf),
+                 "n_cortes_gerados": np.array(self.n_cortes_gerados),
+                 "iteracoes": np.array([s.iteracoes
+                                        for s in self.subproblemas]),
+                 "n_solucoes": np.array([s.n_solucoes
+                                         for s in self.subproblemas]),
+                 "indices_nos_pente": np.array(self.pente.indices_nos_pente),
+                 "afluencias_dentes": self.pente.estado.afluencias}
+        for p, cortes in enumerate(self.pente.cortes):
+            dados.update(exporta_cortes("cortes_{}".format(p), cortes))
+        self.checkpoint.salva(self.cfg, it, dados)
+
+    def __retoma_checkpoint(self) -> int:
+        """
+        Restaura o estado salvo no último checkpoint, se a retomada
+        foi pedida, retornando a iteração a partir da qual a solução
+        continua. Os cortes dos subproblemas são refeitos a partir dos
+        conjuntos de cortes ou das suas seleções.
+        """
+        if self.checkpoint is None:
+            return 0
+        dados = self.checkpoint.carrega(self.cfg)
+        if dados is None:
+            return 0
+        if not np.array_equal(dados["indices_nos_pente"],
+                              np.array(self.pente.indices_nos_pente)):
+            raise Exception("Pente do checkpoint diferente do estudo")
+        self.z_sup = [float(z) for z in dados["z_sup"]]
+        self.z_inf = [float(z) for z in dados["z_inf"]]
+        self.intervalo_conf = [(float(i), float(s))
+                               for i, s in dados["intervalo_conf"]]
+        self.n_cortes_gerados = int(dados["n_cortes_gerados"])
+        for p, s in enumerate(self.subproblemas):
+            s.iteracoes = int(dados["iteracoes"][p])
+            s.n_solucoes = int(dados["n_solucoes"][p])
+        self.pente.estado.afluencias[:] = dados["afluencias_dentes"]
+        for p, cortes in enumerate(self.pente.cortes):
+            importa_cortes("cortes_{}".format(p), cortes, dados)
+            if p > 0:
+                self.subproblemas[p - 1].define_cortes(
+                    cortes.coefs_selecionados,
+                    cortes.termos_selecionados,
+                    cortes.alphas_selecionados)
+        return int(dados["it"])
+
+    def __abre_pool(self):
+        """
+        Inicia os processos que resolvem a FORWARD e a BACKWARD em
+        paralelo, cada um com seus próprios subproblemas.
+        """
+        if self.workers <= 1:
+            return
+        self.pool = Pool(self.workers,
+                         initializer=inicializa_processo,
+                         initargs=(self.cfg,
+                                   self.uhes,
+                                   self.utes,
+                                   self.demandas,
+                                   self.backend))
+
+    def __fecha_pool(self):
+        if self.pool is None:
+            return
+        self.pool.close()
+        self.pool.join()
+        self.pool = None
+
+    def __blocos(self, n: int) -> List[Tuple[int, int]]:
+        """
+        Divide n elementos em blocos contíguos, um para cada processo.
+        """
+        n_blocos = min([self.workers, n])
+        limites = np.linspace(0, n, n_blocos + 1).astype(int)
+        return [(limites[i], limites[i + 1]) for i in range(n_blocos)]
+
+    def __resolve_trajetorias(self,
+                              afls_dentes: np.ndarray
+                              ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Resolve as trajetórias de todos os dentes, localmente ou
+        dividindo os dentes em blocos contíguos entre os processos.
+        Os resultados são reunidos na ordem dos dentes.
+        """
+        vis_iniciais = [float(uh.vol_inicial) for uh in self.uhes]
+        if self.pool is None:
+            return resolve_trajetorias(self.subproblemas,
+                                       vis_iniciais,
+                                       afls_dentes)
+        cortes = [(s.coefs_cortes,
+                   s.termos_cortes,
+                   s.alphas_cortes,
+                   s.versao_cortes)
+                  for s in self.subproblemas]
+        tarefas = [(vis_iniciais, afls_dentes[i:f], cortes)
+                   for i, f in self.__blocos(len(afls_dentes))]
+        resultados = self.pool.map(resolve_tarefa_forward, tarefas)
+        xs = np.concatenate([r[0] for r in resultados])
+        ys = np.concatenate([r[1] for r in resultados])
+        fobjs = np.concatenate([r[2] for r in resultados])
+        for p, s in enumerate(self.subproblemas):
+            s.n_solucoes += len(afls_dentes)
+            s.iteracoes += sum([r[3][p] for r in resultados])
+        return xs, ys, fobjs
+
+    def __forward(self, pente: PenteAfluencias):
+        """
+        Resolve a trajetória de cada dente do pente, armazenando as
+        saídas obtidas, período a período, nos arrays do pente.
+        """
+        xs, ys, fobjs = self.__resolve_trajetorias(pente.estado.afluencias)
+        for p, subproblema in enumerate(self.subproblemas):
+            pente.estado.armazena((slice(None), p),
+                                  subproblema.saidas(xs[:, p, :],
+                                                     ys[:, p, :],
+                                                     fobjs[:, p]))
+
+    def __resolve_aberturas(self,
+                            p: int,
+                            vis_dentes: np.ndarray,
+                            afls_aberturas: List[List[float]]
+                            ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Resolve as aberturas de todos os dentes em um período,
+        localmente ou dividindo os dentes em blocos contíguos entre
+        os processos. Os resultados são reunidos na ordem dos dentes.
+        """
+        subproblema = self.subproblemas[p]
+        if self.pool is None:
+            return resolve_aberturas(subproblema,
+                                     vis_dentes,
+                                     afls_aberturas)
+        tarefas = [(p,
+                    vis_dentes[i:f],
+                    afls_aberturas,
+                    (subproblema.coefs_cortes,
+                     subproblema.termos_cortes,
+                     subproblema.alphas_cortes,
+                     subproblema.versao_cortes))
+                   for i, f in self.__blocos(len(vis_dentes))]
+        resultados = self.pool.map(resolve_tarefa_backward, tarefas)
+        fobjs = np.concatenate([r[0] for r in resultados])
+        custos_agua = np.concatenate([r[1] for r in resultados])
+        subproblema.n_solucoes += fobjs.size
+        subproblema.iteracoes += sum([r[2] for r in resultados])
+        return fobjs, custos_agua
+
+    def __backward_periodo(self, p: int):
+        """
+        Realiza a BACKWARD de um período, adicionando os cortes de
+        cada dente, na ordem dos dentes, ao conjunto de cortes do
+        período, que é compartilhado pelos nós de todos os dentes.
+        """
+        vis_dentes = self.__volumes_iniciais(self.pente, p)
+        afls_aberturas = [self.pente.afluencias_abertura(p, a)
+                          for a in range(self.cfg.aberturas_periodo)]
+        fobjs, custos_agua = self.__resolve_aberturas(p,
+                                                      vis_dentes,
+                                                      afls_aberturas)
+        cortes = self.pente.cortes[p]
+        for d, vis in enumerate(vis_dentes):
+            # No multicorte, cada abertura tem o seu alpha
+            for corte, alpha in cortes_dente(self.cfg,
+                                             vis,
+                                             fobjs[d, :],
+                                             custos_agua[d, :, :]):
+                cortes.adiciona_corte(corte, alpha)
+                self.n_cortes_gerados += 1
+
+    def __atualiza_cortes_subproblema(self,
+                                      p: int,
+                                      it: int,
+                                      estados: np.ndarray):
+        """
+        Repassa os cortes do período ao subproblema do período anterior.
+        Com a seleção de cortes, somente os cortes que são máximos em
+        algum dos estados visitados no período anterior entram no PL.
+        """
+        cortes = self.pente.cortes[p]
+        subproblema = self.subproblemas[p - 1]
+        if not self.cfg.selecao_cortes:
+            subproblema.sincroniza_cortes(cortes.coefs,
+                                          cortes.termos,
+                                          alphas=cortes.alphas)
+            return
+        # Os cortes são avaliados nos volumes finais do período anterior
+        cortes.adiciona_estados(estados)
+        if cortes.seleciona(self.cfg.max_cortes,
+                            self.cfg.contador_atividade):
+            subproblema.define_cortes(cortes.coefs_selecionados,
+                                      cortes.termos_selecionados,
+                                      cortes.alphas_selecionados)
+        if cortes.selecionados is None:
+            return
+        logger.debug(" IT {:4} - PERÍODO {:3}: {} CORTES, {} SELECIONADOS".
+                     format(it, p + 1, len(cortes), len(cortes.selecionados)))
 
     def __verifica_convergencia(self, it: int) -> bool:
         """
@@ -261,17 +549,22 @@ class PDDE:
         confiança.
         """
         # Calcula o Z_inf
-        z_inf = mean([d[0].custo_total for d in self.pente.dentes])
+        z_inf = mean(self.pente.estado.custo_total[:, 0].tolist())
+        # Obtém o custo imediato total de cada dente
+        custos_dente = self.pente.custos_imediatos_dentes().tolist()
+        return self.__avalia_limites(it, z_inf, custos_dente)
+
+    def __avalia_limites(self,
+                         it: int,
+                         z_inf: float,
+                         custos_dente: List[float]) -> bool:
+        """
+        Armazena os limites de uma iteração, a partir do Z_inf e do
+        custo imediato total de cada trajetória, e verifica se houve
+        a convergência.
+        """
         self.z_inf.append(z_inf)
-        # Obtém os custos imediatos para cada nó de cada dente
-        custos_imediatos: List[List[float]] = []
-        for dente in self.pente.dentes:
-            custos_imediatos_dente = [n.custo_total - n.custo_futuro
-                                      for n in dente]
-            custos_imediatos.append(custos_imediatos_dente)
         # Calcula o Z_sup
-        custos_dente = [sum(custo_dente)
-                        for custo_dente in custos_imediatos]
         z_sup = mean(custos_dente)
         self.z_sup.append(z_sup)
         # Calcula o intervalo de confiança
@@ -297,76 +590,100 @@ class PDDE:
 
         return False
 
-    def __armazena_saidas(self, pente: PenteAfluencias, d: int, p: int):
-        """
-        Processa as saídas do problema e armazena nos nós.
-        """
-        vol_finais: List[float] = []
-        vol_turbinados: List[float] = []
-        vol_vertidos: List[float] = []
-        custo_agua: List[float] = []
-        geracao_termica: List[float] = []
-        for i, uh in enumerate(self.uhes):
-            vol_finais.append(self.vf[i].value()[0])
-            vol_turbinados.append(self.vt[i].value()[0])
-            vol_vertidos.append(self.vv[i].value()[0])
-            custo_agua.append(self.cons[i].multiplier.value[0])
-        for i, ut in enumerate(self.utes):
-            geracao_termica.append(self.gt[i].value()[0])
-        deficit = self.deficit[0].value()[0]
-        c_cmo = len(self.uhes)
-        cmo = abs(self.cons[c_cmo].multiplier.value[0])
-        alpha = self.alpha[0].value()[0]
-        f_obj = self.func_objetivo.value()[0]
-        pente.dentes[d][p].preenche_resultados(vol_finais,
-                                               vol_turbinados,
-                                               vol_vertidos,
-                                               custo_agua,
-                                               geracao_termica,
-                                               deficit,
-                                               cmo,
-                                               f_obj - alpha,
-                                               alpha,
-                                               f_obj)
+    def __loga_iteracoes_simplex(self):
+        """
+        Faz o logging do total de iterações do simplex em todos os
+        subproblemas, quando informado pelo backend.
+        """
+        iteracoes = sum([s.iteracoes for s in self.subproblemas])
+        solucoes = sum([s.n_solucoes for s in self.subproblemas])
+        if iteracoes == 0 or solucoes == 0:
+            return
+        logger.info(" ITERAÇÕES SIMPLEX: {} EM {} PLs ({:.2f} POR PL)".
+                    format(iteracoes, solucoes, iteracoes / solucoes))
+
+    def __registra_tempo(self, etapa: str, ti: float, it: int = -1):
+        """
+        Acumula o tempo gasto em uma etapa, a partir do instante
+        de início fornecido.
+        """
+        dt = time.time() - ti
+        self.tempos[etapa] += dt
+        if it >= 0:
+            logger.debug(" IT {:4} - {}: {:.3f} s".format(it + 1, etapa, dt))
+
+    def __loga_tempos(self):
+        """
+        Faz o logging do tempo total gasto em cada etapa.
+        """
+        for etapa, tempo in self.tempos.items():
+            logger.info(" TEMPO {}: {:.3f} s".format(etapa, tempo))
+        tempo = self.tempo_cortes()
+        if tempo > 0:
+            logger.info(" CORTES GERADOS: {} ({:.2f} CORTES/S)".
+                        format(self.n_cortes_gerados,
+                               self.n_cortes_gerados / tempo))
+
+    def tempo_cortes(self) -> float:
+        """
+        Retorna o tempo gasto nas etapas que geram cortes, ou seja,
+        todas exceto a simulação final.
+        """
+        return sum([t for e, t in self.tempos.items()
+                    if e != "SIMULAÇÃO FINAL"])
+
+    def __loga_selecao_cortes(self):
+        """
+        Faz o logging do número de cortes de cada período e de quantos
+        estão selecionados ao fim da solução.
+        """
+        if not self.cfg.selecao_cortes:
+            return
+        for p, cortes in enumerate(self.pente.cortes[1:], start=1):
+            if cortes.selecionados is None:
+                continue
+            logger.info(" PERÍODO {:3}: {} CORTES, {} SELECIONADOS".
+                        format(p + 1, len(cortes), len(cortes.selecionados)))
 
     def __simulacao_final(self):
         """
+        Realiza a simulação final com os cortes obtidos, resolvendo
+        em lotes as sequências de afluências à medida que são geradas,
+        seja a enumeração completa da árvore ou uma amostra. Somente
+        as estatísticas e parte dos cenários são mantidas.
         """
         logger.info("            # SIMULAÇÂO FINAL #")
         logger.info("X-------------------X-------------------X")
         logger.info("       Z_SUP                Z_INF       ")
-        self.sim_final.monta_simulacao_final(self.pente)
-        # Realiza uma "forward"
-        for p in range(self.cfg.n_periodos):
-            for d, _ in enumerate(self.sim_final.dentes):
-                self.__monta_pl(self.sim_final, d, p)
-                self.pl = op(self.func_objetivo, self.cons)
-                self.pl.solve("dense", "glpk")
-                # Armazena as saídas obtidas no PL no objeto nó
-                self.__armazena_saidas(self.sim_final, d, p)
+        sequencias = self.sim_final.sequencias_simulacao_final(
+            self.cfg.cenarios_sim_final)
+        while True:
+            lote = list(islice(sequencias, CENARIOS_POR_LOTE))
+            if len(lote) == 0:
+                break
+            afls = np.array([self.sim_final.afluencias_sequencia(s)
+                             for s in lote])
+            # Realiza uma "forward"
+            xs, ys, fobjs = self.__resolve_trajetorias(afls)
+            saidas = [s.saidas(xs[:, p, :], ys[:, p, :], fobjs[:, p])
+                      for p, s in enumerate(self.subproblemas)]
+            valores = np.concatenate([np.array(afls),
+                                      np.stack(saidas, axis=1)],
+                                     axis=2)
+            self.estatisticas.adiciona(valores)
 
-        # Calcula o Z_inf
-        z_inf = mean([d[0].custo_total for d in self.sim_final.dentes])
+        z_inf = self.estatisticas.custo_total_medio()
         self.z_inf.append(z_inf)
-        # Obtém os custos imediatos para cada nó de cada dente
-        custos_imediatos: List[List[float]] = []
-        for dente in self.sim_final.dentes:
-            custos_imediatos_dente = [n.custo_total - n.custo_futuro
-                                      for n in dente]
-            custos_imediatos.append(custos_imediatos_dente)
-        # Calcula o Z_sup
-        custos_dente = [sum(custo_dente)
-                        for custo_dente in custos_imediatos]
-        z_sup = mean(custos_dente)
+        z_sup = self.estatisticas.custo_imediato_medio()
         self.z_sup.append(z_sup)
 
         logger.info(" {:19.6f} {:19.6f}".format(z_sup, z_inf))
         logger.info("X-------------------X-------------------X")
+        logger.info(" {} CENÁRIOS SIMULADOS, {} ARMAZENADOS".
+                    format(self.estatisticas.n_cenarios,
+                           len(self.estatisticas.amostra)))
 
-    def __organiza_cortes(self) -> List[List[List[CorteBenders]]]:
+    def __organiza_cortes(self) -> List[List[ConjuntoCortes]]:
         """
         """
-        cortes: List[List[List[CorteBenders]]] = []
-        for p in range(self.cfg.n_periodos):
-            cortes.append([self.pente.dentes[0][p].cortes])
-        return cortes
+        return [[c] for c in self.pente.cortes]
@@ -2,12 +2,13 @@ from utils.leituraentrada import LeituraEntrada
 from modelos.cenario import Cenario
 from modelos.resultado import Resultado
 from modelos.arvoreafluencias import ArvoreAfluencias
+from resolvedores.backend import Backend
+from resolvedores.resolvedor import MatrizCOO
 
 import logging
 import coloredlogs  # type: ignore
+import numpy as np  # type: ignore
 from typing import List
-from cvxopt.modeling import variable, op, solvers, _function  # type: ignore
-solvers.options['glpk'] = {'msg_lev': 'GLP_MSG_OFF'}
 logger = logging.getLogger(__name__)
 
 
@@ -16,7 +17,12 @@ class PLUnico:
     Coletânea de métodos para solução de um estudo de
     planejamento energético através de PL Único.
     """
-    def __init__(self, e: LeituraEntrada, LOG_LEVEL: str):
+    def __init__(self,
+                 e: LeituraEntrada,
+                 LOG_LEVEL: str,
+                 backend: Backend = Backend.GLPK,
+                 formato: str = "sparse"):
+        self.resolvedor = backend.cria_resolvedor(formato)
         self.cfg = e.cfg
         self.uhes = e.uhes
         self.utes = e.utes
@@ -25,130 +31,136 @@ class PLUnico:
         self.arvore = ArvoreAfluencias(e)
         self.arvore.monta_arvore_afluencias()
         self.cenarios: List[Cenario] = []
-        self.pl: op = self.__monta_pl()
+        self.__monta_pl()
 
-    def __monta_pl(self) -> op:
+    def __monta_pl(self):
         """
         Realiza a configuração das variáveis e restrições
-        do PL Único a ser resolvido.
+        do PL Único a ser resolvido, na forma matricial:
+
+        min c'x  s.a.  Gx <= h, Ax = b
+
+        As variáveis são indexadas pelo nó global g, que é a posição
+        do nó na árvore quando os períodos são concatenados.
         """
+        n = len(self.uhes)
+        m = len(self.utes)
+        nos_por_periodo = self.arvore.nos_por_periodo
+        N = sum(nos_por_periodo)
+        self.nos_totais = N
+        # Índice global do primeiro nó de cada período
+        self.offsets = np.cumsum([0] + nos_por_periodo[:-1])
+        # Período, nó anterior e afluências de cada nó global
+        periodos = np.repeat(np.arange(self.cfg.n_periodos),
+                             nos_por_periodo)
+        anteriores = [np.array([-1])]
+        for j in range(1, self.cfg.n_periodos):
+            anteriores.append(self.offsets[j - 1] +
+                              self.arvore.indices_nos_anteriores(j))
+        anterior = np.concatenate(anteriores)
+        afls = np.vstack([self.arvore.afluencias_nos(j)
+                          for j in range(self.cfg.n_periodos)])
+
         # ----- Variáveis -----
-        # Volume final
-        self.vf: List[List[variable]] = []
-        # Volume turbinado
-        self.vt: List[List[variable]] = []
-        # Volume vertido
-        self.vv: List[List[variable]] = []
-        for i, uh in enumerate(self.uhes):
-            self.vf.append([])
-            self.vt.append([])
-            self.vv.append([])
-            for j in range(self.cfg.n_periodos):
-                nos_periodo = self.arvore.nos_por_periodo[j]
-                self.vf[i].append(variable(nos_periodo,
-                                           "Vf {}, per {}"
-                                           .format(uh.nome, j)
-                                           ))
-                self.vt[i].append(variable(nos_periodo,
-                                           "Vt {}, per {}"
-                                           .format(uh.nome, j)
-                                           ))
-                self.vv[i].append(variable(nos_periodo,
-                                           "Vv {}, per {}"
-                                           .format(uh.nome, j)
-                                           ))
+        # Mapeamento [usina, nó global] -> índice da variável
+        self.i_vf = np.arange(n * N).reshape(n, N)
+        self.i_vt = n * N + np.arange(n * N).reshape(n, N)
+        self.i_vv = 2 * n * N + np.arange(n * N).reshape(n, N)
+        self.i_gt = 3 * n * N + np.arange(m * N).reshape(m, N)
+        self.i_def = (3 * n + m) * N + np.arange(N)
+        self.n_variaveis = (3 * n + m + 1) * N
 
-        # Geração térmica
-        self.gt: List[List[variable]] = []
+        # ----- Função objetivo -----
+        # Constante para média entre os nós
+        peso = 1.0 / np.array(nos_por_periodo, dtype=float)[periodos]
+        c = np.zeros((self.n_variaveis,))
         for i, ut in enumerate(self.utes):
-            self.gt.append([])
-            for j in range(self.cfg.n_periodos):
-                nos_periodo = self.arvore.nos_por_periodo[j]
-                self.gt[i].append(variable(nos_periodo,
-                                           "Gt {}, per {}"
-                                           .format(ut.nome, j)
-                                           ))
+            # Custo proveniente das térmicas
+            c[self.i_gt[i]] = peso * ut.custo
+        # Custo pelo déficit
+        c[self.i_def] = peso * self.cfg.custo_deficit
+        # Custo pela energia não turbinada
+        for i in range(n):
+            c[self.i_vv[i]] = peso * 0.01
+        self.c = c
 
-        # Déficit
-        self.deficit: List[variable] = []
-        for j in range(self.cfg.n_periodos):
-            nos_periodo = self.arvore.nos_por_periodo[j]
-            self.deficit.append(variable(nos_periodo,
-                                         "Deficit per {}"
-                                         .format(j)))
+        # ----- Restrições de igualdade -----
+        nos = np.arange(N)
+        tem_anterior = anterior >= 0
+        lin: List[np.ndarray] = []
+        col: List[np.ndarray] = []
+        val: List[np.ndarray] = []
+        b = np.zeros((n * N + N,))
+        # Balanço hídrico: linha i * N + g
+        for i, uh in enumerate(self.uhes):
+            linhas = i * N + nos
+            for indices in [self.i_vf[i], self.i_vt[i], self.i_vv[i]]:
+                lin.append(linhas)
+                col.append(indices)
+                val.append(np.ones((N,)))
+            # Volume final do nó anterior
+            lin.append(linhas[tem_anterior])
+            col.append(self.i_vf[i][anterior[tem_anterior]])
+            val.append(-np.ones((int(np.sum(tem_anterior)),)))
+            b[linhas] = afls[:, i]
+            # O volume inicial é dado no primeiro período
+            b[linhas[~tem_anterior]] += float(uh.vol_inicial)
+        # Atendimento à demanda: linha n * N + g
+        linhas = n * N + nos
+        for i, uh in enumerate(self.uhes):
+            lin.append(linhas)
+            col.append(self.i_vt[i])
+            val.append(np.full((N,), float(uh.produtividade)))
+        for i in range(m):
+            lin.append(linhas)
+            col.append(self.i_gt[i])
+            val.append(np.ones((N,)))
+        lin.append(linhas)
+        col.append(self.i_def)
+        val.append(np.ones((N,)))
+        demandas = np.array([float(d.demanda) for d in self.demandas])
+        b[linhas] = demandas[periodos]
+        self.A = MatrizCOO(np.concatenate(lin),
+                           np.concatenate(col),
+                           np.concatenate(val),
+                           (len(b), self.n_variaveis))
+        self.b = b
 
-        # ----- Função objetivo -----
-        self.func_objetivo: _function = 0
-        for j in range(self.cfg.n_periodos):
-            # Constante para média entre os nós
-            nos_periodo = self.arvore.nos_por_periodo[j]
-            c = 1.0 / nos_periodo
-            for k in range(nos_periodo):
-                # Custo proveniente das térmicas
-                for i, ut in enumerate(self.utes):
-                    self.func_objetivo += c * ut.custo * self.gt[i][j][k]
-                # Custo pelo déficit
-                self.func_objetivo += (c * self.deficit[j][k] *
-                                       self.cfg.custo_deficit)
-                # Custo pela energia não turbinada
-                for i, uh in enumerate(self.uhes):
-                    self.func_objetivo += c * 0.01 * self.vv[i][j][k]
+        # ----- Restrições operacionais (desigualdades) -----
+        lin = []
+        col = []
+        val = []
+        h: List[np.ndarray] = []
 
-        # ----- Restrições -----
-        self.cons = []
-        # Balanço hídrico
-        for i, uh in enumerate(self.uhes):
-            for j in range(self.cfg.n_periodos):
-                for k in range(self.arvore.nos_por_periodo[j]):
-                    if j == 0:
-                        self.cons.append(
-                            self.vf[i][j][k] == float(uh.vol_inicial) +
-                            float(self.arvore.arvore[0][0].afluencias[i]) -
-                            self.vt[i][j][k] -
-                            self.vv[i][j][k]
-                        )
-                    else:
-                        ant = self.arvore.indice_no_anterior(j, k)
-                        no = self.arvore.arvore[j][k]
-                        self.cons.append(
-                            self.vf[i][j][k] == self.vf[i][j - 1][ant] +
-                            float(no.afluencias[i]) -
-                            self.vt[i][j][k] -
-                            self.vv[i][j][k]
-                        )
-        # Atendimento à demanda
-        for j in range(self.cfg.n_periodos):
-            for k in range(self.arvore.nos_por_periodo[j]):
-                gerado = 0
-                for i, uh in enumerate(self.uhes):
-                    gerado += float(uh.produtividade) * self.vt[i][j][k]
-                for i, ut in enumerate(self.utes):
-                    gerado += self.gt[i][j][k]
-                gerado += self.deficit[j][k]
-                self.cons.append(gerado == float(self.demandas[j].demanda))
+        def adiciona_limite(indices: np.ndarray,
+                            coef: float,
+                            limite: float):
+            inicio = sum([len(v) for v in h])
+            lin.append(inicio + np.arange(len(indices)))
+            col.append(indices)
+            val.append(np.full((len(indices),), coef))
+            h.append(np.full((len(indices),), float(limite)))
 
-        # Restrições operacionais
         for i, uh in enumerate(self.uhes):
-            for j in range(self.cfg.n_periodos):
-                # Volume útil do reservatório
-                self.cons.append(self.vf[i][j] <= uh.vol_maximo)
-                self.cons.append(self.vf[i][j] >= uh.vol_minimo)
-                # Engolimento máximo
-                self.cons.append(self.vt[i][j] <= uh.engolimento)
-                # Factibilidade do problema
-                self.cons.append(self.vt[i][j] >= 0)
-                self.cons.append(self.vv[i][j] >= 0)
-        for i, ut in enumerate(self.utes):
-            for j in range(self.cfg.n_periodos):
-                # Geração mínima e máxima da térmica
-                self.cons.append(self.gt[i][j] >= 0)
-                self.cons.append(self.gt[i][j] <= ut.capacidade)
-        for j in range(self.cfg.n_periodos):
+            # Volume útil do reservatório
+            adiciona_limite(self.i_vf[i], 1.0, uh.vol_maximo)
+            adiciona_limite(self.i_vf[i], -1.0, -uh.vol_minimo)
+            # Engolimento máximo
+            adiciona_limite(self.i_vt[i], 1.0, uh.engolimento)
             # Factibilidade do problema
-            self.cons.append(self.deficit[j] >= 0)
-
-        prob = op(self.func_objetivo, self.cons)
-        return prob
+            adiciona_limite(self.i_vt[i], -1.0, 0.0)
+            adiciona_limite(self.i_vv[i], -1.0, 0.0)
+        for i, ut in enumerate(self.utes):
+            # Geração mínima e máxima da térmica
+            adiciona_limite(self.i_gt[i], -1.0, 0.0)
+            adiciona_limite(self.i_gt[i], 1.0, ut.capacidade)
+        # Factibilidade do problema
+        adiciona_limite(self.i_def, -1.0, 0.0)
+        self.h = np.concatenate(h)
+        self.G = MatrizCOO(np.concatenate(lin),
+                           np.concatenate(col),
+                           np.concatenate(val),
+                           (len(self.h), self.n_variaveis))
 
     def resolve_pl(self) -> Resultado:
         """
@@ -156,16 +168,18 @@ class PLUnico:
         """
         logger.info("# RESOLVENDO PROBLEMA DE PL ÚNICO #")
         logger.info("-----------------------------------")
-        n_variaveis = sum([v._size for v in self.pl.variables()])
-        n_variaveis = sum(map(len, self.pl.variables()))
-        n_igual = sum(map(len, self.pl.equalities()))
-        n_desigual = sum(map(len, self.pl.inequalities()))
-        logger.info(" NÚM. VARIÁVEIS: {:6}".format(n_variaveis))
+        n_igual = len(self.b)
+        n_desigual = len(self.h)
+        logger.info(" NÚM. VARIÁVEIS: {:6}".format(self.n_variaveis))
         logger.info(" NÚM. RESTR.  =: {:6}".format(n_igual))
         logger.info(" NÚM. RESTR.  <: {:6}".format(n_desigual))
-        self.pl.solve("dense", "glpk")
-        logger.info("Função objetivo final: {}".
-                    format(self.func_objetivo.value()[0]))
+        self.__loga_memoria()
+        self.resolvedor.monta(self.c, self.G, self.h, self.A, self.b)
+        sol = self.resolvedor.resolve()
+        self.x = sol.x
+        self.y = sol.y
+        self.fobj = sol.fobj
+        logger.info("Função objetivo final: {}".format(self.fobj))
         logger.info("-----------------------------------")
         logger.info("# FIM DA SOLUÇÃO #")
         logger.info("----------------------------------------")
@@ -176,43 +190,60 @@ class PLUnico:
                          self.arvore.organiza_cenarios(),
                          [], [], [], [])
 
+    def __loga_memoria(self):
+        """
+        Faz o logging do número de elementos não-nulos das matrizes de
+        restrições e da memória estimada para armazená-las antes da
+        solução.
+        """
+        nnz = self.G.nnz + self.A.nnz
+        n_linhas = len(self.h) + len(self.b)
+        elementos = n_linhas * self.n_variaveis
+        # Denso: um double por elemento. Esparso (CCS): um double e um
+        # índice de linha por não-nulo, mais um ponteiro por coluna.
+        mem_denso = 8 * elementos
+        mem_esparso = 16 * nnz + 2 * 8 * (self.n_variaveis + 1)
+        mb = 1024 ** 2
+        logger.info(" NÃO-NULOS     : {:6} ({:.4%})".
+                    format(nnz, nnz / max([elementos, 1])))
+        logger.info(" MEM. ESPARSA  : {:12.2f} MB".format(mem_esparso / mb))
+        logger.info(" MEM. DENSA    : {:12.2f} MB".format(mem_denso / mb))
+        logger.info(" FORMATO       : {}".
+                    format(self.resolvedor.formato.upper()))
+
     def armazena_saidas(self):
         """
         Processa as saídas do problema e armazena nos nós.
         """
-        nos_totais = sum(self.arvore.nos_por_periodo)
+        n = len(self.uhes)
+        N = self.nos_totais
+        x = self.x
+        # Extrai todas as variáveis e duais na forma [usina, nó global]
+        vf = x[self.i_vf]
+        vt = x[self.i_vt]
+        vv = x[self.i_vv]
+        gt = x[self.i_gt]
+        deficit = x[self.i_def]
+        custo_agua = self.y[:n * N].reshape(n, N)
+        cmo = np.abs(self.y[n * N:])
+        # Calcula também o custo imediato de cada nó
+        custos_ut = np.array([ut.custo for ut in self.utes], dtype=float)
+        ci = (0.01 * np.sum(vv, axis=0) +
+              np.dot(custos_ut, gt) +
+              self.cfg.custo_deficit * deficit)
+        # Armazena as saídas de todos os nós de cada período, nas
+        # colunas de Subproblema.saidas
         for j in range(self.cfg.n_periodos):
-            for k in range(self.arvore.nos_por_periodo[j]):
-                vol_finais: List[float] = []
-                vol_turbinados: List[float] = []
-                vol_vertidos: List[float] = []
-                custo_agua: List[float] = []
-                geracao_termica: List[float] = []
-                nos_considerados = sum(self.arvore.nos_por_periodo[:j])
-                # Calcula também o custo imediato no nó
-                ci = 0.0
-                for i, uh in enumerate(self.uhes):
-                    c = i * nos_totais + nos_considerados + k
-                    vol_finais.append(self.vf[i][j][k].value()[0])
-                    vol_turbinados.append(self.vt[i][j][k].value()[0])
-                    vol_vertidos.append(self.vv[i][j][k].value()[0])
-                    ci += 0.01 * self.vv[i][j][k].value()[0]
-                    custo_agua.append(self.cons[c].multiplier.value[0])
-                for i, ut in enumerate(self.utes):
-                    geracao_termica.append(self.gt[i][j][k].value()[0])
-                    ci += ut.custo * self.gt[i][j][k].value()[0]
-                deficit = self.deficit[j][k].value()[0]
-                ci += self.cfg.custo_deficit * deficit
-                c_cmo = len(self.uhes) * nos_totais + nos_considerados + k
-                cmo = abs(self.cons[c_cmo].multiplier.value[0])
-                f_obj = float(self.func_objetivo.value()[0])
-                self.arvore.arvore[j][k].preenche_resultados(vol_finais,
-                                                             vol_turbinados,
-                                                             vol_vertidos,
-                                                             custo_agua,
-                                                             geracao_termica,
-                                                             deficit,
-                                                             cmo,
-                                                             ci,
-                                                             0.0,
-                                                             f_obj)
+            n_nos = self.arvore.nos_por_periodo[j]
+            g = self.offsets[j] + np.arange(n_nos)
+            saidas = np.column_stack([vf[:, g].T,
+                                      vt[:, g].T,
+                                      vv[:, g].T,
+                                      custo_agua[:, g].T,
+                                      gt[:, g].T,
+                                      deficit[g],
+                                      cmo[g],
+                                      ci[g],
+                                      np.zeros(n_nos),
+                                      np.full(n_nos, self.fobj)])
+            self.arvore.estado_periodo(j).armazena(slice(None), saidas)
@@ -0,0 +1,54 @@
+from resolvedores.resolvedor import Resolvedor
+
+from enum import Enum
+
+
+class Backend(Enum):
+    """
+    Biblioteca utilizada para resolver os PLs dos métodos de
+    solução. Podem ser:
+
+    GLPK: GLPK através da interface do cvxopt
+
+    HIGHS: HiGHS através do scipy.optimize.linprog
+
+    HIGHSPY: instância persistente do HiGHS através do highspy, com
+    partida quente do simplex entre soluções do mesmo subproblema
+
+    HIGHSPY_FRIO: igual ao HIGHSPY, mas descartando a base a cada
+    solução (usado para medir o ganho da partida quente)
+    """
+    GLPK = "glpk"
+    HIGHS = "highs"
+    HIGHSPY = "highspy"
+    HIGHSPY_FRIO = "highspy-frio"
+
+    @classmethod
+    def obtem_backend_pelo_nome(cls, valor: str):
+        for k in cls:
+            if valor.lower() == k.value:
+                return k
+        # Se não encontrou um dentro dos possíveis
+        raise Exception("Backend de solução inválido: {}".format(valor))
+
+    def cria_resolvedor(self, formato: str = "sparse") -> Resolvedor:
+        """
+        Constroi um resolvedor do backend. As bibliotecas de cada
+        backend só são importadas quando ele é utilizado.
+        """
+        if self == Backend.GLPK:
+            from resolvedores.glpk import ResolvedorGLPK
+            return ResolvedorGLPK(formato)
+        elif self == Backend.HIGHS:
+            from resolvedores.highs import ResolvedorHiGHS
+            return ResolvedorHiGHS(formato)
+        elif self == Backend.HIGHSPY:
+            from resolvedores.highs_persistente import \
+                ResolvedorHiGHSPersistente
+            return ResolvedorHiGHSPersistente(formato, True)
+        elif self == Backend.HIGHSPY_FRIO:
+            from resolvedores.highs_persistente import \
+                ResolvedorHiGHSPersistente
+            return ResolvedorHiGHSPersistente(formato, False)
+        else:
+            raise Exception("Backend de solução inválido")
@@ -0,0 +1,71 @@
+from resolvedores.resolvedor import MatrizCOO, Resolvedor, SolucaoPL
+
+import numpy as np  # type: ignore
+from cvxopt import matrix, spmatrix, sparse, solvers  # type: ignore
+solvers.options['glpk'] = {'msg_lev': 'GLP_MSG_OFF'}
+
+
+class ResolvedorGLPK(Resolvedor):
+    """
+    Backend de solução de PLs através do GLPK, pela interface
+    do cvxopt.
+    """
+    def __init__(self, formato: str = "sparse"):
+        if formato not in ["sparse", "dense"]:
+            raise Exception("Formato de matriz inválido: {}".format(formato))
+        self.formato = formato
+
+    def __converte_matriz(self, M: MatrizCOO):
+        S = spmatrix(M.valores.tolist(),
+                     M.linhas.tolist(),
+                     M.colunas.tolist(),
+                     M.forma)
+        if self.formato == "dense":
+            return matrix(S)
+        return S
+
+    @staticmethod
+    def __converte_vetor(v: np.ndarray):
+        return matrix(np.ascontiguousarray(v, dtype=float))
+
+    def monta(self,
+              c: np.ndarray,
+              G: MatrizCOO,
+              h: np.ndarray,
+              A: MatrizCOO,
+              b: np.ndarray):
+        self.c_np = np.asarray(c, dtype=float)
+        self.c = self.__converte_vetor(c)
+        self.A = self.__converte_matriz(A)
+        self.atualiza_igualdades(b)
+        self.atualiza_desigualdades(G, h)
+
+    def atualiza_igualdades(self, b: np.ndarray):
+        self.b = self.__converte_vetor(b)
+
+    def atualiza_desigualdades(self, G: MatrizCOO, h: np.ndarray):
+        self.G = self.__converte_matriz(G)
+        self.h = self.__converte_vetor(h)
+
+    def adiciona_desigualdades(self, G: MatrizCOO, h: np.ndarray):
+        novas = self.__converte_matriz(G)
+        if self.formato == "dense":
+            self.G = matrix([self.G, novas])
+        else:
+            self.G = sparse([self.G, novas])
+        self.h = matrix([self.h, self.__converte_vetor(h)])
+
+    def resolve(self) -> SolucaoPL:
+        sol = solvers.lp(self.c,
+                         self.G,
+                         self.h,
+                         self.A,
+                         self.b,
+                         solver="glpk")
+        if sol["status"] != "optimal":
+            raise Exception("PL sem solução ótima no GLPK: {}"
+                            .format(sol["status"]))
+        x = np.array(sol["x"]).reshape(-1)
+        y = np.array(sol["y"]).reshape(-1)
+        z = np.array(sol["z"]).reshape(-1)
+        return SolucaoPL(x, y, z, float(np.dot(self.c_np, x)))
@@ -0,0 +1,65 @@
+from resolvedores.resolvedor import MatrizCOO, Resolvedor, SolucaoPL
+
+import numpy as np  # type: ignore
+from scipy.optimize import linprog  # type: ignore
+from scipy.sparse import coo_matrix, vstack  # type: ignore
+
+
+class ResolvedorHiGHS(Resolvedor):
+    """
+    Backend de solução de PLs através do HiGHS, pela interface
+    scipy.optimize.linprog.
+    """
+    def __init__(self, formato: str = "sparse"):
+        # O HiGHS sempre trabalha com matrizes esparsas
+        self.formato = "sparse"
+
+    @staticmethod
+    def __converte_matriz(M: MatrizCOO):
+        return coo_matrix((M.valores, (M.linhas, M.colunas)),
+                          shape=M.forma).tocsr()
+
+    def monta(self,
+              c: np.ndarray,
+              G: MatrizCOO,
+              h: np.ndarray,
+              A: MatrizCOO,
+              b: np.ndarray):
+        self.c = np.asarray(c, dtype=float)
+        self.A = self.__converte_matriz(A)
+        self.atualiza_igualdades(b)
+        self.atualiza_desigualdades(G, h)
+
+    def atualiza_igualdades(self, b: np.ndarray):
+        self.b = np.array(b, dtype=float)
+
+    def atualiza_desigualdades(self, G: MatrizCOO, h: np.ndarray):
+        self.G = self.__converte_matriz(G)
+        self.h = np.array(h, dtype=float)
+
+    def adiciona_desigualdades(self, G: MatrizCOO, h: np.ndarray):
+        self.G = vstack([self.G, self.__converte_matriz(G)]).tocsr()
+        self.h = np.concatenate([self.h, np.asarray(h, dtype=float)])
+
+    def resolve(self) -> SolucaoPL:
+        # Todos os limites das variáveis já estão em G, então as
+        # variáveis são declaradas livres.
+        res = linprog(self.c,
+                      A_ub=self.G,
+                      b_ub=self.h,
+                      A_eq=self.A,
+                      b_eq=self.b,
+                      bounds=(None, None),
+                      method="highs")
+        if res.status != 0:
+            raise Exception("PL sem solução ótima no HiGHS: {}"
+                            .format(res.message))
+        # O scipy fornece a sensibilidade do valor ótimo em relação
+        # ao lado direito, que é o oposto da convenção do cvxopt.
+        y = -np.asarray(res.eqlin.marginals, dtype=float)
+        z = -np.asarray(res.ineqlin.marginals, dtype=float)
+        return SolucaoPL(np.asarray(res.x, dtype=float),
+                         y,
+                         z,
+                         float(res.fun),
+                         int(res.nit))
@@ -0,0 +1,143 @@
+from resolvedores.resolvedor import MatrizCOO, Resolvedor, SolucaoPL
+
+from types import ModuleType
+from typing import Optional
+import numpy as np  # type: ignore
+# O highspy é opcional, e o backend só falha ao ser construído
+highspy: Optional[ModuleType]
+try:
+    import highspy  # type: ignore
+except ImportError:
+    highspy = None
+
+
+class ResolvedorHiGHSPersistente(Resolvedor):
+    """
+    Backend de solução de PLs através de uma instância viva do HiGHS,
+    pela interface highspy. O modelo é mantido entre as soluções, de
+    modo que alterações no lado direito ou nos cortes reaproveitam a
+    base ótima anterior (partida quente do simplex dual).
+
+    As linhas do modelo são as igualdades, seguidas das desigualdades.
+    """
+    def __init__(self,
+                 formato: str = "sparse",
+                 partida_quente: bool = True):
+        if highspy is None:
+            raise Exception("O backend persistente do HiGHS requer o " +
+                            "pacote highspy")
+        self.formato = "sparse"
+        self.partida_quente = partida_quente
+        self.modelo = highspy.Highs()
+        self.modelo.setOptionValue("output_flag", False)
+        self.inf = highspy.kHighsInf
+        self.otimo = highspy.HighsModelStatus.kOptimal
+        self.n_igualdades = 0
+        self.n_desigualdades = 0
+        self.G_atual: Optional[MatrizCOO] = None
+
+    def __adiciona_linhas(self,
+                          M: MatrizCOO,
+                          inferior: np.ndarray,
+                          superior: np.ndarray):
+        inicios, colunas, valores = M.para_csr()
+        self.modelo.addRows(M.forma[0],
+                            np.asarray(inferior, dtype=float),
+                            np.asarray(superior, dtype=float),
+                            M.nnz,
+                            inicios.astype(np.int32),
+                            colunas.astype(np.int32),
+                            valores)
+
+    def monta(self,
+              c: np.ndarray,
+              G: MatrizCOO,
+              h: np.ndarray,
+              A: MatrizCOO,
+              b: np.ndarray):
+        self.modelo.clearModel()
+        n_variaveis = len(c)
+        # Os limites das variáveis já estão em G
+        self.modelo.addVars(n_variaveis,
+                            np.full((n_variaveis,), -self.inf),
+                            np.full((n_variaveis,), self.inf))
+        self.modelo.changeColsCost(n_variaveis,
+                                   np.arange(n_variaveis, dtype=np.int32),
+                                   np.asarray(c, dtype=float))
+        self.n_igualdades = A.forma[0]
+        self.__adiciona_linhas(A, b, b)
+        self.n_desigualdades = 0
+        self.G_atual = None
+        self.adiciona_desigualdades(G, h)
+
+    def atualiza_igualdades(self, b: np.ndarray):
+        b = np.asarray(b, dtype=float)
+        self.modelo.changeRowsBounds(self.n_igualdades,
+                                     np.arange(self.n_igualdades,
+                                               dtype=np.int32),
+                                     b,
+                                     b)
+
+    def atualiza_desigualdades(self, G: MatrizCOO, h: np.ndarray):
+        h = np.asarray(h, dtype=float)
+        inicio = self.n_igualdades
+        atual = self.G_atual
+        if (atual is not None and
+                atual.forma == G.forma and
+                np.array_equal(atual.linhas, G.linhas) and
+                np.array_equal(atual.colunas, G.colunas)):
+            # Com a mesma estrutura, altera somente os coeficientes e
+            # limites, preservando a base atual
+            alterados = np.nonzero(atual.valores != G.valores)[0]
+            for e in alterados:
+                self.modelo.changeCoeff(int(inicio + G.linhas[e]),
+                                        int(G.colunas[e]),
+                                        float(G.valores[e]))
+            linhas = inicio + np.arange(G.forma[0], dtype=np.int32)
+            self.modelo.changeRowsBounds(G.forma[0],
+                                         linhas,
+                                         np.full((G.forma[0],), -self.inf),
+                                         h)
+            self.G_atual = G
+            return
+        # Caso contrário, remove as desigualdades e as adiciona novamente
+        if self.n_desigualdades > 0:
+            linhas = inicio + np.arange(self.n_desigualdades,
+                                        dtype=np.int32)
+            self.modelo.deleteRows(self.n_desigualdades, linhas)
+        self.n_desigualdades = 0
+        self.G_atual = None
+        self.adiciona_desigualdades(G, h)
+
+    def adiciona_desigualdades(self, G: MatrizCOO, h: np.ndarray):
+        self.__adiciona_linhas(G,
+                               np.full((G.forma[0],), -self.inf),
+                               h)
+        if self.G_atual is None:
+            self.G_atual = G
+        else:
+            self.G_atual = MatrizCOO.empilha([self.G_atual, G])
+        self.n_desigualdades += G.forma[0]
+
+    def resolve(self) -> SolucaoPL:
+        if not self.partida_quente:
+            # Descarta a base anterior, forçando uma solução a frio
+            self.modelo.clearSolver()
+        self.modelo.run()
+        status = self.modelo.getModelStatus()
+        if status != self.otimo:
+            raise Exception("PL sem solução ótima no HiGHS: {}".format(
+                self.modelo.modelStatusToString(status)))
+        sol = self.modelo.getSolution()
+        info = self.modelo.getInfo()
+        x = np.array(sol.col_value, dtype=float)
+        duais = np.array(sol.row_dual, dtype=float)
+        # O HiGHS fornece a sensibilidade do valor ótimo em relação
+        # ao lado direito, que é o oposto da convenção do cvxopt.
+        y = -duais[:self.n_igualdades]
+        z = -duais[self.n_igualdades:]
+        return SolucaoPL(x,
+                         y,
+                         z,
+                         float(info.objective_function_value),
+                         int(info.simplex_iteration_count))
@@ -0,0 +1,112 @@
+from typing import List, Tuple
+import numpy as np  # type: ignore
+
+
+class MatrizCOO:
+    """
+    Matriz esparsa no formato de coordenadas (linhas, colunas, valores),
+    independente da biblioteca de otimização que irá consumi-la.
+    """
+    def __init__(self,
+                 linhas: np.ndarray,
+                 colunas: np.ndarray,
+                 valores: np.ndarray,
+                 forma: Tuple[int, int]):
+        self.linhas = np.asarray(linhas, dtype=np.int64)
+        self.colunas = np.asarray(colunas, dtype=np.int64)
+        self.valores = np.asarray(valores, dtype=float)
+        self.forma = forma
+
+    @property
+    def nnz(self) -> int:
+        return len(self.valores)
+
+    def para_csr(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Retorna a matriz no formato de linhas comprimidas (CSR):
+        início de cada linha, colunas e valores.
+        """
+        ordem = np.lexsort((self.colunas, self.linhas))
+        inicios = np.searchsorted(self.linhas[ordem],
+                                  np.arange(self.forma[0]))
+        return inicios, self.colunas[ordem], self.valores[ordem]
+
+    @classmethod
+    def empilha(cls, matrizes: list):
+        """
+        Concatena verticalmente matrizes com o mesmo número de colunas.
+        """
+        mats: List[MatrizCOO] = matrizes
+        n_colunas = mats[0].forma[1]
+        linhas: List[np.ndarray] = []
+        inicio = 0
+        for m in mats:
+            linhas.append(m.linhas + inicio)
+            inicio += m.forma[0]
+        return cls(np.concatenate(linhas),
+                   np.concatenate([m.colunas for m in mats]),
+                   np.concatenate([m.valores for m in mats]),
+                   (inicio, n_colunas))
+
+
+class SolucaoPL:
+    """
+    Resultado da solução de um PL na forma min c'x s.a. Gx <= h, Ax = b.
+    Os multiplicadores seguem a convenção do cvxopt, ou seja, a derivada
+    do valor ótimo em relação a b é -y.
+    """
+    def __init__(self,
+                 x: np.ndarray,
+                 y: np.ndarray,
+                 z: np.ndarray,
+                 fobj: float,
+                 iteracoes: int = -1):
+        self.x = x
+        self.y = y
+        self.z = z
+        self.fobj = fobj
+        self.iteracoes = iteracoes
+
+
+class Resolvedor:
+    """
+    Interface comum para os backends de solução de PLs. Cada instância
+    mantém um único modelo, que é montado uma vez e tem o lado direito
+    das igualdades e as desigualdades alterados entre as soluções.
+    """
+    def monta(self,
+              c: np.ndarray,
+              G: MatrizCOO,
+              h: np.ndarray,
+              A: MatrizCOO,
+              b: np.ndarray):
+        """
+        Monta o modelo min c'x s.a. Gx <= h, Ax = b.
+        """
+        raise NotImplementedError
+
+    def atualiza_igualdades(self, b: np.ndarray):
+        """
+        Substitui o lado direito das restrições de igualdade.
+        """
+        raise NotImplementedError
+
+    def atualiza_desigualdades(self, G: MatrizCOO, h: np.ndarray):
+        """
+        Substitui as restrições de desigualdade do modelo.
+        """
+        raise NotImplementedError
+
+    def adiciona_desigualdades(self, G: MatrizCOO, h: np.ndarray):
+        """
+        Acrescenta novas restrições de desigualdade ao final das
+        existentes no modelo.
+        """
+        raise NotImplementedError
+
+    def resolve(self) -> SolucaoPL:
+        """
+        Resolve o modelo atual, retornando as variáveis primais e os
+        multiplicadores das restrições.
+        """
+        raise NotImplementedError
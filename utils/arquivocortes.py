@@ -0,0 +1,162 @@
+from modelos.configgeral import ConfigGeral
+from modelos.conjuntocortes import ConjuntoCortes
+from modelos.resultado import Resultado
+
+import os
+import logging
+import coloredlogs  # type: ignore
+from typing import Any, Dict, List
+import numpy as np  # type: ignore
+logger = logging.getLogger(__name__)
+
+
+class ArquivoCortes:
+    """
+    Arquivo binário (.npz) com os conjuntos de cortes finais de um
+    estudo de PDDD ou PDDE, que podem ser usados como cortes iniciais
+    de um novo estudo com as mesmas UHEs. Na PDDE há um conjunto por
+    período e na PDDD um conjunto por nó de cada período.
+    """
+    def __init__(self,
+                 caminho: str,
+                 deslocamento: int = 0,
+                 LOG_LEVEL: str = "WARNING"):
+        self.caminho = caminho
+        self.deslocamento = deslocamento
+        coloredlogs.install(logger=logger, level=LOG_LEVEL)
+
+    def escreve(self, resultado: Resultado):
+        """
+        Escreve os conjuntos de cortes de um resultado no arquivo.
+        """
+        diretorio = os.path.dirname(self.caminho)
+        if diretorio != "" and not os.path.exists(diretorio):
+            os.makedirs(diretorio)
+        cfg = resultado.cfg
+        n_alphas = 1
+        if len(resultado.cortes) > 0 and len(resultado.cortes[0]) > 0:
+            n_alphas = resultado.cortes[0][0].n_alphas
+        dados: Dict[str, Any] = {
+            "metodo": np.array(cfg.metodo),
+            "n_uhes": np.array(cfg.n_uhes),
+            "n_alphas": np.array(n_alphas),
+            "nos_por_periodo": np.array([len(c) for c in resultado.cortes])
+            }
+        for p, conjuntos in enumerate(resultado.cortes):
+            for k, conjunto in enumerate(conjuntos):
+                prefixo = "cortes_{}_{}".format(p, k)
+                dados[prefixo + "_coefs"] = conjunto.coefs
+                dados[prefixo + "_termos"] = conjunto.termos
+                dados[prefixo + "_fobjs"] = conjunto.fobjs
+                dados[prefixo + "_alphas"] = conjunto.alphas
+        with open(self.caminho, "wb") as arquivo:
+            np.savez_compressed(arquivo, **dados)
+        n_cortes = sum([len(c) for cs in resultado.cortes for c in cs])
+        logger.info("{} cortes escritos em {}".format(n_cortes,
+                                                      self.caminho))
+
+    def le(self,
+           cfg: ConfigGeral,
+           nos_por_periodo: List[int],
+           n_alphas: int = 1) -> List[List[ConjuntoCortes]]:
+        """
+        Lê os conjuntos de cortes do arquivo para um estudo com a
+        configuração e o número de nós por período fornecidos,
+        validando as dimensões. Com um deslocamento d, o horizonte,
+        de mesmo tamanho, avançou d períodos: o período p do novo
+        estudo recebe os cortes do período p + d do arquivo, e os
+        últimos d períodos ficam sem cortes. O deslocamento só é
+        possível na PDDE, pois na PDDD os nós de um período não têm
+        correspondentes no período anterior.
+        """
+        dados = self.__carrega()
+        erro = self.__valida(dados, cfg, nos_por_periodo, n_alphas)
+        if erro != "":
+            raise Exception(erro)
+        deslocamento = self.deslocamento
+        nos_arquivo = [int(n) for n in dados["nos_por_periodo"]]
+        cortes: List[List[ConjuntoCortes]] = []
+        for p, n_nos in enumerate(nos_por_periodo):
+            cortes.append([ConjuntoCortes(cfg.n_uhes,
+                                          cfg.metodo == "PDDE",
+                                          n_alphas=n_alphas)
+                           for _ in range(n_nos)])
+            # Os últimos períodos do novo horizonte não têm cortes
+            p_arquivo = p + deslocamento
+            if p_arquivo >= len(nos_arquivo):
+                continue
+            for k, conjunto in enumerate(cortes[-1]):
+                prefixo = "cortes_{}_{}".format(p_arquivo, k)
+                coefs = dados[prefixo + "_coefs"]
+                termos = dados[prefixo + "_termos"]
+                fobjs = dados[prefixo + "_fobjs"]
+                alphas = dados[prefixo + "_alphas"]
+                for i in range(len(termos)):
+                    conjunto.adiciona(coefs[i],
+                                      float(termos[i]),
+                                      float(fobjs[i]),
+                                      int(alphas[i]))
+        n_cortes = sum([len(c) for cs in cortes for c in cs])
+        logger.info("{} cortes lidos de {}".format(n_cortes, self.caminho))
+        return cortes
+
+    def compativel(self,
+                   cfg: ConfigGeral,
+                   nos_por_periodo: List[int],
+                   n_alphas: int = 1) -> bool:
+        """
+        Verifica se os cortes do arquivo podem ser usados no estudo,
+        com as mesmas validações de le(). Em um lote com estudos de
+        métodos ou dimensões diferentes, os estudos incompatíveis são
+        resolvidos sem cortes iniciais.
+        """
+        erro = self.__valida(self.__carrega(),
+                             cfg,
+                             nos_por_periodo,
+                             n_alphas)
+        if erro != "":
+            logger.warning("Cortes iniciais ignorados no estudo {}: {}".
+                           format(cfg.nome, erro))
+            return False
+        return True
+
+    def __carrega(self) -> Dict[str, np.ndarray]:
+        with np.load(self.caminho) as arquivo:
+            return {k: arquivo[k] for k in arquivo.files}
+
+    def __valida(self,
+                 dados: Dict[str, np.ndarray],
+                 cfg: ConfigGeral,
+                 nos_por_periodo: List[int],
+                 n_alphas: int) -> str:
+        """
+        Retorna a descrição da primeira incompatibilidade entre os
+        cortes do arquivo e o estudo, ou uma string vazia.
+        """
+        deslocamento = self.deslocamento
+        metodo = str(dados["metodo"])
+        if metodo != cfg.metodo:
+            return ("Cortes de {} não podem ser usados na {}".
+                    format(metodo, cfg.metodo))
+        if int(dados["n_uhes"]) != cfg.n_uhes:
+            return ("Número de UHEs dos cortes ({}) diferente do "
+                    "estudo ({})".format(int(dados["n_uhes"]), cfg.n_uhes))
+        if int(dados["n_alphas"]) != n_alphas:
+            return ("Número de alphas dos cortes ({}) diferente do "
+                    "estudo ({})".format(int(dados["n_alphas"]), n_alphas))
+        nos_arquivo = [int(n) for n in dados["nos_por_periodo"]]
+        if len(nos_arquivo) != len(nos_por_periodo):
+            return ("Número de períodos dos cortes ({}) diferente do "
+                    "estudo ({})".format(len(nos_arquivo),
+                                         len(nos_por_periodo)))
+        if (deslocamento < 0 or deslocamento >= len(nos_arquivo) or
+                (deslocamento > 0 and cfg.metodo != "PDDE")):
+            return "Deslocamento de cortes inválido: {}".format(deslocamento)
+        for p, n_nos in enumerate(nos_por_periodo):
+            p_arquivo = p + deslocamento
+            if (p_arquivo < len(nos_arquivo) and
+                    nos_arquivo[p_arquivo] != n_nos):
+                return ("Número de nós dos cortes ({}) diferente do "
+                        "estudo ({}) no período {}".
+                        format(nos_arquivo[p_arquivo], n_nos, p + 1))
+        return ""
@@ -0,0 +1,242 @@
+from modelos.cenario import Cenario
+from modelos.configgeral import ConfigGeral
+from modelos.conjuntocortes import ConjuntoCortes
+from modelos.estatisticascenarios import EstatisticasCenarios
+from modelos.resultado import Resultado
+from modelos.uhe import UHE
+from modelos.ute import UTE
+
+import os
+import json
+import logging
+import coloredlogs  # type: ignore
+from typing import Any, Dict, List, Tuple
+import numpy as np  # type: ignore
+logger = logging.getLogger(__name__)
+
+# Versão do formato do diretório de resultados
+VERSAO = 1
+MANIFESTO = "manifesto.json"
+
+
+class ArquivoResultado:
+    """
+    Diretório com o resultado de um estudo em arrays binários (.npy),
+    descritos por um manifesto JSON com a configuração, as usinas e
+    a forma e o tipo de cada array. São armazenados os cenários, com
+    dimensões (cenários, períodos, colunas), o cenário médio, os
+    históricos de Z_SUP, Z_INF e do intervalo de confiança, as
+    estatísticas da simulação final da PDDE e os cortes. Os cortes
+    de todos os conjuntos são concatenados, e o conjunto i ocupa as
+    linhas de inicios[i] até inicios[i + 1].
+
+    Os arrays são lidos com np.load(mmap_mode="r"), então somente as
+    partes acessadas são carregadas do disco. O manifesto é escrito
+    por último, e um diretório sem ele é considerado incompleto.
+    """
+    def __init__(self,
+                 diretorio: str,
+                 LOG_LEVEL: str = "WARNING"):
+        self.diretorio = diretorio
+        coloredlogs.install(logger=logger, level=LOG_LEVEL)
+
+    def __caminho(self, nome: str) -> str:
+        return os.path.join(self.diretorio, nome)
+
+    def escreve(self, resultado: Resultado):
+        """
+        Escreve os arrays e o manifesto de um resultado no diretório.
+        """
+        if not os.path.exists(self.diretorio):
+            os.makedirs(self.diretorio)
+        cfg = resultado.cfg
+        n_valores = Cenario.n_valores(cfg.n_uhes, cfg.n_utes)
+        arrays: Dict[str, np.ndarray] = {}
+        if len(resultado.cenarios) > 0:
+            arrays["cenarios"] = Cenario.valores_cenarios(resultado.cenarios)
+        else:
+            arrays["cenarios"] = np.zeros((0, cfg.n_periodos, n_valores))
+        if len(resultado.cenarios) > 0 or resultado.estatisticas is not None:
+            arrays["cenario_medio"] = resultado.cenario_medio().valores
+        arrays["z_sup"] = np.array(resultado.z_sup, dtype=float)
+        arrays["z_inf"] = np.array(resultado.z_inf, dtype=float)
+        arrays["intervalo_confianca"] = np.array(
+            resultado.intervalo_confianca, dtype=float).reshape(-1, 2)
+        manifesto: Dict[str, Any] = {
+            "versao": VERSAO,
+            "cfg": cfg.__dict__,
+            "uhes": [uhe.__dict__ for uhe in resultado.uhes],
+            "utes": [ute.__dict__ for ute in resultado.utes]
+            }
+        # Estatísticas da simulação final
+        if resultado.estatisticas is not None:
+            for k, v in resultado.estatisticas.estado().items():
+                arrays["estatisticas_" + k] = v
+        # Cortes de cada conjunto, concatenados
+        conjuntos = [c for cs in resultado.cortes for c in cs]
+        manifesto["nos_por_periodo"] = [len(cs) for cs in resultado.cortes]
+        manifesto["remove_repetidos"] = cfg.metodo == "PDDE"
+        manifesto["n_alphas"] = 1
+        if len(conjuntos) > 0:
+            manifesto["n_alphas"] = conjuntos[0].n_alphas
+        inicios = np.zeros((len(conjuntos) + 1,), dtype=np.int64)
+        inicios[1:] = np.cumsum([len(c) for c in conjuntos])
+        arrays["cortes_inicios"] = inicios
+        arrays["cortes_coefs"] = np.zeros((0, cfg.n_uhes))
+        arrays["cortes_termos"] = np.zeros((0,))
+        arrays["cortes_fobjs"] = np.zeros((0,))
+        arrays["cortes_alphas"] = np.zeros((0,), dtype=np.int64)
+        arrays["cortes_atividade"] = np.zeros((0,), dtype=np.int64)
+        if len(conjuntos) > 0:
+            arrays["cortes_coefs"] = np.concatenate([c.coefs
+                                                     for c in conjuntos])
+            arrays["cortes_termos"] = np.concatenate([c.termos
+                                                      for c in conjuntos])
+            arrays["cortes_fobjs"] = np.concatenate([c.fobjs
+                                                     for c in conjuntos])
+            arrays["cortes_alphas"] = np.concatenate([c.alphas
+                                                      for c in conjuntos])
+            arrays["cortes_atividade"] = np.concatenate(
+                [c.atividade[:len(c)] for c in conjuntos])
+        # Escreve os arrays e, por último, o manifesto
+        manifesto["arrays"] = {}
+        for nome, array in arrays.items():
+            arquivo = "{}.npy".format(nome)
+            np.save(self.__caminho(arquivo), array, allow_pickle=False)
+            manifesto["arrays"][nome] = {"arquivo": arquivo,
+                                         "forma": list(array.shape),
+                                         "tipo": str(array.dtype)}
+        temporario = self.__caminho(MANIFESTO + ".tmp")
+        with open(temporario, "w") as arq:
+            json.dump(manifesto, arq, indent=2)
+        os.replace(temporario, self.__caminho(MANIFESTO))
+        logger.info("Resultado escrito em {}".format(self.diretorio))
+
+    def le_manifesto(self) -> Dict[str, Any]:
+        """
+        Lê o manifesto do diretório, validando a versão do formato.
+        """
+        caminho = self.__caminho(MANIFESTO)
+        if not os.path.isfile(caminho):
+            raise Exception("Resultado incompleto ou inexistente: {}".
+                            format(self.diretorio))
+        with open(caminho, "r") as arquivo:
+            manifesto: Dict[str, Any] = json.load(arquivo)
+        if manifesto.get("versao") != VERSAO:
+            raise Exception("Versão do resultado não suportada: {}".
+                            format(manifesto.get("versao")))
+        return manifesto
+
+    def array(self, manifesto: Dict[str, Any], nome: str) -> np.ndarray:
+        """
+        Abre um dos arrays do resultado sem carregá-lo na memória.
+        """
+        if nome not in manifesto["arrays"]:
+            raise Exception("Array {} não encontrado em {}".
+                            format(nome, self.diretorio))
+        arquivo = manifesto["arrays"][nome]["arquivo"]
+        return np.load(self.__caminho(arquivo),
+                       mmap_mode="r",
+                       allow_pickle=False)
+
+    def le(self,
+           cortes: bool = True,
+           cenarios: bool = True) -> Resultado:
+        """
+        Reconstroi o resultado armazenado no diretório. Os cenários e
+        as estatísticas são visões dos arrays mapeados em memória. Os
+        cortes são copiados para os conjuntos, então podem ser
+        ignorados quando não forem necessários. Sem os cenários, são
+        lidos somente o cenário médio e os históricos, o suficiente
+        para as comparações entre estudos.
+        """
+        manifesto = self.le_manifesto()
+        cfg = ConfigGeral.default_config()
+        cfg.__dict__.update(manifesto["cfg"])
+        uhes = [UHE(u["id"],
+                    u["nome"],
+                    u["vol_inicial"],
+                    u["vol_minimo"],
+                    u["vol_maximo"],
+                    u["produtividade"],
+                    u["engolimento"]) for u in manifesto["uhes"]]
+        utes = [UTE(u["id"],
+                    u["nome"],
+                    u["capacidade"],
+                    u["custo"]) for u in manifesto["utes"]]
+        valores = self.array(manifesto, "cenarios")
+        # O cenário médio é lido do array próprio, das estatísticas ou,
+        # se nenhum deles foi armazenado, calculado a partir dos cenários
+        cenario_medio = None
+        for nome in ["cenario_medio", "estatisticas_media"]:
+            if cenario_medio is None and nome in manifesto["arrays"]:
+                cenario_medio = Cenario(cfg.n_uhes,
+                                        cfg.n_utes,
+                                        self.array(manifesto, nome))
+        if cenario_medio is None and valores.shape[0] > 0:
+            cenario_medio = Cenario(cfg.n_uhes,
+                                    cfg.n_utes,
+                                    np.mean(valores, axis=0))
+        lista_cenarios: List[Cenario] = []
+        if cenarios:
+            lista_cenarios = [Cenario(cfg.n_uhes, cfg.n_utes, valores[i])
+                              for i in range(valores.shape[0])]
+        z_sup = [float(z) for z in self.array(manifesto, "z_sup")]
+        z_inf = [float(z) for z in self.array(manifesto, "z_inf")]
+        intervalo_conf: List[Tuple[float, float]] = [
+            (float(li), float(ls))
+            for li, ls in self.array(manifesto, "intervalo_confianca")]
+        estatisticas = None
+        if cenarios and "estatisticas_media" in manifesto["arrays"]:
+            estatisticas = EstatisticasCenarios(
+                cfg.n_uhes,
+                cfg.n_utes,
+                cfg.n_periodos,
+                cfg.max_cenarios_armazenados)
+            estatisticas.restaura({k: self.array(manifesto,
+                                                 "estatisticas_" + k)
+                                   for k in ["media", "m2", "n_cenarios"]},
+                                  valores)
+        conjuntos: List[List[ConjuntoCortes]] = []
+        if cortes:
+            conjuntos = self.__le_cortes(manifesto, cfg)
+        logger.info("Resultado lido de {}".format(self.diretorio))
+        return Resultado(cfg,
+                         uhes,
+                         utes,
+                         lista_cenarios,
+                         z_sup,
+                         z_inf,
+                         intervalo_conf,
+                         conjuntos,
+                         estatisticas,
+                         cenario_medio)
+
+    def __le_cortes(self,
+                    manifesto: Dict[str, Any],
+                    cfg: ConfigGeral) -> List[List[ConjuntoCortes]]:
+        """
+        Reconstroi os conjuntos de cortes de cada nó de cada período.
+        """
+        n_alphas = int(manifesto["n_alphas"])
+        inicios = self.array(manifesto, "cortes_inicios")
+        dados = {k: self.array(manifesto, "cortes_" + k)
+                 for k in ["coefs", "termos", "fobjs", "alphas", "atividade"]}
+        cortes: List[List[ConjuntoCortes]] = []
+        i = 0
+        for n_nos in manifesto["nos_por_periodo"]:
+            cortes.append([])
+            for _ in range(n_nos):
+                ini, fim = int(inicios[i]), int(inicios[i + 1])
+                conjunto = ConjuntoCortes(cfg.n_uhes,
+                                          manifesto["remove_repetidos"],
+                                          n_alphas=n_alphas)
+                estado = {k: v[ini:fim] for k, v in dados.items()}
+                estado["estados"] = np.zeros((0, cfg.n_uhes))
+                estado["melhores"] = np.zeros((0, n_alphas), dtype=np.int64)
+                estado["valores"] = np.zeros((0, n_alphas))
+                estado["avaliados"] = np.zeros((2,), dtype=np.int64)
+                conjunto.restaura(estado)
+                cortes[-1].append(conjunto)
+                i += 1
+        return cortes
@@ -0,0 +1,149 @@
+from modelos.configgeral import ConfigGeral
+from modelos.conjuntocortes import ConjuntoCortes
+from modelos.estadonos import EstadoNos
+
+import os
+import random
+import logging
+import coloredlogs  # type: ignore
+from typing import Any, Dict, Optional
+import numpy as np  # type: ignore
+logger = logging.getLogger(__name__)
+
+
+class Checkpoint:
+    """
+    Arquivo binário compacto (.npz) com o estado de uma execução de
+    PDDE ou PDDD, salvo periodicamente ao fim das iterações para que
+    a execução possa ser retomada da última iteração salva. O arquivo
+    é escrito em um temporário e renomeado ao final, para que uma
+    interrupção durante a escrita não corrompa o checkpoint anterior.
+    """
+    def __init__(self,
+                 caminho: str,
+                 intervalo: int = 1,
+                 retomar: bool = False,
+                 LOG_LEVEL: str = "WARNING"):
+        self.caminho = caminho
+        self.intervalo = intervalo
+        self.retomar = retomar
+        coloredlogs.install(logger=logger, level=LOG_LEVEL)
+
+    def deve_salvar(self, it: int) -> bool:
+        """
+        Verifica se o checkpoint deve ser salvo ao fim da iteração.
+        """
+        return it % self.intervalo == 0
+
+    def salva(self,
+              cfg: ConfigGeral,
+              it: int,
+              dados: Dict[str, np.ndarray]):
+        """
+        Salva os arrays fornecidos, junto da identificação do estudo,
+        do número de iterações concluídas e do estado do gerador de
+        números aleatórios.
+        """
+        diretorio = os.path.dirname(self.caminho)
+        if diretorio != "" and not os.path.exists(diretorio):
+            os.makedirs(diretorio)
+        conteudo: Dict[str, Any] = dict(dados)
+        conteudo.update(Checkpoint.__identificacao(cfg))
+        conteudo.update(Checkpoint.__estado_aleatorio())
+        conteudo["it"] = np.array(it)
+        temporario = self.caminho + ".tmp"
+        with open(temporario, "wb") as arquivo:
+            np.savez_compressed(arquivo, **conteudo)
+        os.replace(temporario, self.caminho)
+        logger.debug(" CHECKPOINT SALVO NA IT {}: {}".format(it,
+                                                             self.caminho))
+
+    def carrega(self, cfg: ConfigGeral) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Carrega o último checkpoint, se a retomada foi pedida e o
+        arquivo existe, restaurando o estado do gerador de números
+        aleatórios. O checkpoint deve ser do mesmo estudo.
+        """
+        if not self.retomar:
+            return None
+        if not os.path.isfile(self.caminho):
+            logger.warning("Checkpoint não encontrado: {}. Iniciando do "
+                           "começo.".format(self.caminho))
+            return None
+        with np.load(self.caminho) as arquivo:
+            dados = {k: arquivo[k] for k in arquivo.files}
+        for k, v in Checkpoint.__identificacao(cfg).items():
+            if not np.array_equal(dados[k], v):
+                raise Exception("Checkpoint {} incompatível com o estudo {}:"
+                                " {}".format(self.caminho, cfg.nome, k))
+        Checkpoint.__restaura_aleatorio(dados)
+        logger.info(" RETOMANDO DO CHECKPOINT NA IT {}: {}".
+                    format(int(dados["it"]), self.caminho))
+        return dados
+
+    @staticmethod
+    def __identificacao(cfg: ConfigGeral) -> Dict[str, np.ndarray]:
+        return {"metodo": np.array(cfg.metodo),
+                "dimensoes": np.array([cfg.n_uhes,
+                                       cfg.n_utes,
+                                       cfg.n_periodos,
+                                       cfg.aberturas_periodo,
+                                       cfg.n_cenarios,
+                                       cfg.semente,
+                                       int(cfg.multicorte)])}
+
+    @staticmethod
+    def __estado_aleatorio() -> Dict[str, np.ndarray]:
+        versao, estado, gauss = random.getstate()
+        return {"aleatorio_versao": np.array(versao),
+                "aleatorio_estado": np.array(estado, dtype=np.int64),
+                "aleatorio_gauss": np.array(np.nan if gauss is None
+                                            else gauss)}
+
+    @staticmethod
+    def __restaura_aleatorio(dados: Dict[str, np.ndarray]):
+        gauss = float(dados["aleatorio_gauss"])
+        random.setstate((int(dados["aleatorio_versao"]),
+                         tuple([int(v) for v in dados["aleatorio_estado"]]),
+                         None if np.isnan(gauss) else gauss))
+
+
+def exporta_cortes(prefixo: str,
+                   conjunto: ConjuntoCortes) -> Dict[str, np.ndarray]:
+    """
+    Retorna os arrays de um conjunto de cortes, com as chaves
+    precedidas pelo prefixo fornecido.
+    """
+    return {"{}_{}".format(prefixo, k): v
+            for k, v in conjunto.estado().items()}
+
+
+def importa_cortes(prefixo: str,
+                   conjunto: ConjuntoCortes,
+                   dados: Dict[str, np.ndarray]):
+    """
+    Restaura um conjunto de cortes a partir dos arrays com as chaves
+    precedidas pelo prefixo fornecido.
+    """
+    inicio = prefixo + "_"
+    conjunto.restaura({k[len(inicio):]: v for k, v in dados.items()
+                       if k.startswith(inicio)})
+
+
+def exporta_nos(prefixo: str, estado: EstadoNos) -> Dict[str, np.ndarray]:
+    """
+    Retorna os arrays com as afluências e os resultados armazenados
+    para os nós de uma árvore ou de um pente.
+    """
+    return {"{}_{}".format(prefixo, k): v for k, v in estado.estado().items()}
+
+
+def importa_nos(prefixo: str,
+                estado: EstadoNos,
+                dados: Dict[str, np.ndarray]):
+    """
+    Restaura as afluências e os resultados dos nós a partir dos
+    arrays com as chaves precedidas pelo prefixo fornecido.
+    """
+    estado.restaura({k: dados["{}_{}".format(prefixo, k)]
+                     for k in EstadoNos.CAMPOS})
@@ -4,20 +4,32 @@ from modelos.uhe import UHE
 from modelos.ute import UTE
 
 import os
+import gzip
 import logging
 import coloredlogs  # type: ignore
 from traceback import print_exc
-from typing import List, IO
+from typing import List, IO, Tuple
+import numpy as np  # type: ignore
 logger = logging.getLogger(__name__)
 
+# Número de cenários detalhados formatados de uma vez
+CENARIOS_POR_BLOCO = 256
+
 
 class EscreveSaida:
     """
+    Escreve o relatório de saída de um estudo. Os cenários detalhados
+    são formatados em blocos de cenários e podem ser divididos em
+    vários arquivos, com um número máximo de cenários por arquivo.
+    Os arquivos também podem ser compactados com gzip.
     """
     def __init__(self,
                  resultado: Resultado,
                  caminho: str,
-                 LOG_LEVEL: str):
+                 LOG_LEVEL: str,
+                 compacta: bool = False,
+                 cenarios_por_arquivo: int = 0):
+        self.resultado = resultado
         self.cfg = resultado.cfg
         self.uhes: List[UHE] = resultado.uhes
         self.utes: List[UTE] = resultado.utes
@@ -27,6 +39,8 @@ class EscreveSaida:
         self.z_sup = resultado.z_sup
         self.z_inf = resultado.z_inf
         self.intervalo_conf = resultado.intervalo_confianca
+        self.compacta = compacta
+        self.cenarios_por_arquivo = cenarios_por_arquivo
         coloredlogs.install(logger=logger, level=LOG_LEVEL)
 
     def escreve_relatorio(self):
@@ -37,9 +51,10 @@ class EscreveSaida:
         if not os.path.exists(self.caminho):
             os.makedirs(self.caminho)
         try:
-            with open(self.caminho + "saida.txt", "w") as arquivo:
+            nome_arquivo = self.__nome_arquivo("saida")
+            with self.__abre(nome_arquivo) as arquivo:
                 logger.info("# EXPORTANDO RELATÓRIO DE EXECUÇÃO PARA {} #"
-                            .format(self.caminho + "saida.txt"))
+                            .format(self.caminho + nome_arquivo))
                 logger.info("---------------------------------------")
                 titulo = "RELATÓRIO DE ESTUDO DE PLANEJAMENTO ENERGÉTICO"
                 arquivo.write(titulo + "\n\n")
@@ -57,10 +72,13 @@ class EscreveSaida:
                 # Escreve o relatório detalhado por cenário
                 logger.info("Escrevendo cenários detalhados...")
                 arquivo.write("RELATÓRIO DE CENÁRIOS DETALHADOS\n\n")
-                for i, cen in enumerate(self.cenarios):
-                    str_cen = str(i + 1).rjust(4)
-                    arquivo.write("CENÁRIO " + str_cen + "\n")
-                    self.__escreve_cenario(arquivo, cen)
+                estatisticas = self.resultado.estatisticas
+                if (estatisticas is not None and
+                        estatisticas.n_cenarios > len(self.cenarios)):
+                    arquivo.write("AMOSTRA DE {} DOS {} CENÁRIOS SIMULADOS"
+                                  "\n\n".format(len(self.cenarios),
+                                                estatisticas.n_cenarios))
+                self.__escreve_cenarios_detalhados(arquivo)
                 logger.info("---------------------------------------")
                 logger.info("# FIM DA ESCRITA #")
                 logger.info("-----------------------------------------")
@@ -164,14 +182,29 @@ class EscreveSaida:
         logger.debug("X-------------X-------------------X-------------------X")
         arquivo.write("\n")
 
-    def __escreve_cenario(self, arquivo: IO, cenario: Cenario):
+    def __nome_arquivo(self, nome: str) -> str:
+        if self.compacta:
+            return nome + ".txt.gz"
+        return nome + ".txt"
+
+    def __abre(self, nome_arquivo: str) -> IO:
         """
-        Escreve informações sobre um cenário no relatório de saída.
+        Abre um arquivo de texto do relatório para escrita, compactado
+        ou não.
         """
+        caminho = self.caminho + nome_arquivo
+        if self.compacta:
+            return gzip.open(caminho, "wt")
+        return open(caminho, "w")
+
+    def __campos_cenario(self) -> List[int]:
         # Calcula os campos existentes com base no número de UHE e UTE
-        campos = [13] + [19] * (5 * len(self.uhes) + len(self.utes) + 5)
-        self.__escreve_borda_tabela(arquivo, campos)
-        # Escreve o cabeçalho da tabela
+        return [13] + [19] * (5 * len(self.uhes) + len(self.utes) + 5)
+
+    def __cabecalho_cenario(self) -> str:
+        """
+        Retorna o cabeçalho da tabela de um cenário.
+        """
         cab_tabela = "    PERÍODO    "
         for i in range(len(self.uhes)):
             ind_uhe = str(i + 1).ljust(2)
@@ -188,12 +221,65 @@ class EscreveSaida:
         cab_tabela += "   CUSTO IMEDIATO   "
         cab_tabela += "    CUSTO FUTURO    "
         cab_tabela += "    CUSTO TOTAL     "
-        arquivo.write(cab_tabela + "\n")
-        # Escreve as linhas com dados numéricos
-        linhas_cenario = cenario.linhas_tabela()
-        for linha in linhas_cenario:
-            arquivo.write(linha)
-        self.__escreve_borda_tabela(arquivo, campos)
+        return cab_tabela
+
+    def __particoes(self) -> List[Tuple[int, int]]:
+        """
+        Divide os cenários detalhados entre os arquivos, retornando o
+        primeiro e o último (exclusive) cenário de cada um.
+        """
+        n_cenarios = len(self.cenarios)
+        if self.cenarios_por_arquivo <= 0:
+            return [(0, n_cenarios)]
+        return [(i, min([i + self.cenarios_por_arquivo, n_cenarios]))
+                for i in range(0, n_cenarios, self.cenarios_por_arquivo)]
+
+    def __escreve_cenarios_detalhados(self, arquivo: IO):
+        """
+        Escreve os cenários detalhados no relatório principal ou, se
+        houver um máximo de cenários por arquivo, em arquivos
+        separados, listados no relatório principal.
+        """
+        if self.cenarios_por_arquivo <= 0:
+            self.__escreve_cenarios(arquivo, 0, len(self.cenarios))
+            return
+        particoes = self.__particoes()
+        arquivo.write("CENÁRIOS DETALHADOS EM {} ARQUIVOS:\n".
+                      format(len(particoes)))
+        for n, (inicio, fim) in enumerate(particoes):
+            nome_arquivo = self.__nome_arquivo("cenarios_{:03d}".
+                                               format(n + 1))
+            arquivo.write(" {}: CENÁRIOS {} A {}\n".format(nome_arquivo,
+                                                           inicio + 1,
+                                                           fim))
+            with self.__abre(nome_arquivo) as arquivo_cenarios:
+                arquivo_cenarios.write("RELATÓRIO DE CENÁRIOS DETALHADOS"
+                                       "\n\n")
+                self.__escreve_cenarios(arquivo_cenarios, inicio, fim)
+        arquivo.write("\n")
+
+    def __escreve_cenarios(self, arquivo: IO, inicio: int, fim: int):
+        """
+        Escreve as tabelas de um intervalo de cenários. Cada bloco de
+        cenários é formatado de uma só vez, a partir de um modelo com
+        a tabela de um cenário repetido para todos os cenários do bloco.
+        """
+        n_uhes = len(self.uhes)
+        n_utes = len(self.utes)
+        borda = self.__borda_tabela(self.__campos_cenario())
+        n_periodos = self.cenarios[0].valores.shape[0] if fim > inicio else 0
+        modelo = ("CENÁRIO %4d\n" + borda +
+                  self.__cabecalho_cenario().replace("%", "%%") + "\n" +
+                  Cenario.formato_linha_tabela(n_uhes, n_utes) * n_periodos +
+                  borda)
+        for i in range(inicio, fim, CENARIOS_POR_BLOCO):
+            f = min([i + CENARIOS_POR_BLOCO, fim])
+            valores = Cenario.valores_cenarios(self.cenarios[i:f])
+            tabela = Cenario.tabela_cenarios(n_uhes, n_utes, valores)
+            argumentos = np.column_stack([np.arange(i + 1, f + 1),
+                                          tabela.reshape(f - i, -1)])
+            arquivo.write((modelo * (f - i)) %
+                          tuple(argumentos.ravel().tolist()))
 
     def __escreve_cenario_medio(self, arquivo: IO):
         """
@@ -201,31 +287,15 @@ class EscreveSaida:
         """
         logger.info("Escrevendo cenário médio...")
         arquivo.write("RELATÓRIO DE CENÁRIOS MÉDIOS\n\n")
-        # Calcula os campos existentes com base no número de UHE e UTE
-        campos = [13] + [19] * (5 * len(self.uhes) + len(self.utes) + 5)
+        campos = self.__campos_cenario()
         self.__escreve_borda_tabela(arquivo, campos)
         logger.debug("X-------------X-------------------X-------------------X")
         # Escreve o cabeçalho da tabela
-        cab_tabela = "    PERÍODO    "
-        for i in range(len(self.uhes)):
-            ind_uhe = str(i + 1).ljust(2)
-            cab_tabela += "      AFL({})       ".format(ind_uhe)
-            cab_tabela += "      VF({})        ".format(ind_uhe)
-            cab_tabela += "      VT({})        ".format(ind_uhe)
-            cab_tabela += "      VV({})        ".format(ind_uhe)
-            cab_tabela += "      CMA({})       ".format(ind_uhe)
-        for i in range(len(self.utes)):
-            ind_ute = str(i + 1).ljust(2)
-            cab_tabela += "      GT({})        ".format(ind_ute)
-        cab_tabela += "      DEFICIT       "
-        cab_tabela += "        CMO         "
-        cab_tabela += "   CUSTO IMEDIATO   "
-        cab_tabela += "    CUSTO FUTURO    "
-        cab_tabela += "    CUSTO TOTAL     "
+        cab_tabela = self.__cabecalho_cenario()
         logger.debug("    PERÍODO       CUSTO IMEDIATO       CUSTO FUTURO    ")
         arquivo.write(cab_tabela + "\n")
         # Constroi o cenário médio
-        cenario_medio = Cenario.cenario_medio(self.cenarios)
+        cenario_medio = self.resultado.cenario_medio()
         # Escreve as linhas com dados numéricos
         linhas_cenario = cenario_medio.linhas_tabela()
         for linha in linhas_cenario:
@@ -239,12 +309,19 @@ class EscreveSaida:
         logger.debug("X-------------X-------------------X-------------------X")
         arquivo.write("\n")
 
-    def __escreve_borda_tabela(self, arquivo: IO, campos: List[int]):
+    def __borda_tabela(self, campos: List[int]) -> str:
         """
-        Escreve uma linha que significa borda de tabela no arquivo, com
-        campos cujos números de caracteres são fornecidos.
+        Retorna uma linha que significa borda de tabela, com campos
+        cujos números de caracteres são fornecidos.
         """
         str_linha = "X"
         for c in campos:
             str_linha += "-" * c + "X"
-        arquivo.write(str_linha + "\n")
+        return str_linha + "\n"
+
+    def __escreve_borda_tabela(self, arquivo: IO, campos: List[int]):
+        """
+        Escreve uma linha que significa borda de tabela no arquivo, com
+        campos cujos números de caracteres são fornecidos.
+        """
+        arquivo.write(self.__borda_tabela(campos))
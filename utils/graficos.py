@@ -0,0 +1,192 @@
+import csv
+from multiprocessing import Pool
+from typing import Any, Dict, List, Optional, Union
+import numpy as np  # type: ignore
+
+
+class Serie:
+    """
+    Linha de um gráfico. A cor é a posição no mapa de cores viridis,
+    como em plt.get_cmap('viridis')(cor), ou None para a sequência
+    de cores padrão. Com y bidimensional, cada coluna é uma linha.
+    """
+    def __init__(self,
+                 x: np.ndarray,
+                 y: np.ndarray,
+                 cor: Optional[float] = None,
+                 rotulo: str = "",
+                 **estilo: Any):
+        self.x = x
+        self.y = y
+        self.cor = cor
+        self.rotulo = rotulo
+        self.estilo = estilo
+
+
+class Feixe:
+    """
+    Conjunto de linhas com os mesmos valores de x, desenhado como uma
+    única LineCollection, sem marcadores nem rótulos. Cada linha de ys
+    é uma linha do gráfico, com a cor dada pela respectiva posição em
+    cores no mapa de cores viridis.
+    """
+    def __init__(self,
+                 x: np.ndarray,
+                 ys: np.ndarray,
+                 cores: np.ndarray,
+                 linewidth: float = 1.0,
+                 alpha: float = 1.0):
+        self.x = x
+        self.ys = ys
+        self.cores = cores
+        self.linewidth = linewidth
+        self.alpha = alpha
+
+
+class Area:
+    """
+    Área preenchida entre duas linhas de um gráfico.
+    """
+    def __init__(self,
+                 x: np.ndarray,
+                 inferior: np.ndarray,
+                 superior: np.ndarray,
+                 cor: float,
+                 rotulo: str = "",
+                 alpha: float = 0.2):
+        self.x = x
+        self.inferior = inferior
+        self.superior = superior
+        self.cor = cor
+        self.rotulo = rotulo
+        self.alpha = alpha
+
+
+class Grafico:
+    """
+    Descrição de um gráfico, desenhado de forma independente dos
+    demais, possivelmente em outro processo. Contém somente os dados
+    das linhas, então pode ser enviado a um pool de processos. O
+    gráfico é salvo em caminho + ".png" e, se houver cabeçalho, os
+    dados são exportados em caminho + ".csv".
+    """
+    def __init__(self,
+                 caminho: str,
+                 titulo: str,
+                 rotulo_x: str,
+                 rotulo_y: str,
+                 xticks: Optional[np.ndarray] = None,
+                 legenda: bool = False):
+        self.caminho = caminho
+        self.titulo = titulo
+        self.rotulo_x = rotulo_x
+        self.rotulo_y = rotulo_y
+        self.xticks = xticks
+        self.legenda = legenda
+        self.series: List[Serie] = []
+        self.feixes: List[Feixe] = []
+        self.areas: List[Area] = []
+        self.ylim: Optional[tuple] = None
+        self.cabecalho: List[str] = []
+        self.dados: List[Union[list, np.ndarray]] = []
+
+    def exporta(self,
+                cabecalho: List[str],
+                dados: List[Union[list, np.ndarray]]):
+        """
+        Define os dados exportados em CSV junto da imagem.
+        """
+        self.cabecalho = cabecalho
+        self.dados = dados
+
+
+def exporta_dados(caminho: str,
+                  cabecalhos: List[str],
+                  dados: List[Union[list, np.ndarray]]):
+    """
+    Exporta um conjunto de dados de uma determinada visualização
+    para um formato CSV. Os dados mais curtos são completados com
+    campos vazios.
+    """
+    n_dados = max([len(d) for d in dados])
+    arq = caminho + ".csv"
+    with open(arq, "w", newline="") as arqcsv:
+        escritor = csv.writer(arqcsv,
+                              delimiter=",",
+                              quotechar="|",
+                              quoting=csv.QUOTE_MINIMAL)
+        escritor.writerow(cabecalhos)
+        for i in range(n_dados):
+            a_escrever = []
+            for d in dados:
+                if i < len(d):
+                    a_escrever.append(d[i])
+                else:
+                    a_escrever.append("")
+            escritor.writerow(a_escrever)
+
+
+def desenha_grafico(grafico: Grafico):
+    """
+    Desenha e salva um gráfico com a API orientada a objetos do
+    matplotlib e o backend Agg, sem o estado global do pyplot. O
+    matplotlib só é importado quando algum gráfico é desenhado.
+    """
+    from matplotlib import colormaps  # type: ignore
+    from matplotlib.figure import Figure  # type: ignore
+    from matplotlib.backends.backend_agg import FigureCanvasAgg  # type: ignore
+    from matplotlib.collections import LineCollection  # type: ignore
+    cmap = colormaps["viridis"]
+    fig = Figure(figsize=(12, 6))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    ax.set_title(grafico.titulo)
+    ax.set_xlabel(grafico.rotulo_x)
+    ax.set_ylabel(grafico.rotulo_y)
+    for f in grafico.feixes:
+        segmentos = np.stack([np.broadcast_to(f.x, f.ys.shape), f.ys],
+                             axis=-1)
+        ax.add_collection(LineCollection(list(segmentos),
+                                         colors=cmap(f.cores),
+                                         linewidths=f.linewidth,
+                                         alpha=f.alpha))
+        ax.autoscale_view()
+    for s in grafico.series:
+        estilo: Dict[str, Any] = dict(s.estilo)
+        if s.cor is not None:
+            estilo["color"] = cmap(s.cor)
+        if s.rotulo != "":
+            estilo["label"] = s.rotulo
+        ax.plot(s.x, s.y, **estilo)
+    for a in grafico.areas:
+        ax.fill_between(a.x,
+                        a.inferior,
+                        a.superior,
+                        color=cmap(a.cor),
+                        alpha=a.alpha,
+                        label=a.rotulo)
+    if grafico.legenda:
+        ax.legend()
+    if grafico.xticks is not None:
+        ax.set_xticks(grafico.xticks)
+    if grafico.ylim is not None:
+        ax.set_ylim(*grafico.ylim)
+    fig.savefig(grafico.caminho + ".png")
+    if len(grafico.cabecalho) > 0:
+        exporta_dados(grafico.caminho,
+                      grafico.cabecalho,
+                      grafico.dados)
+
+
+def desenha_graficos(graficos: List[Grafico], workers: int = 1):
+    """
+    Desenha uma lista de gráficos, em um pool de processos quando
+    workers é maior que 1. Cada gráfico é uma tarefa independente.
+    """
+    if workers <= 1 or len(graficos) <= 1:
+        for grafico in graficos:
+            desenha_grafico(grafico)
+        return
+    with Pool(min([workers, len(graficos)])) as pool:
+        for _ in pool.imap_unordered(desenha_grafico, graficos):
+            pass
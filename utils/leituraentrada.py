@@ -3,10 +3,10 @@ from modelos.demanda import Demanda
 from modelos.uhe import UHE
 from modelos.ute import UTE
 
-from typing import IO, List, Dict
-from traceback import print_exc
+from typing import Any, Callable, Dict, List, Tuple
 import logging
 import coloredlogs  # type: ignore
+import numpy as np  # type: ignore
 logger = logging.getLogger(__name__)
 
 
@@ -14,6 +14,13 @@ class LeituraEntrada:
     """
     Conjunto de utilidades para leitura dos dados de entrada a serem
     utilizados na execução de um estudo de PL único.
+
+    O arquivo é lido de uma só vez e as linhas de início de cada
+    seção são indexadas em uma única varredura. As colunas de cada
+    tabela são delimitadas pelos "X" da linha separadora que segue o
+    título da seção, e os valores numéricos são convertidos em bloco
+    para arrays. O número de afluências por período é o número de
+    colunas da tabela de afluências, após a UHE e o período.
     """
     inicio_cfg_gerais = "CONFIGURAÇÕES GERAIS DE EXECUÇÃO"
     inicio_demanda = "VALORES DE DEMANDA ESPERADAS NOS PERÍODOS"
@@ -21,7 +28,19 @@ class LeituraEntrada:
     inicio_ute = "PARÂMETROS DAS USINAS TERMELÉTRICAS"
     inicio_afluencias = "CENÁRIOS DE AFLUÊNCIAS POR HIDRELÉTRICA"
     fim_tabela = "X---"
+    cfg_selecao_cortes = "SELEÇÃO DE CORTES"
+    cfg_max_cortes = "MÁX. CORTES SELECIONADOS"
+    cfg_contador_atividade = "CONTADOR DE ATIVIDADE"
+    cfg_multicorte = "MULTICORTE"
+    cfg_cenarios_sim_final = "CENÁRIOS SIMULAÇÃO FINAL"
+    cfg_max_cenarios = "MÁX. CENÁRIOS ARMAZENADOS"
+    # Valor padrão, substituído pelo número de colunas da tabela
+    # de afluências ao ler o arquivo
     afluencias_por_periodo = 5
+    # Tipos das configurações gerais obrigatórias, na ordem do arquivo
+    tipos_cfgs_gerais: List[Callable[[str], Any]] = [
+        str, str, int, int, int, int, int, float,
+        float, float, int, int, int, float, int, int]
 
     def __init__(self,
                  caminho: str,
@@ -39,9 +58,12 @@ class LeituraEntrada:
         # As listas são uma para cada período, sendo que
         # cada elemento é uma afluências possível
         self.afluencias: Dict[int, List[List[float]]] = {}
-        # Atributos auxiliares para leitura
-        self.usa_backup = False
-        self.backup_linha = ""
+        # As mesmas afluências, com dimensões [UHE, período, afluência],
+        # na ordem em que as UHEs aparecem no arquivo
+        self.tabela_afluencias = np.zeros((0, 0, 0))
+        self.afluencias_por_periodo = LeituraEntrada.afluencias_por_periodo
+        # Linhas do arquivo, mantidas para as mensagens de erro
+        self.linhas: List[str] = []
 
     def le_arquivo(self):
         """
@@ -53,312 +75,437 @@ class LeituraEntrada:
         logger.info("---------------------------------------")
         try:
             with open(self.caminho, "r") as arquivo:
-                # Lê as configurações gerais
-                self.cfg = self.__le_configs_gerais(arquivo)
-                # Lê as demandas esperadas
-                self.demandas = self.__le_demandas(arquivo)
-                # Lê os parâmetros das hidrelétricas
-                self.uhes = self.__le_parametros_hidreletricas(arquivo)
-                # Lê os parâmetros das termelétricas
-                self.utes = self.__le_parametros_termeletricas(arquivo)
-                # Lê os cenários de afluências por período
-                self.afluencias = self.__le_afluencias(arquivo)
+                self.linhas = arquivo.read().splitlines()
+            secoes = self.__indexa_secoes()
+            # Lê as configurações gerais
+            self.cfg = self.__le_configs_gerais(
+                secoes[LeituraEntrada.inicio_cfg_gerais])
+            # Lê as demandas esperadas
+            self.demandas = self.__le_demandas(
+                secoes[LeituraEntrada.inicio_demanda])
+            # Lê os parâmetros das hidrelétricas
+            self.uhes = self.__le_parametros_hidreletricas(
+                secoes[LeituraEntrada.inicio_uhe])
+            # Lê os parâmetros das termelétricas
+            self.utes = self.__le_parametros_termeletricas(
+                secoes[LeituraEntrada.inicio_ute])
+            # Lê os cenários de afluências por período
+            self.afluencias = self.__le_afluencias(
+                secoes[LeituraEntrada.inicio_afluencias])
             logger.info("---------------------------------------")
             logger.info("# FIM DA LEITURA #")
             logger.info("----------------------------------------")
         except Exception as e:
             logger.error("Erro na leitura do arquivo: {}".format(e))
-            print_exc()
+            raise
+
+    def __erro(self, i: int, mensagem: str) -> Exception:
+        """
+        Constroi uma exceção que identifica o arquivo, o número e o
+        conteúdo da linha de índice i.
+        """
+        conteudo = self.linhas[i] if i < len(self.linhas) else ""
+        return Exception("{}, linha {}: {}\n{}".format(self.caminho,
+                                                       i + 1,
+                                                       mensagem,
+                                                       conteudo))
 
-    def __le_configs_gerais(self, arquivo: IO) -> ConfigGeral:
+    def __converte(self,
+                   i: int,
+                   campo: str,
+                   tipo: Callable[[str], Any]) -> Any:
         """
-        Varre as linhas do arquivo de entrada, construindo o
-        objeto de configurações gerais.
+        Converte um campo da linha de índice i para o tipo fornecido.
         """
-        iniciou = False
-        linha = ""
-        while True:
-            # Procura pelo início da tabela de configurações gerais
-            if not iniciou:
-                linha = self.__le_linha_com_backup(arquivo)
-                iniciou = self.__inicio_configs_gerais(linha)
-                continue
-            # Quando achar, pula uma linha
-            self.__le_linha_com_backup(arquivo)
-            # Lê o arquivo linha a linha
-            ci = 29
-            cf = 44
-            logger.info("Lendo Configurações Gerais....")
-            logger.debug("X---------------------------X--------------X")
-            nome = self.__le_linha_com_backup(arquivo)[ci:cf].strip()
-            metodo = self.__le_linha_com_backup(arquivo)[ci:cf].strip()
-            min_iters = int(self.__le_linha_com_backup(arquivo)[ci:cf])
-            max_iters = int(self.__le_linha_com_backup(arquivo)[ci:cf])
-            n_estagios = int(self.__le_linha_com_backup(arquivo)[ci:cf])
-            n_aberturas = int(self.__le_linha_com_backup(arquivo)[ci:cf])
-            n_cenarios = int(self.__le_linha_com_backup(arquivo)[ci:cf])
-            aberturas_cauda = float(self.__le_linha_com_backup(arquivo)[ci:cf])
-            peso_cauda = float(self.__le_linha_com_backup(arquivo)[ci:cf])
-            intervalo_conf = float(self.__le_linha_com_backup(arquivo)[ci:cf])
-            semente = int(self.__le_linha_com_backup(arquivo)[ci:cf])
-            reamostrar = bool(int(self.__le_linha_com_backup(arquivo)[ci:cf]))
-            n_pos_est = int(self.__le_linha_com_backup(arquivo)[ci:cf])
-            custo_def = float(self.__le_linha_com_backup(arquivo)[ci:cf])
-            n_uhe = int(self.__le_linha_com_backup(arquivo)[ci:cf])
-            n_ute = int(self.__le_linha_com_backup(arquivo)[ci:cf])
-            # Realiza o logging dos atributos lidos
-            logger.debug(" NOME DO ESTUDO".ljust(27) + nome.rjust(15))
-            logger.debug(" MÉTODO DE SOLUÇÃO".ljust(27) + metodo.rjust(15))
-            if metodo != "PL_UNICO":
-                logger.debug(" MIN. ITERAÇÕES".ljust(27) +
-                             str(min_iters).rjust(15))
-                logger.debug(" MAX. ITERAÇÕES".ljust(27) +
-                             str(max_iters).rjust(15))
-            logger.debug(" NÚMERO DE PERÍODOS".ljust(27) +
-                         str(n_estagios).rjust(15))
-            logger.debug(" ABERTURAS POR PERÍODO".ljust(27)
-                         + str(n_aberturas).rjust(15))
-            if metodo == "PDDE":
-                logger.debug(" NÚMERO DE CENARIOS FWD".ljust(27) +
-                             str(n_cenarios).rjust(15))
-                if aberturas_cauda > 0 or peso_cauda > 0:
-                    logger.debug(" --- AVERSÃO A RISCO >> HABILITADA << ---")
-                    logger.debug("ALFA = {:4.2f}    LAMBDA = {:4.2f}".
-                                 format(aberturas_cauda, peso_cauda))
-                if reamostrar:
-                    logger.debug("  --- REAMOSTRAGEM >> HABILITADA << ---")
-            logger.debug(" NÚMERO DE HIDRELÉTRICAS".ljust(27) +
-                         str(n_uhe).rjust(15))
-            logger.debug(" NÚMERO DE TERMELÉTRICAS".ljust(27) +
-                         str(n_ute).rjust(15))
-            logger.debug("X---------------------------X--------------X")
-            # Constroi o objeto de configurações gerais
-            cfg = ConfigGeral(nome,
-                              metodo,
-                              min_iters,
-                              max_iters,
-                              n_estagios,
-                              n_aberturas,
-                              n_cenarios,
-                              aberturas_cauda,
-                              peso_cauda,
-                              intervalo_conf,
-                              semente,
-                              reamostrar,
-                              n_pos_est,
-                              custo_def,
-                              n_uhe,
-                              n_ute)
-            return cfg
+        try:
+            return tipo(campo.strip())
+        except ValueError:
+            raise self.__erro(i, "valor inválido: '{}'".
+                              format(campo.strip()))
 
-    def __le_demandas(self, arquivo: IO) -> List[Demanda]:
+    def __indexa_secoes(self) -> Dict[str, int]:
         """
-        Varre as linhas do arquivo de entrada, construindo a lista
-        de demandas existentes em cada período de estudo.
+        Varre o arquivo uma única vez, encontrando a linha de início
+        de cada seção.
         """
-        iniciou = False
-        linha = ""
-        while True:
-            # Procura pelo início da tabela de demandas
-            if not iniciou:
-                linha = self.__le_linha_com_backup(arquivo)
-                iniciou = self.__inicio_demandas(linha)
-                continue
-            # Quando achar, pula duas linhas
-            self.__le_linha_com_backup(arquivo)
-            self.__le_linha_com_backup(arquivo)
-            # Lê o arquivo linha a linha
-            logger.info("Lendo Demandas....")
-            logger.debug("X-------------X-------------------X")
-            demandas: List[Demanda] = []
-            for i in range(self.cfg.n_periodos):
-                linha = self.__le_linha_com_backup(arquivo)
-                d = Demanda.obtem_demanda_de_linha(linha)
-                logger.debug(str(d.periodo).rjust(13)
-                             + "  " + str(d.demanda).rjust(19))
-                demandas.append(d)
-            logger.debug("X-------------X-------------------X")
-            return demandas
+        inicios = [LeituraEntrada.inicio_cfg_gerais,
+                   LeituraEntrada.inicio_demanda,
+                   LeituraEntrada.inicio_uhe,
+                   LeituraEntrada.inicio_ute,
+                   LeituraEntrada.inicio_afluencias]
+        secoes: Dict[str, int] = {}
+        for i, linha in enumerate(self.linhas):
+            for inicio in inicios:
+                if inicio not in secoes and inicio in linha:
+                    secoes[inicio] = i
+        faltantes = [s for s in inicios if s not in secoes]
+        if len(faltantes) > 0:
+            raise Exception("{}: seções não encontradas: {}".
+                            format(self.caminho, ", ".join(faltantes)))
+        return secoes
 
-    def __le_parametros_hidreletricas(self, arquivo: IO) -> List[UHE]:
+    def __fim_tabela(self, i: int) -> bool:
         """
-        Varre as linhas do arquivo de entrada, construindo os objetos
-        das usinas hidrelétricas existentes no sistema.
+        Verifica se a linha de índice i encerra uma tabela, seja pela
+        linha separadora, por uma linha vazia ou pelo fim do arquivo.
         """
-        iniciou = False
-        linha = ""
-        while True:
-            # Procura pelo início da tabela de UHEs
-            if not iniciou:
-                linha = self.__le_linha_com_backup(arquivo)
-                iniciou = self.__inicio_hidreletricas(linha)
-                continue
-            # Quando achar, pula duas linhas
-            self.__le_linha_com_backup(arquivo)
-            self.__le_linha_com_backup(arquivo)
-            # Lê o arquivo linha a linha
-            logger.info("Lendo Parâmetros das UHEs....")
-            uhes: List[UHE] = []
-            for i in range(self.cfg.n_uhes):
-                linha = self.__le_linha_com_backup(arquivo)
-                uhe = UHE.le_uhe_da_linha(linha)
-                logger.debug("                 UHE {}".format(uhe.id))
-                logger.debug("X-------------------X-----------------X")
-                logger.debug(" NOME              "
-                             + str(uhe.nome).rjust(19))
-                logger.debug(" VOL. INICIAL (hm3)"
-                             + str(uhe.vol_inicial).rjust(19))
-                logger.debug(" VOL. MÍNIMO (hm3) "
-                             + str(uhe.vol_minimo).rjust(19))
-                logger.debug(" VOL. MÁXIMO (hm3) "
-                             + str(uhe.vol_maximo).rjust(19))
-                logger.debug(" PROD. (MWmed/hm3) "
-                             + str(uhe.produtividade).rjust(19))
-                logger.debug(" ENGOL. MÁXIMO (hm3)"
-                             + str(uhe.engolimento).rjust(18))
-                logger.debug("X-------------------X-----------------X")
-                uhes.append(uhe)
-            return uhes
+        if i >= len(self.linhas):
+            return True
+        linha = self.linhas[i]
+        return LeituraEntrada.fim_tabela in linha or len(linha.strip()) == 0
 
-    def __le_parametros_termeletricas(self, arquivo: IO):
+    def __tabela(self,
+                 inicio: int,
+                 n_titulos: int
+                 ) -> Tuple[List[Tuple[int, int]], List[int]]:
         """
-        Varre as linhas do arquivo de entrada, construindo os objetos
-        das usinas termelétricas existentes no sistema.
+        Retorna as colunas de uma tabela, delimitadas pelos "X" da
+        linha separadora após o título da seção, e os índices das
+        linhas de dados, que seguem as linhas de títulos das colunas
+        até o fim da tabela.
         """
-        iniciou = False
-        linha = ""
-        while True:
-            # Procura pelo início da tabela de UTEs
-            if not iniciou:
-                linha = self.__le_linha_com_backup(arquivo)
-                iniciou = self.__inicio_termeletricas(linha)
-                continue
-            # Quando achar, pula duas linhas
-            self.__le_linha_com_backup(arquivo)
-            self.__le_linha_com_backup(arquivo)
-            # Lê o arquivo linha a linha
-            logger.info("Lendo Parâmetros das UTEs....")
-            utes: List[UTE] = []
-            for i in range(self.cfg.n_utes):
-                linha = self.__le_linha_com_backup(arquivo)
-                ute = UTE.le_ute_da_linha(linha)
-                logger.debug("                 UTE {}".format(ute.id))
-                logger.debug("X-------------------X-----------------X")
-                logger.debug(" NOME              "
-                             + str(ute.nome).rjust(19))
-                logger.debug(" CAPACIDADE (MWmed)"
-                             + str(ute.capacidade).rjust(19))
-                logger.debug(" CUSTO ($/MWmed)   "
-                             + str(ute.custo).rjust(19))
-                logger.debug("X-------------------X-----------------X")
-                utes.append(ute)
-            return utes
+        i_sep = inicio + 1
+        if (i_sep >= len(self.linhas) or
+                LeituraEntrada.fim_tabela not in self.linhas[i_sep]):
+            raise self.__erro(min([i_sep, len(self.linhas) - 1]),
+                              "linha separadora da tabela não encontrada")
+        separador = self.linhas[i_sep].rstrip()
+        xs = [k for k, c in enumerate(separador) if c == "X"]
+        colunas = [(xs[k] + 1, xs[k + 1]) for k in range(len(xs) - 1)]
+        linhas: List[int] = []
+        i = i_sep + n_titulos + 1
+        while not self.__fim_tabela(i):
+            linhas.append(i)
+            i += 1
+        return colunas, linhas
 
-    def __le_afluencias(self, arquivo: IO) -> Dict[int, List[List[float]]]:
+    def __numeros(self,
+                  linhas: List[int],
+                  colunas: List[Tuple[int, int]]) -> np.ndarray:
         """
-        Varre as linhas do arquivo de entrada, construindo os objetos
-        das usinas hidrelétricas existentes no sistema.
+        Converte as colunas fornecidas das linhas de uma tabela em um
+        array com dimensões [linha, coluna], em uma única conversão.
+        Em caso de erro, localiza a linha com o valor inválido.
         """
-        iniciou = False
-        linha = ""
-        while True:
-            # Procura pelo início da tabela de afluências
-            if not iniciou:
-                linha = self.__le_linha_com_backup(arquivo)
-                iniciou = self.__inicio_afluencias(linha)
-                continue
-            # Quando achar, pula três linhas
-            self.__le_linha_com_backup(arquivo)
-            self.__le_linha_com_backup(arquivo)
-            self.__le_linha_com_backup(arquivo)
-            # Lê o arquivo linha a linha
-            logger.info("Lendo Afluências....")
-            afluencias: Dict[int, List[List[float]]] = {}
-            for i in range(self.cfg.n_uhes):
-                # Procura pelo começo das afluências da UHE
-                while True:
-                    linha = self.__le_linha_com_backup(arquivo)
-                    if linha[1:7] != "      ":
-                        self.usa_backup = True
-                        self.backup_linha = linha
-                        break
-                # Identifica a UHE
-                linha = self.__le_linha_com_backup(arquivo)
-                self.usa_backup = True
-                self.backup_linha = linha
-                uhe_id = int(linha[1:7])
-                # Para cada UHE, são esperadas tantas linhas
-                # quanto períodos
-                afluencias_uhe: Dict[int, List[float]] = {}
-                for j in range(self.cfg.n_periodos):
-                    # Lê na forma de dicionário, depois transforma em
-                    # lista, ordenando adequadamente
-                    linha = self.__le_linha_com_backup(arquivo)
-                    periodo = int(linha[8:21])
-                    afluencias_uhe[periodo] = []
-                    ini_afl = 22
-                    len_afl = 19
-                    for k in range(LeituraEntrada.afluencias_por_periodo):
-                        fim_afl = ini_afl + len_afl
-                        afl = float(linha[ini_afl:fim_afl])
-                        afluencias_uhe[periodo].append(afl)
-                        ini_afl = fim_afl + 1
-                # Converte o dicionário para lista, ordenando pela chave
-                chaves_ordenadas = sorted(afluencias_uhe.keys())
-                afluencias[uhe_id] = [afluencias_uhe[c]
-                                      for c in chaves_ordenadas]
-            return afluencias
+        campos = [self.linhas[i][ini:fim].strip()
+                  for i in linhas for ini, fim in colunas]
+        try:
+            valores = np.array(campos, dtype=float)
+        except ValueError:
+            for i in linhas:
+                for ini, fim in colunas:
+                    self.__converte(i, self.linhas[i][ini:fim], float)
+            raise
+        return valores.reshape(len(linhas), len(colunas))
 
-    def __inicio_configs_gerais(self, linha: str) -> bool:
+    def __verifica_colunas(self,
+                           inicio: int,
+                           colunas: List[Tuple[int, int]],
+                           n_colunas: int):
         """
-        Verifica se uma linha contém o texto que indica a parte de
-        configurações gerais no arquivo de entrada.
+        Verifica se a tabela tem ao menos o número de colunas esperado.
         """
-        return LeituraEntrada.inicio_cfg_gerais in linha
+        if len(colunas) < n_colunas:
+            raise self.__erro(inicio + 1,
+                              "esperadas {} colunas, encontradas {}".
+                              format(n_colunas, len(colunas)))
 
-    def __inicio_demandas(self, linha: str) -> bool:
+    def __verifica_linhas(self,
+                          inicio: int,
+                          linhas: List[int],
+                          n_linhas: int,
+                          descricao: str):
         """
-        Verifica se uma linha contém o texto que indica a parte de
-        demandas no arquivo de entrada.
+        Verifica se a tabela tem ao menos o número de linhas esperado.
         """
-        return LeituraEntrada.inicio_demanda in linha
+        if len(linhas) < n_linhas:
+            raise self.__erro(inicio,
+                              "esperadas {} linhas de {}, encontradas {}".
+                              format(n_linhas, descricao, len(linhas)))
+
+    def __le_configs_gerais(self, inicio: int) -> ConfigGeral:
+        """
+        Lê as linhas da tabela de configurações gerais, construindo
+        o objeto de configurações gerais.
+        """
+        ci = 29
+        cf = 44
+        logger.info("Lendo Configurações Gerais....")
+        logger.debug("X---------------------------X--------------X")
+        # As configurações obrigatórias começam após o separador
+        valores: List[Any] = []
+        i = inicio + 2
+        for tipo in LeituraEntrada.tipos_cfgs_gerais:
+            if self.__fim_tabela(i):
+                raise self.__erro(min([i, len(self.linhas) - 1]),
+                                  "configurações gerais incompletas")
+            valores.append(self.__converte(i, self.linhas[i][ci:cf], tipo))
+            i += 1
+        (nome,
+         metodo,
+         min_iters,
+         max_iters,
+         n_estagios,
+         n_aberturas,
+         n_cenarios,
+         aberturas_cauda,
+         peso_cauda,
+         intervalo_conf,
+         semente,
+         reamostrar,
+         n_pos_est,
+         custo_def,
+         n_uhe,
+         n_ute) = valores
+        reamostrar = bool(reamostrar)
+        # Lê as configurações opcionais, até o fim da tabela
+        opcionais: Dict[str, int] = {}
+        while not self.__fim_tabela(i):
+            opcionais[self.linhas[i][:ci].strip()] = i
+            i += 1
+
+        def opcional(chave: str, tipo: Callable[[str], Any]) -> Any:
+            if chave not in opcionais:
+                return tipo("0")
+            i_cfg = opcionais[chave]
+            return self.__converte(i_cfg, self.linhas[i_cfg][ci:cf], tipo)
+
+        selecao = bool(opcional(LeituraEntrada.cfg_selecao_cortes, int))
+        max_cortes = opcional(LeituraEntrada.cfg_max_cortes, int)
+        contador = bool(opcional(LeituraEntrada.cfg_contador_atividade,
+                                 int))
+        multicorte = bool(opcional(LeituraEntrada.cfg_multicorte, int))
+        cenarios_sim_final = opcional(LeituraEntrada.cfg_cenarios_sim_final,
+                                      int)
+        max_cenarios = opcional(LeituraEntrada.cfg_max_cenarios, int)
+        # Realiza o logging dos atributos lidos
+        logger.debug(" NOME DO ESTUDO".ljust(27) + nome.rjust(15))
+        logger.debug(" MÉTODO DE SOLUÇÃO".ljust(27) + metodo.rjust(15))
+        if metodo != "PL_UNICO":
+            logger.debug(" MIN. ITERAÇÕES".ljust(27) +
+                         str(min_iters).rjust(15))
+            logger.debug(" MAX. ITERAÇÕES".ljust(27) +
+                         str(max_iters).rjust(15))
+        logger.debug(" NÚMERO DE PERÍODOS".ljust(27) +
+                     str(n_estagios).rjust(15))
+        logger.debug(" ABERTURAS POR PERÍODO".ljust(27)
+                     + str(n_aberturas).rjust(15))
+        if metodo == "PDDE":
+            logger.debug(" NÚMERO DE CENARIOS FWD".ljust(27) +
+                         str(n_cenarios).rjust(15))
+            if aberturas_cauda > 0 or peso_cauda > 0:
+                logger.debug(" --- AVERSÃO A RISCO >> HABILITADA << ---")
+                logger.debug("ALFA = {:4.2f}    LAMBDA = {:4.2f}".
+                             format(aberturas_cauda, peso_cauda))
+            if reamostrar:
+                logger.debug("  --- REAMOSTRAGEM >> HABILITADA << ---")
+            if multicorte:
+                logger.debug("  --- MULTICORTE >> HABILITADO << ---")
+            if cenarios_sim_final > 0:
+                logger.debug(" CENÁRIOS SIMULAÇÃO FINAL".ljust(27) +
+                             str(cenarios_sim_final).rjust(15))
+            if max_cenarios > 0:
+                logger.debug(" MÁX. CENÁRIOS ARMAZENADOS".ljust(27) +
+                             str(max_cenarios).rjust(15))
+        if metodo != "PL_UNICO" and selecao:
+            logger.debug(" --- SELEÇÃO DE CORTES >> HABILITADA << ---")
+            logger.debug(" MAX. CORTES SELECIONADOS".ljust(27) +
+                         str(max_cortes).rjust(15))
+        logger.debug(" NÚMERO DE HIDRELÉTRICAS".ljust(27) +
+                     str(n_uhe).rjust(15))
+        logger.debug(" NÚMERO DE TERMELÉTRICAS".ljust(27) +
+                     str(n_ute).rjust(15))
+        logger.debug("X---------------------------X--------------X")
+        # Constroi o objeto de configurações gerais
+        cfg = ConfigGeral(nome,
+                          metodo,
+                          min_iters,
+                          max_iters,
+                          n_estagios,
+                          n_aberturas,
+                          n_cenarios,
+                          aberturas_cauda,
+                          peso_cauda,
+                          intervalo_conf,
+                          semente,
+                          reamostrar,
+                          n_pos_est,
+                          custo_def,
+                          n_uhe,
+                          n_ute,
+                          selecao,
+                          max_cortes,
+                          contador,
+                          multicorte,
+                          cenarios_sim_final,
+                          max_cenarios)
+        return cfg
 
-    def __inicio_hidreletricas(self, linha: str) -> bool:
+    def __le_demandas(self, inicio: int) -> List[Demanda]:
         """
-        Verifica se uma linha contém o texto que indica a parte de
-        parâmetros das hidrelétricas no arquivo de entrada.
+        Lê a tabela de demandas, construindo a lista de demandas
+        existentes em cada período de estudo.
         """
-        return LeituraEntrada.inicio_uhe in linha
+        logger.info("Lendo Demandas....")
+        logger.debug("X-------------X-------------------X")
+        colunas, linhas = self.__tabela(inicio, 1)
+        self.__verifica_colunas(inicio, colunas, 2)
+        self.__verifica_linhas(inicio,
+                               linhas,
+                               self.cfg.n_periodos,
+                               "demandas")
+        linhas = linhas[:self.cfg.n_periodos]
+        ini, fim = colunas[0]
+        periodos = [self.__converte(i, self.linhas[i][ini:fim], int)
+                    for i in linhas]
+        valores = self.__numeros(linhas, colunas[1:2])[:, 0].tolist()
+        demandas: List[Demanda] = []
+        for periodo, valor in zip(periodos, valores):
+            d = Demanda(periodo, valor)
+            logger.debug(str(d.periodo).rjust(13)
+                         + "  " + str(d.demanda).rjust(19))
+            demandas.append(d)
+        logger.debug("X-------------X-------------------X")
+        return demandas
 
-    def __inicio_termeletricas(self, linha: str) -> bool:
+    def __le_usinas(self,
+                    inicio: int,
+                    n_usinas: int,
+                    n_parametros: int,
+                    descricao: str
+                    ) -> Tuple[List[int], List[str], List[List[float]]]:
         """
-        Verifica se uma linha contém o texto que indica a parte de
-        parâmetros das termelétricas no arquivo de entrada.
+        Lê uma tabela de usinas, retornando os ids, os nomes e os
+        parâmetros numéricos de cada usina.
         """
-        return LeituraEntrada.inicio_ute in linha
+        colunas, linhas = self.__tabela(inicio, 1)
+        self.__verifica_colunas(inicio, colunas, n_parametros + 2)
+        self.__verifica_linhas(inicio, linhas, n_usinas, descricao)
+        linhas = linhas[:n_usinas]
+        (ini_id, fim_id), (ini_nome, fim_nome) = colunas[:2]
+        ids = [self.__converte(i, self.linhas[i][ini_id:fim_id], int)
+               for i in linhas]
+        nomes = [self.linhas[i][ini_nome:fim_nome].strip() for i in linhas]
+        parametros = self.__numeros(linhas,
+                                    colunas[2:n_parametros + 2]).tolist()
+        return ids, nomes, parametros
 
-    def __inicio_afluencias(self, linha: str) -> bool:
+    def __le_parametros_hidreletricas(self, inicio: int) -> List[UHE]:
         """
-        Verifica se uma linha contém o texto que indica a parte de
-        afluências no arquivo de entrada.
+        Lê a tabela de hidrelétricas, construindo os objetos das
+        usinas hidrelétricas existentes no sistema.
         """
-        return LeituraEntrada.inicio_afluencias in linha
+        logger.info("Lendo Parâmetros das UHEs....")
+        ids, nomes, parametros = self.__le_usinas(inicio,
+                                                  self.cfg.n_uhes,
+                                                  5,
+                                                  "hidrelétricas")
+        uhes: List[UHE] = []
+        for uhe_id, nome, p in zip(ids, nomes, parametros):
+            uhe = UHE(uhe_id, nome, p[0], p[1], p[2], p[3], p[4])
+            logger.debug("                 UHE {}".format(uhe.id))
+            logger.debug("X-------------------X-----------------X")
+            logger.debug(" NOME              "
+                         + str(uhe.nome).rjust(19))
+            logger.debug(" VOL. INICIAL (hm3)"
+                         + str(uhe.vol_inicial).rjust(19))
+            logger.debug(" VOL. MÍNIMO (hm3) "
+                         + str(uhe.vol_minimo).rjust(19))
+            logger.debug(" VOL. MÁXIMO (hm3) "
+                         + str(uhe.vol_maximo).rjust(19))
+            logger.debug(" PROD. (MWmed/hm3) "
+                         + str(uhe.produtividade).rjust(19))
+            logger.debug(" ENGOL. MÁXIMO (hm3)"
+                         + str(uhe.engolimento).rjust(18))
+            logger.debug("X-------------------X-----------------X")
+            uhes.append(uhe)
+        return uhes
 
-    def __fim_tabela(self, linha: str) -> bool:
+    def __le_parametros_termeletricas(self, inicio: int) -> List[UTE]:
         """
-        Verifica se uma linha é o fim de uma tabela.
+        Lê a tabela de termelétricas, construindo os objetos das
+        usinas termelétricas existentes no sistema.
         """
-        return LeituraEntrada.fim_tabela in linha
+        logger.info("Lendo Parâmetros das UTEs....")
+        ids, nomes, parametros = self.__le_usinas(inicio,
+                                                  self.cfg.n_utes,
+                                                  2,
+                                                  "termelétricas")
+        utes: List[UTE] = []
+        for ute_id, nome, p in zip(ids, nomes, parametros):
+            ute = UTE(ute_id, nome, p[0], p[1])
+            logger.debug("                 UTE {}".format(ute.id))
+            logger.debug("X-------------------X-----------------X")
+            logger.debug(" NOME              "
+                         + str(ute.nome).rjust(19))
+            logger.debug(" CAPACIDADE (MWmed)"
+                         + str(ute.capacidade).rjust(19))
+            logger.debug(" CUSTO ($/MWmed)   "
+                         + str(ute.custo).rjust(19))
+            logger.debug("X-------------------X-----------------X")
+            utes.append(ute)
+        return utes
 
-    def __le_linha_com_backup(self, arquivo: IO) -> str:
+    def __le_afluencias(self, inicio: int) -> Dict[int, List[List[float]]]:
         """
-        Faz uma leitura de linha de um arquivo, mas com a opção de usar
-        um backup de leitura anterior sinalizado anteriormente.
+        Lê a tabela de afluências, com uma linha por período de cada
+        UHE. A UHE é identificada somente na sua primeira linha, e as
+        colunas após o período são as afluências possíveis.
         """
-        linha = ""
-        if self.usa_backup:
-            self.usa_backup = False
-            linha = self.backup_linha
-        else:
-            linha = arquivo.readline()
-        return linha
+        logger.info("Lendo Afluências....")
+        colunas, linhas = self.__tabela(inicio, 2)
+        self.__verifica_colunas(inicio, colunas, 3)
+        n_afls = len(colunas) - 2
+        if n_afls < self.cfg.aberturas_periodo:
+            raise self.__erro(inicio + 1,
+                              "{} afluências por período, menos que as {} "
+                              "aberturas por período".
+                              format(n_afls, self.cfg.aberturas_periodo))
+        self.afluencias_por_periodo = n_afls
+        # Agrupa as linhas de cada UHE
+        (ini_id, fim_id), (ini_per, fim_per) = colunas[:2]
+        ids: List[int] = []
+        blocos: List[List[int]] = []
+        for i in linhas:
+            campo = self.linhas[i][ini_id:fim_id]
+            if len(campo.strip()) > 0:
+                uhe_id = self.__converte(i, campo, int)
+                if uhe_id in ids:
+                    raise self.__erro(i, "UHE {} repetida".format(uhe_id))
+                ids.append(uhe_id)
+                blocos.append([])
+            elif len(blocos) == 0:
+                raise self.__erro(i, "afluências sem a UHE")
+            blocos[-1].append(i)
+        self.__verifica_linhas(inicio, ids, self.cfg.n_uhes, "UHEs")
+        # Para cada UHE, são esperadas tantas linhas quanto períodos
+        selecionadas: List[int] = []
+        periodos: List[int] = []
+        for bloco in blocos[:self.cfg.n_uhes]:
+            self.__verifica_linhas(bloco[0],
+                                   bloco,
+                                   self.cfg.n_periodos,
+                                   "períodos")
+            periodos_uhe: List[int] = []
+            for i in bloco[:self.cfg.n_periodos]:
+                periodo = self.__converte(i,
+                                          self.linhas[i][ini_per:fim_per],
+                                          int)
+                if periodo in periodos_uhe:
+                    raise self.__erro(i, "período {} repetido".
+                                      format(periodo))
+                periodos_uhe.append(periodo)
+            selecionadas += bloco[:self.cfg.n_periodos]
+            periodos += periodos_uhe
+        # Converte todas as afluências de uma vez, ordenando os
+        # períodos de cada UHE
+        forma = (self.cfg.n_uhes, self.cfg.n_periodos, n_afls)
+        tabela = self.__numeros(selecionadas, colunas[2:]).reshape(forma)
+        ordem = np.argsort(np.array(periodos).reshape(forma[:2]), axis=1)
+        self.tabela_afluencias = np.take_along_axis(tabela,
+                                                    ordem[:, :, np.newaxis],
+                                                    axis=1)
+        afluencias: Dict[int, List[List[float]]] = {}
+        for uhe_id, afls in zip(ids, self.tabela_afluencias.tolist()):
+            afluencias[uhe_id] = afls
+        return afluencias
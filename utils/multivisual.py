@@ -1,630 +1,334 @@
-from modelos.cenario import Cenario
 from modelos.resultado import Resultado
 from modelos.uhe import UHE
 from modelos.ute import UTE
+from utils.graficos import Area, Grafico, Serie, desenha_graficos
 
 import os
-import csv
 import logging
 import coloredlogs  # type: ignore
 import numpy as np  # type: ignore
-import matplotlib.pyplot as plt  # type: ignore
-from typing import List
+from typing import List, Optional, Union
 logger = logging.getLogger(__name__)
 
+# Famílias de gráficos de comparação, na ordem em que são geradas
+FAMILIAS = ["volume_final",
+            "volume_turbinado",
+            "volume_vertido",
+            "afluencias",
+            "custo_agua",
+            "geracao_termica",
+            "deficit",
+            "cmo",
+            "ci",
+            "alpha",
+            "fobj",
+            "convergencia"]
+
 
 class MultiVisual:
     """
     Coletânea de recursos para geração de gráficos comparativos
     entre vários métodos de solução para os problemas de otimização.
+    Assim como em Visual, cada gráfico é descrito por um objeto
+    Grafico e pode ser desenhado em um pool de processos.
     """
     def __init__(self,
                  resultados: List[Resultado],
                  caminho: str,
-                 LOG_LEVEL: str):
+                 LOG_LEVEL: str,
+                 workers: int = 1):
 
         self.uhes: List[UHE] = resultados[0].uhes
         self.utes: List[UTE] = resultados[0].utes
         self.resultados = resultados
-        self.cenarios_medios = [Cenario.cenario_medio(r.cenarios)
-                                for r in resultados]
+        self.cenarios_medios = [r.cenario_medio() for r in resultados]
         self.caminho = caminho
+        self.workers = workers
         coloredlogs.install(logger=logger, level=LOG_LEVEL)
 
     def visualiza(self):
         """
         Exporta os gráficos para comparação das saídas dos métodos.
         """
-        logger.info("# GERANDO VISUALIZAÇÕES DE COMPARAÇÃO EM {} #".
-                    format(self.caminho))
-        logger.info("---------------------------------------")
-        self.visualiza_volume_final()
-        self.visualiza_volume_turbinado()
-        self.visualiza_volume_vertido()
-        self.visualiza_afluencias()
-        self.visualiza_custo_agua()
-        self.visualiza_geracao_termica()
-        self.visualiza_deficit()
-        self.visualiza_cmo()
-        self.visualiza_ci()
-        self.visualiza_alpha()
-        self.visualiza_fobj()
-        self.visualiza_convergencia()
+        desenha_graficos(self.graficos(), self.workers)
         logger.info("---------------------------------------")
         logger.info("# FIM DAS VISUALIZAÇÕES DE COMPARAÇÃO")
         logger.info("-----------------------------------------")
 
-    def visualiza_volume_final(self):
+    def graficos(self,
+                 familias: Optional[List[str]] = None) -> List[Grafico]:
         """
-        Gera as comparações dos volumes finais médios para cada método.
+        Descreve os gráficos para comparação das saídas dos métodos,
+        sem desenhá-los. Opcionalmente, somente as famílias fornecidas,
+        dentre as de FAMILIAS, são geradas.
         """
-        logger.debug("Visualizações de volume final...")
-        # Se o diretório para os volumes finais não existe, cria
-        caminho = self.caminho + "volume_final/"
+        if familias is None:
+            familias = FAMILIAS
+        for f in familias:
+            if f not in FAMILIAS:
+                raise Exception("Família de gráficos inválida: {}".
+                                format(f))
+        logger.info("# GERANDO VISUALIZAÇÕES DE COMPARAÇÃO EM {} #".
+                    format(self.caminho))
+        logger.info("---------------------------------------")
+        graficos: List[Grafico] = []
+        for f in FAMILIAS:
+            if f in familias:
+                graficos += getattr(self, "graficos_" + f)()
+        return graficos
+
+    def __diretorio(self, nome: str) -> str:
+        """
+        Cria, se não existir, o diretório de um tipo de gráfico.
+        """
+        caminho = self.caminho + nome
         if not os.path.exists(caminho):
             os.makedirs(caminho)
-        # Um gráfico de saída para cada UHE
+        return caminho
+
+    def __grafico_medios(self,
+                         caminho: str,
+                         titulo: str,
+                         rotulo_y: str,
+                         prefixo: str,
+                         extrai,
+                         somente_pdd: bool = False) -> Grafico:
+        """
+        Descreve o gráfico de comparação de uma variável nos cenários
+        médios de cada método, onde extrai(c) retorna a variável de um
+        cenário, com dimensão (período,). Opcionalmente, os resultados
+        do PL Único são ignorados.
+        """
         n_periodos = self.resultados[0].cfg.n_periodos
         n_resultados = len(self.resultados)
-        cmap = plt.get_cmap('viridis')
-        for i, uh in enumerate(self.uhes):
-            # Configurações gerais do gráfico
-            plt.figure(figsize=(12, 6))
-            plt.title("VOLUME FINAL PARA {}".format(uh.nome))
-            # Eixo x:
-            plt.xlabel("Período de estudo")
-            x = np.arange(1, n_periodos + 1, 1)
-            plt.xticks(x)
-            # Eixo y:
-            plt.ylabel("Volume final (hm3)")
-            dados_cen: List[List[float]] = []
-            cabs_metodos: List[str] = []
-            for j, resultado, cenario in zip(range(n_resultados),
-                                             self.resultados,
-                                             self.cenarios_medios):
-                # Plota somente os cenários médios de cada método
-                label = str(resultado.cfg.nome)
-                cabs_metodos.append("VOLUME_FINAL_" + label)
-                dados_cen.append(cenario.volumes_finais[i])
-                plt.plot(x,
-                         cenario.volumes_finais[i],
-                         color=cmap(j / n_resultados),
-                         marker="o",
-                         linewidth=12,
-                         alpha=0.5,
-                         label=label)
-            plt.legend()
-            # Salva a imagem e exporta os dados
-            caminho_saida = caminho + "{}".format(uh.nome)
-            plt.savefig(caminho_saida + ".png")
-            cabecalho = ["PERIODO", *cabs_metodos]
-            dados = [x, *dados_cen]
-            self.exporta_dados(caminho_saida, cabecalho, dados)
-            plt.close()
+        x = np.arange(1, n_periodos + 1, 1)
+        grafico = Grafico(caminho,
+                          titulo,
+                          "Período de estudo",
+                          rotulo_y,
+                          xticks=x,
+                          legenda=True)
+        dados_cen: List[np.ndarray] = []
+        cabs_metodos: List[str] = []
+        for j, resultado, cenario in zip(range(n_resultados),
+                                         self.resultados,
+                                         self.cenarios_medios):
+            if somente_pdd and resultado.cfg.metodo == "PL_UNICO":
+                continue
+            # Plota somente os cenários médios de cada método
+            label = str(resultado.cfg.nome)
+            cabs_metodos.append(prefixo + label)
+            dados_cen.append(extrai(cenario))
+            grafico.series.append(Serie(x,
+                                        extrai(cenario),
+                                        j / n_resultados,
+                                        label,
+                                        marker="o",
+                                        linewidth=12,
+                                        alpha=0.5))
+        grafico.exporta(["PERIODO", *cabs_metodos], [x, *dados_cen])
+        return grafico
+
+    def __graficos_usinas(self,
+                          diretorio: str,
+                          titulo: str,
+                          rotulo_y: str,
+                          prefixo: str,
+                          nomes: List[str],
+                          extrai) -> List[Grafico]:
+        """
+        Descreve um gráfico de comparação para cada usina, onde
+        extrai(c) retorna a variável de um cenário, com dimensões
+        (usina, período).
+        """
+        caminho = self.__diretorio(diretorio)
+        return [self.__grafico_medios(caminho + "{}".format(nome),
+                                      titulo.format(nome),
+                                      rotulo_y,
+                                      prefixo,
+                                      lambda c, i=i: extrai(c)[i])
+                for i, nome in enumerate(nomes)]
+
+    def graficos_volume_final(self) -> List[Grafico]:
+        """
+        Gera as comparações dos volumes finais médios para cada método.
+        """
+        logger.debug("Visualizações de volume final...")
+        return self.__graficos_usinas("volume_final/",
+                                      "VOLUME FINAL PARA {}",
+                                      "Volume final (hm3)",
+                                      "VOLUME_FINAL_",
+                                      [uh.nome for uh in self.uhes],
+                                      lambda c: c.volumes_finais)
 
-    def visualiza_volume_turbinado(self):
+    def graficos_volume_turbinado(self) -> List[Grafico]:
         """
         Gera as comparações dos volumes turbinados médios para cada método.
         """
         logger.debug("Visualizações de volume turbinado...")
-        # Se o diretório para os volumes turbinados não existe, cria
-        caminho = self.caminho + "volume_turbinado/"
-        if not os.path.exists(caminho):
-            os.makedirs(caminho)
-        # Um gráfico de saída para cada UHE
-        n_periodos = self.resultados[0].cfg.n_periodos
-        n_resultados = len(self.resultados)
-        cmap = plt.get_cmap('viridis')
-        for i, uh in enumerate(self.uhes):
-            # Configurações gerais do gráfico
-            plt.figure(figsize=(12, 6))
-            plt.title("VOLUME TURBINADO PARA {}".format(uh.nome))
-            # Eixo x:
-            plt.xlabel("Período de estudo")
-            x = np.arange(1, n_periodos + 1, 1)
-            plt.xticks(x)
-            # Eixo y:
-            plt.ylabel("Volume turbinado (hm3)")
-            dados_cen: List[List[float]] = []
-            cabs_metodos: List[str] = []
-            for j, resultado, cenario in zip(range(n_resultados),
-                                             self.resultados,
-                                             self.cenarios_medios):
-                # Plota somente os cenários médios de cada método
-                label = str(resultado.cfg.nome)
-                cabs_metodos.append("VOLUME_TURBINADO_" + label)
-                dados_cen.append(cenario.volumes_turbinados[i])
-                plt.plot(x,
-                         cenario.volumes_turbinados[i],
-                         color=cmap(j / n_resultados),
-                         marker="o",
-                         linewidth=12,
-                         alpha=0.5,
-                         label=label)
-            plt.legend()
-            # Salva a imagem e exporta os dados
-            caminho_saida = caminho + "{}".format(uh.nome)
-            plt.savefig(caminho_saida + ".png")
-            cabecalho = ["PERIODO", *cabs_metodos]
-            dados = [x, *dados_cen]
-            self.exporta_dados(caminho_saida, cabecalho, dados)
-            plt.close()
+        return self.__graficos_usinas("volume_turbinado/",
+                                      "VOLUME TURBINADO PARA {}",
+                                      "Volume turbinado (hm3)",
+                                      "VOLUME_TURBINADO_",
+                                      [uh.nome for uh in self.uhes],
+                                      lambda c: c.volumes_turbinados)
 
-    def visualiza_volume_vertido(self):
+    def graficos_volume_vertido(self) -> List[Grafico]:
         """
         Gera as comparações dos volumes vertidos médios para cada método.
         """
         logger.debug("Visualizações de volume vertido...")
-        # Se o diretório para os volumes vertidos não existe, cria
-        caminho = self.caminho + "volume_vertido/"
-        if not os.path.exists(caminho):
-            os.makedirs(caminho)
-        # Um gráfico de saída para cada UHE
-        n_periodos = self.resultados[0].cfg.n_periodos
-        n_resultados = len(self.resultados)
-        cmap = plt.get_cmap('viridis')
-        for i, uh in enumerate(self.uhes):
-            # Configurações gerais do gráfico
-            plt.figure(figsize=(12, 6))
-            plt.title("VOLUME VERTIDO PARA {}".format(uh.nome))
-            # Eixo x:
-            plt.xlabel("Período de estudo")
-            x = np.arange(1, n_periodos + 1, 1)
-            plt.xticks(x)
-            # Eixo y:
-            plt.ylabel("Volume vertido (hm3)")
-            dados_cen: List[List[float]] = []
-            cabs_metodos: List[str] = []
-            for j, resultado, cenario in zip(range(n_resultados),
-                                             self.resultados,
-                                             self.cenarios_medios):
-                # Plota somente os cenários médios de cada método
-                label = str(resultado.cfg.nome)
-                cabs_metodos.append("VOLUME_VERTIDO_" + label)
-                dados_cen.append(cenario.volumes_vertidos[i])
-                plt.plot(x,
-                         cenario.volumes_vertidos[i],
-                         color=cmap(j / n_resultados),
-                         marker="o",
-                         linewidth=12,
-                         alpha=0.5,
-                         label=label)
-            plt.legend()
-            # Salva a imagem e exporta os dados
-            caminho_saida = caminho + "{}".format(uh.nome)
-            plt.savefig(caminho_saida + ".png")
-            cabecalho = ["PERIODO", *cabs_metodos]
-            dados = [x, *dados_cen]
-            self.exporta_dados(caminho_saida, cabecalho, dados)
-            plt.close()
+        return self.__graficos_usinas("volume_vertido/",
+                                      "VOLUME VERTIDO PARA {}",
+                                      "Volume vertido (hm3)",
+                                      "VOLUME_VERTIDO_",
+                                      [uh.nome for uh in self.uhes],
+                                      lambda c: c.volumes_vertidos)
 
-    def visualiza_afluencias(self):
+    def graficos_afluencias(self) -> List[Grafico]:
         """
         Gera as comparações das afluências médias para cada método.
         """
         logger.debug("Visualizações de afluências...")
-        # Se o diretório para as afluências não existe, cria
-        caminho = self.caminho + "afluencias/"
-        if not os.path.exists(caminho):
-            os.makedirs(caminho)
-        # Um gráfico de saída para cada UHE
-        n_periodos = self.resultados[0].cfg.n_periodos
-        n_resultados = len(self.resultados)
-        cmap = plt.get_cmap('viridis')
-        for i, uh in enumerate(self.uhes):
-            # Configurações gerais do gráfico
-            plt.figure(figsize=(12, 6))
-            plt.title("AFLUÊNCIAS PARA {}".format(uh.nome))
-            # Eixo x:
-            plt.xlabel("Período de estudo")
-            x = np.arange(1, n_periodos + 1, 1)
-            plt.xticks(x)
-            # Eixo y:
-            plt.ylabel("Afluência (hm3)")
-            dados_cen: List[List[float]] = []
-            cabs_metodos: List[str] = []
-            for j, resultado, cenario in zip(range(n_resultados),
-                                             self.resultados,
-                                             self.cenarios_medios):
-                # Plota somente os cenários médios de cada método
-                label = str(resultado.cfg.nome)
-                cabs_metodos.append("AFLUENCIA_" + label)
-                dados_cen.append(cenario.afluencias[i])
-                plt.plot(x,
-                         cenario.afluencias[i],
-                         color=cmap(j / n_resultados),
-                         marker="o",
-                         linewidth=12,
-                         alpha=0.5,
-                         label=label)
-            plt.legend()
-            # Salva a imagem e exporta os dados
-            caminho_saida = caminho + "{}".format(uh.nome)
-            plt.savefig(caminho_saida + ".png")
-            cabecalho = ["PERIODO", *cabs_metodos]
-            dados = [x, *dados_cen]
-            self.exporta_dados(caminho_saida, cabecalho, dados)
-            plt.close()
+        return self.__graficos_usinas("afluencias/",
+                                      "AFLUÊNCIAS PARA {}",
+                                      "Afluência (hm3)",
+                                      "AFLUENCIA_",
+                                      [uh.nome for uh in self.uhes],
+                                      lambda c: c.afluencias)
 
-    def visualiza_custo_agua(self):
+    def graficos_custo_agua(self) -> List[Grafico]:
         """
         Gera as comparações dos CMA médios para cada método.
         """
         logger.debug("Visualizações de CMA...")
-        # Se o diretório para os CMA não existe, cria
-        caminho = self.caminho + "CMA/"
-        if not os.path.exists(caminho):
-            os.makedirs(caminho)
-        # Um gráfico de saída para cada UHE
-        n_periodos = self.resultados[0].cfg.n_periodos
-        n_resultados = len(self.resultados)
-        cmap = plt.get_cmap('viridis')
-        for i, uh in enumerate(self.uhes):
-            # Configurações gerais do gráfico
-            plt.figure(figsize=(12, 6))
-            plt.title("CMA PARA {}".format(uh.nome))
-            # Eixo x:
-            plt.xlabel("Período de estudo")
-            x = np.arange(1, n_periodos + 1, 1)
-            plt.xticks(x)
-            # Eixo y:
-            plt.ylabel("Variação do custo ($/hm3)")
-            dados_cen: List[List[float]] = []
-            cabs_metodos: List[str] = []
-            for j, resultado, cenario in zip(range(n_resultados),
-                                             self.resultados,
-                                             self.cenarios_medios):
-                # Plota somente os cenários médios de cada método
-                label = str(resultado.cfg.nome)
-                cabs_metodos.append("CMA_" + label)
-                dados_cen.append(cenario.custo_agua[i])
-                plt.plot(x,
-                         cenario.custo_agua[i],
-                         color=cmap(j / n_resultados),
-                         marker="o",
-                         linewidth=12,
-                         alpha=0.5,
-                         label=label)
-            plt.legend()
-            # Salva a imagem e exporta os dados
-            caminho_saida = caminho + "{}".format(uh.nome)
-            plt.savefig(caminho_saida + ".png")
-            cabecalho = ["PERIODO", *cabs_metodos]
-            dados = [x, *dados_cen]
-            self.exporta_dados(caminho_saida, cabecalho, dados)
-            plt.close()
+        return self.__graficos_usinas("CMA/",
+                                      "CMA PARA {}",
+                                      "Variação do custo ($/hm3)",
+                                      "CMA_",
+                                      [uh.nome for uh in self.uhes],
+                                      lambda c: c.custo_agua)
 
-    def visualiza_geracao_termica(self):
+    def graficos_geracao_termica(self) -> List[Grafico]:
         """
         Gera as comparações das gerações médias
         das térmicas para cada método.
         """
         logger.debug("Visualizações de geração das térmicas...")
-        # Se o diretório para as térmicas não existe, cria
-        caminho = self.caminho + "geracao_termica/"
-        if not os.path.exists(caminho):
-            os.makedirs(caminho)
-        # Um gráfico de saída para cada UHE
-        n_periodos = self.resultados[0].cfg.n_periodos
-        n_resultados = len(self.resultados)
-        cmap = plt.get_cmap('viridis')
-        for i, ut in enumerate(self.utes):
-            # Configurações gerais do gráfico
-            plt.figure(figsize=(12, 6))
-            plt.title("GERAÇÃO PARA {}".format(ut.nome))
-            # Eixo x:
-            plt.xlabel("Período de estudo")
-            x = np.arange(1, n_periodos + 1, 1)
-            plt.xticks(x)
-            # Eixo y:
-            plt.ylabel("Energia gerada (MWmed)")
-            dados_cen: List[List[float]] = []
-            cabs_metodos: List[str] = []
-            for j, resultado, cenario in zip(range(n_resultados),
-                                             self.resultados,
-                                             self.cenarios_medios):
-                # Plota somente os cenários médios de cada método
-                label = str(resultado.cfg.nome)
-                cabs_metodos.append("GT_" + label)
-                dados_cen.append(cenario.geracao_termica[i])
-                plt.plot(x,
-                         cenario.geracao_termica[i],
-                         color=cmap(j / n_resultados),
-                         marker="o",
-                         linewidth=12,
-                         alpha=0.5,
-                         label=label)
-            plt.legend()
-            # Salva a imagem e exporta os dados
-            caminho_saida = caminho + "{}".format(ut.nome)
-            plt.savefig(caminho_saida + ".png")
-            cabecalho = ["PERIODO", *cabs_metodos]
-            dados = [x, *dados_cen]
-            self.exporta_dados(caminho_saida, cabecalho, dados)
-            plt.close()
+        return self.__graficos_usinas("geracao_termica/",
+                                      "GERAÇÃO PARA {}",
+                                      "Energia gerada (MWmed)",
+                                      "GT_",
+                                      [ut.nome for ut in self.utes],
+                                      lambda c: c.geracao_termica)
 
-    def visualiza_deficit(self):
+    def graficos_deficit(self) -> List[Grafico]:
         """
         Gera as comparações dos déficits para cada método.
         """
         logger.debug("Visualizações de déficit...")
-        # Se o diretório para os déficits não existe, cria
-        caminho = self.caminho + "deficits/"
-        if not os.path.exists(caminho):
-            os.makedirs(caminho)
-        n_periodos = self.resultados[0].cfg.n_periodos
-        n_resultados = len(self.resultados)
-        cmap = plt.get_cmap('viridis')
-        # Configurações gerais do gráfico
-        plt.figure(figsize=(12, 6))
-        plt.title("DÉFICIT")
-        # Eixo x:
-        plt.xlabel("Período de estudo")
-        x = np.arange(1, n_periodos + 1, 1)
-        plt.xticks(x)
-        # Eixo y:
-        plt.ylabel("Déficit (MWmed)")
-        dados_cen: List[List[float]] = []
-        cabs_metodos: List[str] = []
-        for j, resultado, cenario in zip(range(n_resultados),
-                                         self.resultados,
-                                         self.cenarios_medios):
-            # Plota somente os cenários médios de cada método
-            label = str(resultado.cfg.nome)
-            cabs_metodos.append("DEF_" + label)
-            dados_cen.append(cenario.deficit)
-            plt.plot(x,
-                     cenario.deficit,
-                     color=cmap(j / n_resultados),
-                     marker="o",
-                     linewidth=12,
-                     alpha=0.5,
-                     label=label)
-        plt.legend()
-        # Salva a imagem e exporta os dados
-        caminho_saida = caminho + "deficit"
-        plt.savefig(caminho_saida + ".png")
-        cabecalho = ["PERIODO", *cabs_metodos]
-        dados = [x, *dados_cen]
-        self.exporta_dados(caminho_saida, cabecalho, dados)
-        plt.close()
+        caminho = self.__diretorio("deficits/")
+        return [self.__grafico_medios(caminho + "deficit",
+                                      "DÉFICIT",
+                                      "Déficit (MWmed)",
+                                      "DEF_",
+                                      lambda c: c.deficit)]
 
-    def visualiza_cmo(self):
+    def graficos_cmo(self) -> List[Grafico]:
         """
         Gera as comparações do CMO para cada método.
         """
         logger.debug("Visualização de CMO...")
-        # Se o diretório para o CMO não existe, cria
-        caminho = self.caminho + "CMO/"
-        if not os.path.exists(caminho):
-            os.makedirs(caminho)
-        n_periodos = self.resultados[0].cfg.n_periodos
-        n_resultados = len(self.resultados)
-        cmap = plt.get_cmap('viridis')
-        # Configurações gerais do gráfico
-        plt.figure(figsize=(12, 6))
-        plt.title("CMO")
-        # Eixo x:
-        plt.xlabel("Período de estudo")
-        x = np.arange(1, n_periodos + 1, 1)
-        plt.xticks(x)
-        # Eixo y:
-        plt.ylabel("Variação do custo ($/MWmed)")
-        dados_cen: List[List[float]] = []
-        cabs_metodos: List[str] = []
-        for j, resultado, cenario in zip(range(n_resultados),
-                                         self.resultados,
-                                         self.cenarios_medios):
-            # Plota somente os cenários médios de cada método
-            label = str(resultado.cfg.nome)
-            cabs_metodos.append("CMO_" + label)
-            dados_cen.append(cenario.cmo)
-            plt.plot(x,
-                     cenario.cmo,
-                     color=cmap(j / n_resultados),
-                     marker="o",
-                     linewidth=12,
-                     alpha=0.5,
-                     label=label)
-        plt.legend()
-        # Salva a imagem e exporta os dados
-        caminho_saida = caminho + "cmo"
-        plt.savefig(caminho_saida + ".png")
-        cabecalho = ["PERIODO", *cabs_metodos]
-        dados = [x, *dados_cen]
-        self.exporta_dados(caminho_saida, cabecalho, dados)
-        plt.close()
+        caminho = self.__diretorio("CMO/")
+        return [self.__grafico_medios(caminho + "cmo",
+                                      "CMO",
+                                      "Variação do custo ($/MWmed)",
+                                      "CMO_",
+                                      lambda c: c.cmo)]
 
-    def visualiza_ci(self):
+    def graficos_ci(self) -> List[Grafico]:
         """
         Gera as comparações dos custos imediatos para cada método.
         """
         logger.debug("Visualização de custos imediatos...")
-        # Se o diretório para os custos imediatos não existe, cria
-        caminho = self.caminho + "custo_imediato/"
-        if not os.path.exists(caminho):
-            os.makedirs(caminho)
-        n_periodos = self.resultados[0].cfg.n_periodos
-        n_resultados = len(self.resultados)
-        cmap = plt.get_cmap('viridis')
-        # Configurações gerais do gráfico
-        plt.figure(figsize=(12, 6))
-        plt.title("Custo Imediato")
-        # Eixo x:
-        plt.xlabel("Período de estudo")
-        x = np.arange(1, n_periodos + 1, 1)
-        plt.xticks(x)
-        # Eixo y:
-        plt.ylabel("Custo ($)")
-        dados_cen: List[List[float]] = []
-        cabs_metodos: List[str] = []
-        for j, resultado, cenario in zip(range(n_resultados),
-                                         self.resultados,
-                                         self.cenarios_medios):
-            # Plota somente os cenários médios de cada método
-            label = str(resultado.cfg.nome)
-            cabs_metodos.append("CI_" + label)
-            dados_cen.append(cenario.ci)
-            plt.plot(x,
-                     cenario.ci,
-                     color=cmap(j / n_resultados),
-                     marker="o",
-                     linewidth=12,
-                     alpha=0.5,
-                     label=label)
-        plt.legend()
-        # Salva a imagem e exporta os dados
-        caminho_saida = caminho + "ci"
-        plt.savefig(caminho_saida + ".png")
-        cabecalho = ["PERIODO", *cabs_metodos]
-        dados = [x, *dados_cen]
-        self.exporta_dados(caminho_saida, cabecalho, dados)
-        plt.close()
+        caminho = self.__diretorio("custo_imediato/")
+        return [self.__grafico_medios(caminho + "ci",
+                                      "Custo Imediato",
+                                      "Custo ($)",
+                                      "CI_",
+                                      lambda c: c.ci)]
 
-    def visualiza_alpha(self):
+    def graficos_alpha(self) -> List[Grafico]:
         """
         Gera as comparações dos custos futuros para cada método.
         """
         logger.debug("Visualização de custos futuros...")
-        # Se o diretório para os custos futuros não existe, cria
-        caminho = self.caminho + "custo_futuro/"
-        if not os.path.exists(caminho):
-            os.makedirs(caminho)
-        n_periodos = self.resultados[0].cfg.n_periodos
-        n_resultados = len(self.resultados)
-        cmap = plt.get_cmap('viridis')
-        # Configurações gerais do gráfico
-        plt.figure(figsize=(12, 6))
-        plt.title("Custo Futuro")
-        # Eixo x:
-        plt.xlabel("Período de estudo")
-        x = np.arange(1, n_periodos + 1, 1)
-        plt.xticks(x)
-        # Eixo y:
-        plt.ylabel("Custo ($)")
-        dados_cen: List[List[float]] = []
-        cabs_metodos: List[str] = []
-        for j, resultado, cenario in zip(range(n_resultados),
-                                         self.resultados,
-                                         self.cenarios_medios):
-            if resultado.cfg.metodo == "PL_UNICO":
-                continue
-            # Plota somente os cenários médios de cada método
-            label = str(resultado.cfg.nome)
-            cabs_metodos.append("CF_" + label)
-            dados_cen.append(cenario.alpha)
-            plt.plot(x,
-                     cenario.alpha,
-                     color=cmap(j / n_resultados),
-                     marker="o",
-                     linewidth=12,
-                     alpha=0.5,
-                     label=label)
-        plt.legend()
-        # Salva a imagem e exporta os dados
-        caminho_saida = caminho + "alpha"
-        plt.savefig(caminho_saida + ".png")
-        cabecalho = ["PERIODO", *cabs_metodos]
-        dados = [x, *dados_cen]
-        self.exporta_dados(caminho_saida, cabecalho, dados)
-        plt.close()
+        caminho = self.__diretorio("custo_futuro/")
+        return [self.__grafico_medios(caminho + "alpha",
+                                      "Custo Futuro",
+                                      "Custo ($)",
+                                      "CF_",
+                                      lambda c: c.alpha,
+                                      True)]
 
-    def visualiza_fobj(self):
+    def graficos_fobj(self) -> List[Grafico]:
         """
         Gera as comparações dos custos totais para cada método.
         """
         logger.debug("Visualização de custos totais...")
-        # Se o diretório para os custos totais não existe, cria
-        caminho = self.caminho + "custo_total/"
-        if not os.path.exists(caminho):
-            os.makedirs(caminho)
-        n_periodos = self.resultados[0].cfg.n_periodos
-        n_resultados = len(self.resultados)
-        cmap = plt.get_cmap('viridis')
-        # Configurações gerais do gráfico
-        plt.figure(figsize=(12, 6))
-        plt.title("Custo total")
-        # Eixo x:
-        plt.xlabel("Período de estudo")
-        x = np.arange(1, n_periodos + 1, 1)
-        plt.xticks(x)
-        # Eixo y:
-        plt.ylabel("Custo ($)")
-        dados_cen: List[List[float]] = []
-        cabs_metodos: List[str] = []
-        for j, resultado, cenario in zip(range(n_resultados),
-                                         self.resultados,
-                                         self.cenarios_medios):
-            if resultado.cfg.metodo == "PL_UNICO":
-                continue
-            # Plota somente os cenários médios de cada método
-            label = str(resultado.cfg.nome)
-            cabs_metodos.append("FOBJ_" + label)
-            dados_cen.append(cenario.fobj)
-            plt.plot(x,
-                     cenario.fobj,
-                     color=cmap(j / n_resultados),
-                     marker="o",
-                     linewidth=12,
-                     alpha=0.5,
-                     label=label)
-        plt.legend()
-        # Salva a imagem e exporta os dados
-        caminho_saida = caminho + "fobj"
-        plt.savefig(caminho_saida + ".png")
-        cabecalho = ["PERIODO", *cabs_metodos]
-        dados = [x, *dados_cen]
-        self.exporta_dados(caminho_saida, cabecalho, dados)
-        plt.close()
+        caminho = self.__diretorio("custo_total/")
+        return [self.__grafico_medios(caminho + "fobj",
+                                      "Custo total",
+                                      "Custo ($)",
+                                      "FOBJ_",
+                                      lambda c: c.fobj,
+                                      True)]
 
-    def visualiza_convergencia(self):
+    def graficos_convergencia(self) -> List[Grafico]:
         """
         Gera as comparações da convergência para cada método.
         """
         logger.debug("Visualização de convergência...")
-        # Se o diretório para a convergência não existe, cria
-        caminho = self.caminho
-        if not os.path.exists(caminho):
-            os.makedirs(caminho)
+        caminho = self.__diretorio("")
         n_resultados = len(self.resultados)
-        cmap = plt.get_cmap('viridis')
-        # Configurações gerais do gráfico
-        plt.figure(figsize=(12, 6))
-        plt.title("Convergência")
-        # Eixo x:
-        plt.xlabel("Iteração")
-        # Eixo y:
-        plt.ylabel("Limites do custo ($)")
         dados_cen: List[List[float]] = []
         cabs_metodos: List[str] = []
         eixos_x = [np.arange(1, len(r.z_sup), 1)
                    for r in self.resultados]
         iteracoes_x = [len(e) for e in eixos_x]
         ind_x_mais_longo = iteracoes_x.index(max(iteracoes_x))
+        grafico = Grafico(caminho + "convergencia",
+                          "Convergência",
+                          "Iteração",
+                          "Limites do custo ($)",
+                          xticks=eixos_x[ind_x_mais_longo],
+                          legenda=True)
         for j, resultado in enumerate(self.resultados):
             if resultado.cfg.metodo == "PL_UNICO":
                 continue
             label = "ZSUP " + str(resultado.cfg.nome)
             cabs_metodos.append(label)
             dados_cen.append(resultado.z_sup)
-            plt.plot(eixos_x[j],
-                     resultado.z_sup[:len(resultado.z_sup)-1],
-                     color=cmap(j / n_resultados + 0.1),
-                     marker="o",
-                     linewidth=12,
-                     alpha=0.5,
-                     label=label)
+            grafico.series.append(
+                Serie(eixos_x[j],
+                      np.array(resultado.z_sup[:len(resultado.z_sup)-1]),
+                      j / n_resultados + 0.1,
+                      label,
+                      marker="o",
+                      linewidth=12,
+                      alpha=0.5))
 
             label = "ZINF " + str(resultado.cfg.nome)
             cabs_metodos.append(label)
             dados_cen.append(resultado.z_inf)
-            plt.plot(eixos_x[j],
-                     resultado.z_inf[:len(resultado.z_inf)-1],
-                     color=cmap(j / n_resultados + 0.15),
-                     marker="o",
-                     linewidth=12,
-                     alpha=0.5,
-                     label=label)
+            grafico.series.append(
+                Serie(eixos_x[j],
+                      np.array(resultado.z_inf[:len(resultado.z_inf)-1]),
+                      j / n_resultados + 0.15,
+                      label,
+                      marker="o",
+                      linewidth=12,
+                      alpha=0.5))
             if resultado.cfg.metodo == "PDDE":
                 limite_inf = [conf[0] for conf
                               in resultado.intervalo_confianca]
@@ -635,45 +339,13 @@ class MultiVisual:
                 dados_cen.append(limite_inf)
                 dados_cen.append(limite_sup)
                 label = "CONF " + str(resultado.cfg.nome)
-                plt.fill_between(eixos_x[j],
-                                 limite_inf,
-                                 limite_sup,
-                                 color=cmap(j / n_resultados + 0.2),
-                                 alpha=0.2,
-                                 label=label)
-        plt.legend()
-        plt.xticks(eixos_x[ind_x_mais_longo])
-        # Salva a imagem e exporta os dados
-        caminho_saida = caminho + "convergencia"
-        plt.savefig(caminho_saida + ".png")
+                grafico.areas.append(Area(eixos_x[j],
+                                          np.array(limite_inf),
+                                          np.array(limite_sup),
+                                          j / n_resultados + 0.2,
+                                          label))
         cabecalho = ["PERIODO", *cabs_metodos]
-        dados = [eixos_x[ind_x_mais_longo], *dados_cen]
-        self.exporta_dados(caminho_saida, cabecalho, dados)
-        plt.close()
-
-    def exporta_dados(self,
-                      caminho: str,
-                      cabecalhos: List[str],
-                      dados: List[list]):
-        """
-        Exporta um conjunto de dados de uma determinada visualização
-        para um formato CSV.
-        """
-        # Confere se o número de cabeçalhos é igual ao de dados
-        n_dados = max([len(d) for d in dados])
-        # Confere se a quantidade de entradas de cada dado é igual
-        arq = caminho + ".csv"
-        with open(arq, "w", newline="") as arqcsv:
-            escritor = csv.writer(arqcsv,
-                                  delimiter=",",
-                                  quotechar="|",
-                                  quoting=csv.QUOTE_MINIMAL)
-            escritor.writerow(cabecalhos)
-            for i in range(n_dados):
-                a_escrever = []
-                for d in dados:
-                    if i < len(d):
-                        a_escrever.append(d[i])
-                    else:
-                        a_escrever.append("")
-                escritor.writerow(a_escrever)
+        dados: List[Union[list, np.ndarray]] = [eixos_x[ind_x_mais_longo],
+                                                *dados_cen]
+        grafico.exporta(cabecalho, dados)
+        return [grafico]
@@ -1,28 +1,39 @@
-from modelos.resultado import Resultado
 from modelos.cenario import Cenario
+from modelos.resultado import Resultado
 from modelos.uhe import UHE
 from modelos.ute import UTE
+from utils.graficos import Area, Feixe, Grafico, Serie, desenha_graficos
 
 import os
-import csv
 import logging
 import coloredlogs  # type: ignore
 import numpy as np  # type: ignore
 from typing import List
-import matplotlib.pyplot as plt  # type: ignore
 logger = logging.getLogger(__name__)
 
 
 class Visual:
     """
     Coletânea de recursos para geração de gráficos relacionados
-    às soluções dos problemas de otimização.
+    às soluções dos problemas de otimização. Cada gráfico é descrito
+    por um objeto Grafico, desenhado de forma independente dos demais,
+    então os gráficos podem ser desenhados em um pool de processos.
+
+    No modo completo, cada cenário é uma linha com marcadores e
+    rótulo. No modo rápido, são desenhadas no máximo max_trajetorias
+    trajetórias, igualmente espaçadas entre os cenários, como uma
+    única LineCollection, junto das faixas de quantis, da mediana e
+    do cenário médio de todos os cenários.
     """
     def __init__(self,
                  resultado: Resultado,
                  caminho: str,
-                 LOG_LEVEL: str):
+                 LOG_LEVEL: str,
+                 workers: int = 1,
+                 completo: bool = False,
+                 max_trajetorias: int = 100):
 
+        self.resultado = resultado
         self.metodo = resultado.cfg.metodo
         self.uhes: List[UHE] = resultado.uhes
         self.utes: List[UTE] = resultado.utes
@@ -33,6 +44,20 @@ class Visual:
         self.z_inf = resultado.z_inf
         self.intervalo_conf = resultado.intervalo_confianca
         self.cortes = resultado.cortes
+        self.cenario_medio = resultado.cenario_medio()
+        self.workers = workers
+        self.completo = completo
+        # Cenários desenhados individualmente e quantis das faixas
+        n_cenarios = len(self.cenarios)
+        self.indices_trajetorias = np.arange(n_cenarios)
+        self.cenarios_quantis: List[Cenario] = []
+        if not completo:
+            if n_cenarios > max_trajetorias:
+                self.indices_trajetorias = np.unique(
+                    np.linspace(0, n_cenarios - 1, max_trajetorias).
+                    astype(int))
+            self.cenarios_quantis = resultado.cenarios_quantis(
+                Resultado.QUANTIS_FAIXAS)
         coloredlogs.install(logger=logger, level=LOG_LEVEL)
 
     def visualiza(self):
@@ -40,653 +65,342 @@ class Visual:
         Exporta os gráficos para visualização das saídas do problema
         de otimização.
         """
+        desenha_graficos(self.graficos(), self.workers)
+        logger.info("---------------------------------------")
+        logger.info("# FIM DAS VISUALIZAÇÕES PARA O ESTUDO")
+        logger.info("-----------------------------------------")
+
+    def graficos(self) -> List[Grafico]:
+        """
+        Descreve os gráficos para visualização das saídas do problema
+        de otimização, sem desenhá-los.
+        """
         logger.info("# GERANDO VISUALIZAÇÕES EM {} #".
                     format(self.caminho))
         logger.info("---------------------------------------")
-        self.visualiza_volume_final()
-        self.visualiza_volume_turbinado()
-        self.visualiza_volume_vertido()
-        self.visualiza_afluencias()
-        self.visualiza_custo_agua()
-        self.visualiza_geracao_termica()
-        self.visualiza_deficit()
-        self.visualiza_cmo()
-        self.visualiza_ci()
+        graficos: List[Grafico] = []
+        graficos += self.graficos_volume_final()
+        graficos += self.graficos_volume_turbinado()
+        graficos += self.graficos_volume_vertido()
+        graficos += self.graficos_afluencias()
+        graficos += self.graficos_custo_agua()
+        graficos += self.graficos_geracao_termica()
+        graficos += self.graficos_deficit()
+        graficos += self.graficos_cmo()
+        graficos += self.graficos_ci()
         if self.metodo != "PL_UNICO":
-            self.visualiza_alpha()
-            self.visualiza_fobj()
-            self.visualiza_convergencia()
-            self.visualiza_cortes()
-        logger.info("---------------------------------------")
-        logger.info("# FIM DAS VISUALIZAÇÕES PARA O ESTUDO")
-        logger.info("-----------------------------------------")
+            graficos += self.graficos_alpha()
+            graficos += self.graficos_fobj()
+            graficos += self.graficos_convergencia()
+            graficos += self.graficos_cortes()
+        return graficos
 
-    def visualiza_volume_final(self):
+    def __diretorio(self, nome: str) -> str:
         """
-        Gera os gráficos para acompanhamento dos volumes finais.
+        Cria, se não existir, o diretório de um tipo de gráfico.
         """
-        logger.debug("Visualizações de volume final...")
-        # Se o diretório para os volumes finais não existe, cria
-        caminho = self.caminho + "volume_final/"
+        caminho = self.caminho + nome
         if not os.path.exists(caminho):
             os.makedirs(caminho)
-        # Um gráfico de saída para cada UHE
-        n_periodos = len(self.cenarios[0].volumes_finais[0])
+        return caminho
+
+    def __grafico_cenarios(self,
+                           caminho: str,
+                           titulo: str,
+                           rotulo_y: str,
+                           coluna: str,
+                           extrai) -> Grafico:
+        """
+        Descreve o gráfico de uma variável em todos os cenários, com
+        o cenário médio em destaque, exportando o cenário médio. A
+        função extrai(c) retorna a variável de um cenário, com
+        dimensão (período,).
+        """
+        serie_media = extrai(self.cenario_medio)
+        n_periodos = len(serie_media)
         n_cenarios = len(self.cenarios)
-        cmap = plt.get_cmap('viridis')
-        for i, uh in enumerate(self.uhes):
-            # Configurações gerais do gráfico
-            plt.figure(figsize=(12, 6))
-            plt.title("VOLUME FINAL PARA {}".format(uh.nome))
-            # Eixo x:
-            plt.xlabel("Período de estudo")
-            x = np.arange(1, n_periodos + 1, 1)
-            plt.xticks(x)
-            # Eixo y:
-            plt.ylabel("Volume final (hm3)")
+        x = np.arange(1, n_periodos + 1, 1)
+        grafico = Grafico(caminho,
+                          titulo,
+                          "Período de estudo",
+                          rotulo_y,
+                          xticks=x,
+                          legenda=not self.completo)
+        if self.completo:
             for j, cen in enumerate(self.cenarios):
-                plt.plot(x,
-                         cen.volumes_finais[i],
-                         color=cmap(j / n_cenarios),
-                         marker="o",
-                         linewidth=4,
-                         alpha=0.2,
-                         label="Cenário {}".format(j + 1))
-            # Plota o cenário médio
-            cenario_medio = Cenario.cenario_medio(self.cenarios)
-            plt.plot(x,
-                     cenario_medio.volumes_finais[i],
-                     color=cmap(1),
-                     marker="o",
-                     linewidth=16,
-                     alpha=0.2,
-                     label="Cenário médio")
-            # Salva a imagem e exporta os dados
-            caminho_saida = caminho + "{}".format(uh.nome)
-            plt.savefig(caminho_saida + ".png")
-            cabecalho = ["PERIODO", "VOLUME_FINAL"]
-            dados = [x, cenario_medio.volumes_finais[i]]
-            self.exporta_dados(caminho_saida, cabecalho, dados)
-            plt.close()
+                grafico.series.append(Serie(x,
+                                            extrai(cen),
+                                            j / n_cenarios,
+                                            "Cenário {}".format(j + 1),
+                                            marker="o",
+                                            linewidth=4,
+                                            alpha=0.2))
+        else:
+            indices = self.indices_trajetorias
+            ys = np.array([extrai(self.cenarios[j]) for j in indices])
+            grafico.feixes.append(Feixe(x,
+                                        ys.reshape(len(indices), n_periodos),
+                                        indices / n_cenarios,
+                                        linewidth=2,
+                                        alpha=0.2))
+            # Faixas dos quantis 10% - 90% e 25% - 75% e mediana
+            q10, q25, q50, q75, q90 = [extrai(c)
+                                       for c in self.cenarios_quantis]
+            grafico.areas.append(Area(x, q10, q90, 0.6,
+                                      "Quantis 10% - 90%", 0.15))
+            grafico.areas.append(Area(x, q25, q75, 0.6,
+                                      "Quantis 25% - 75%", 0.25))
+            grafico.series.append(Serie(x,
+                                        q50,
+                                        0.6,
+                                        "Mediana",
+                                        linestyle="--",
+                                        linewidth=2))
+        # Plota o cenário médio
+        grafico.series.append(Serie(x,
+                                    serie_media,
+                                    1,
+                                    "Cenário médio",
+                                    marker="o",
+                                    linewidth=16,
+                                    alpha=0.2))
+        grafico.exporta(["PERIODO", coluna], [x, serie_media])
+        return grafico
 
-    def visualiza_volume_turbinado(self):
+    def __graficos_usinas(self,
+                          diretorio: str,
+                          titulo: str,
+                          rotulo_y: str,
+                          coluna: str,
+                          nomes: List[str],
+                          extrai) -> List[Grafico]:
+        """
+        Descreve um gráfico para cada usina, onde extrai(c) retorna a
+        variável de um cenário, com dimensões (usina, período).
+        """
+        caminho = self.__diretorio(diretorio)
+        return [self.__grafico_cenarios(caminho + "{}".format(nome),
+                                        titulo.format(nome),
+                                        rotulo_y,
+                                        coluna,
+                                        lambda c, i=i: extrai(c)[i])
+                for i, nome in enumerate(nomes)]
+
+    def __graficos_sistema(self,
+                           diretorio: str,
+                           arquivo: str,
+                           titulo: str,
+                           rotulo_y: str,
+                           coluna: str,
+                           extrai) -> List[Grafico]:
+        """
+        Descreve o gráfico de uma variável do sistema, onde extrai(c)
+        retorna a variável de um cenário, com dimensão (período,).
+        """
+        caminho = self.__diretorio(diretorio)
+        return [self.__grafico_cenarios(caminho + arquivo,
+                                        titulo,
+                                        rotulo_y,
+                                        coluna,
+                                        extrai)]
+
+    def graficos_volume_final(self) -> List[Grafico]:
+        """
+        Gera os gráficos para acompanhamento dos volumes finais.
+        """
+        logger.debug("Visualizações de volume final...")
+        return self.__graficos_usinas("volume_final/",
+                                      "VOLUME FINAL PARA {}",
+                                      "Volume final (hm3)",
+                                      "VOLUME_FINAL",
+                                      [uh.nome for uh in self.uhes],
+                                      lambda c: c.volumes_finais)
+
+    def graficos_volume_turbinado(self) -> List[Grafico]:
         """
         Gera os gráficos para acompanhamento dos volumes turbinados.
         """
         logger.debug("Visualizações de volume turbinado...")
-        # Se o diretório para os volumes turbinados não existe, cria
-        caminho = self.caminho + "volume_turbinado/"
-        if not os.path.exists(caminho):
-            os.makedirs(caminho)
-        # Um gráfico de saída para cada UHE
-        n_periodos = len(self.cenarios[0].volumes_finais[0])
-        n_cenarios = len(self.cenarios)
-        cmap = plt.get_cmap('viridis')
-        for i, uh in enumerate(self.uhes):
-            # Configurações gerais do gráfico
-            plt.figure(figsize=(12, 6))
-            plt.title("VOLUME TURBINADO PARA {}".format(uh.nome))
-            # Eixo x:
-            plt.xlabel("Período de estudo")
-            x = np.arange(1, n_periodos + 1, 1)
-            plt.xticks(x)
-            # Eixo y:
-            plt.ylabel("Volume turbinado (hm3)")
-            for j, cen in enumerate(self.cenarios):
-                plt.plot(x,
-                         cen.volumes_turbinados[i],
-                         color=cmap(j / n_cenarios),
-                         marker="o",
-                         linewidth=4,
-                         alpha=0.2,
-                         label="Cenário {}".format(j + 1))
-            # Plota o cenário médio
-            cenario_medio = Cenario.cenario_medio(self.cenarios)
-            plt.plot(x,
-                     cenario_medio.volumes_turbinados[i],
-                     color=cmap(1),
-                     marker="o",
-                     linewidth=16,
-                     alpha=0.2,
-                     label="Cenário médio")
-            # Salva a imagem e exporta os dados
-            caminho_saida = caminho + "{}".format(uh.nome)
-            plt.savefig(caminho_saida + ".png")
-            cabecalho = ["PERIODO", "VOLUME_TURBINADO"]
-            dados = [x, cenario_medio.volumes_turbinados[i]]
-            self.exporta_dados(caminho_saida, cabecalho, dados)
-            plt.close()
+        return self.__graficos_usinas("volume_turbinado/",
+                                      "VOLUME TURBINADO PARA {}",
+                                      "Volume turbinado (hm3)",
+                                      "VOLUME_TURBINADO",
+                                      [uh.nome for uh in self.uhes],
+                                      lambda c: c.volumes_turbinados)
 
-    def visualiza_volume_vertido(self):
+    def graficos_volume_vertido(self) -> List[Grafico]:
         """
         Gera os gráficos para acompanhamento dos volumes vertidos.
         """
         logger.debug("Visualizações de volume vertido...")
-        # Se o diretório para os volumes vertidos não existe, cria
-        caminho = self.caminho + "volume_vertido/"
-        if not os.path.exists(caminho):
-            os.makedirs(caminho)
-        # Um gráfico de saída para cada UHE
-        n_periodos = len(self.cenarios[0].volumes_finais[0])
-        n_cenarios = len(self.cenarios)
-        cmap = plt.get_cmap('viridis')
-        for i, uh in enumerate(self.uhes):
-            # Configurações gerais do gráfico
-            plt.figure(figsize=(12, 6))
-            plt.title("VOLUME VERTIDO PARA {}".format(uh.nome))
-            # Eixo x:
-            plt.xlabel("Período de estudo")
-            x = np.arange(1, n_periodos + 1, 1)
-            plt.xticks(x)
-            # Eixo y:
-            plt.ylabel("Volume vertido (hm3)")
-            for j, cen in enumerate(self.cenarios):
-                plt.plot(x,
-                         cen.volumes_vertidos[i],
-                         color=cmap(j / n_cenarios),
-                         marker="o",
-                         linewidth=4,
-                         alpha=0.2,
-                         label="Cenário {}".format(j + 1))
-            # Plota o cenário médio
-            cenario_medio = Cenario.cenario_medio(self.cenarios)
-            plt.plot(x,
-                     cenario_medio.volumes_vertidos[i],
-                     color=cmap(1),
-                     marker="o",
-                     linewidth=16,
-                     alpha=0.2,
-                     label="Cenário médio")
-            # Salva a imagem e exporta os dados
-            caminho_saida = caminho + "{}".format(uh.nome)
-            plt.savefig(caminho_saida + ".png")
-            cabecalho = ["PERIODO", "VOLUME_VERTIDO"]
-            dados = [x, cenario_medio.volumes_vertidos[i]]
-            self.exporta_dados(caminho_saida, cabecalho, dados)
-            plt.close()
+        return self.__graficos_usinas("volume_vertido/",
+                                      "VOLUME VERTIDO PARA {}",
+                                      "Volume vertido (hm3)",
+                                      "VOLUME_VERTIDO",
+                                      [uh.nome for uh in self.uhes],
+                                      lambda c: c.volumes_vertidos)
 
-    def visualiza_afluencias(self):
+    def graficos_afluencias(self) -> List[Grafico]:
         """
         Gera os gráficos para acompanhamento das afluências.
         """
         logger.debug("Visualizações de afluências...")
-        # Se o diretório para as afluências não existe, cria
-        caminho = self.caminho + "afluencias/"
-        if not os.path.exists(caminho):
-            os.makedirs(caminho)
-        # Um gráfico de saída para cada UHE
-        n_periodos = len(self.cenarios[0].volumes_finais[0])
-        n_cenarios = len(self.cenarios)
-        cmap = plt.get_cmap('viridis')
-        for i, uh in enumerate(self.uhes):
-            # Configurações gerais do gráfico
-            plt.figure(figsize=(12, 6))
-            plt.title("AFLUÊNCIAS PARA {}".format(uh.nome))
-            # Eixo x:
-            plt.xlabel("Período de estudo")
-            x = np.arange(1, n_periodos + 1, 1)
-            plt.xticks(x)
-            # Eixo y:
-            plt.ylabel("Volume (hm3)")
-            for j, cen in enumerate(self.cenarios):
-                plt.plot(x,
-                         cen.afluencias[i],
-                         color=cmap(j / n_cenarios),
-                         marker="o",
-                         linewidth=4,
-                         alpha=0.2,
-                         label="Cenário {}".format(j + 1))
-            # Plota o cenário médio
-            cenario_medio = Cenario.cenario_medio(self.cenarios)
-            plt.plot(x,
-                     cenario_medio.afluencias[i],
-                     color=cmap(1),
-                     marker="o",
-                     linewidth=16,
-                     alpha=0.2,
-                     label="Cenário médio")
-            # Salva a imagem e exporta os dados
-            caminho_saida = caminho + "{}".format(uh.nome)
-            plt.savefig(caminho_saida + ".png")
-            cabecalho = ["PERIODO", "AFLUENCIA"]
-            dados = [x, cenario_medio.afluencias[i]]
-            self.exporta_dados(caminho_saida, cabecalho, dados)
-            plt.close()
+        return self.__graficos_usinas("afluencias/",
+                                      "AFLUÊNCIAS PARA {}",
+                                      "Volume (hm3)",
+                                      "AFLUENCIA",
+                                      [uh.nome for uh in self.uhes],
+                                      lambda c: c.afluencias)
 
-    def visualiza_custo_agua(self):
+    def graficos_custo_agua(self) -> List[Grafico]:
         """
         Gera os gráficos para acompanhamento do CMA.
         """
         logger.debug("Visualizações de CMA...")
-        # Se o diretório para o CMA não existe, cria
-        caminho = self.caminho + "CMA/"
-        if not os.path.exists(caminho):
-            os.makedirs(caminho)
-        # Um gráfico de saída para cada UHE
-        n_periodos = len(self.cenarios[0].volumes_finais[0])
-        n_cenarios = len(self.cenarios)
-        cmap = plt.get_cmap('viridis')
-        for i, uh in enumerate(self.uhes):
-            # Configurações gerais do gráfico
-            plt.figure(figsize=(12, 6))
-            plt.title("CMA PARA {}".format(uh.nome))
-            # Eixo x:
-            plt.xlabel("Período de estudo")
-            x = np.arange(1, n_periodos + 1, 1)
-            plt.xticks(x)
-            # Eixo y:
-            plt.ylabel("Variação do custo ($/hm3)")
-            for j, cen in enumerate(self.cenarios):
-                plt.plot(x,
-                         cen.custo_agua[i],
-                         color=cmap(j / n_cenarios),
-                         marker="o",
-                         linewidth=4,
-                         alpha=0.2,
-                         label="Cenário {}".format(j + 1))
-            # Plota o cenário médio
-            cenario_medio = Cenario.cenario_medio(self.cenarios)
-            plt.plot(x,
-                     cenario_medio.custo_agua[i],
-                     color=cmap(1),
-                     marker="o",
-                     linewidth=16,
-                     alpha=0.2,
-                     label="Cenário médio")
-            # Salva a imagem e exporta os dados
-            caminho_saida = caminho + "{}".format(uh.nome)
-            plt.savefig(caminho_saida + ".png")
-            cabecalho = ["PERIODO", "CUSTO_AGUA"]
-            dados = [x, cenario_medio.custo_agua[i]]
-            self.exporta_dados(caminho_saida, cabecalho, dados)
-            plt.close()
+        return self.__graficos_usinas("CMA/",
+                                      "CMA PARA {}",
+                                      "Variação do custo ($/hm3)",
+                                      "CUSTO_AGUA",
+                                      [uh.nome for uh in self.uhes],
+                                      lambda c: c.custo_agua)
 
-    def visualiza_geracao_termica(self):
+    def graficos_geracao_termica(self) -> List[Grafico]:
         """
         Gera os gráficos para acompanhamento da geração das térmicas.
         """
         logger.debug("Visualizações de geração das térmicas...")
-        # Se o diretório para as térmicas não existe, cria
-        caminho = self.caminho + "geracao_termica/"
-        if not os.path.exists(caminho):
-            os.makedirs(caminho)
-        # Um gráfico de saída para cada UTE
-        n_periodos = len(self.cenarios[0].volumes_finais[0])
-        n_cenarios = len(self.cenarios)
-        cmap = plt.get_cmap('viridis')
-        for i, ut in enumerate(self.utes):
-            # Configurações gerais do gráfico
-            plt.figure(figsize=(12, 6))
-            plt.title("GERAÇÂO TÉRMICA PARA {}".format(ut.nome))
-            # Eixo x:
-            plt.xlabel("Período de estudo")
-            x = np.arange(1, n_periodos + 1, 1)
-            plt.xticks(x)
-            # Eixo y:
-            plt.ylabel("Geração (MWmed)")
-            for j, cen in enumerate(self.cenarios):
-                plt.plot(x,
-                         cen.geracao_termica[i],
-                         color=cmap(j / n_cenarios),
-                         marker="o",
-                         linewidth=4,
-                         alpha=0.2,
-                         label="Cenário {}".format(j + 1))
-            # Plota o cenário médio
-            cenario_medio = Cenario.cenario_medio(self.cenarios)
-            plt.plot(x,
-                     cenario_medio.geracao_termica[i],
-                     color=cmap(1),
-                     marker="o",
-                     linewidth=16,
-                     alpha=0.2,
-                     label="Cenário médio")
-            # Salva a imagem e exporta os dados
-            caminho_saida = caminho + "{}".format(ut.nome)
-            plt.savefig(caminho_saida + ".png")
-            cabecalho = ["PERIODO", "GERACAO"]
-            dados = [x, cenario_medio.geracao_termica[i]]
-            self.exporta_dados(caminho_saida, cabecalho, dados)
-            plt.close()
+        return self.__graficos_usinas("geracao_termica/",
+                                      "GERAÇÂO TÉRMICA PARA {}",
+                                      "Geração (MWmed)",
+                                      "GERACAO",
+                                      [ut.nome for ut in self.utes],
+                                      lambda c: c.geracao_termica)
 
-    def visualiza_deficit(self):
+    def graficos_deficit(self) -> List[Grafico]:
         """
         Gera os gráficos para acompanhamento do déficit.
         """
         logger.debug("Visualizações de déficit...")
-        # Se o diretório para os déficits não existe, cria
-        caminho = self.caminho + "deficit/"
-        if not os.path.exists(caminho):
-            os.makedirs(caminho)
-        # Um gráfico de saída para cada UTE
-        n_periodos = len(self.cenarios[0].volumes_finais[0])
-        n_cenarios = len(self.cenarios)
-        cmap = plt.get_cmap('viridis')
-        # Configurações gerais do gráfico
-        plt.figure(figsize=(12, 6))
-        plt.title("DÉFICITS")
-        # Eixo x:
-        plt.xlabel("Período de estudo")
-        x = np.arange(1, n_periodos + 1, 1)
-        plt.xticks(x)
-        # Eixo y:
-        plt.ylabel("Geração (MWmed)")
-        for j, cen in enumerate(self.cenarios):
-            plt.plot(x,
-                     cen.deficit,
-                     color=cmap(j / n_cenarios),
-                     marker="o",
-                     linewidth=4,
-                     alpha=0.2,
-                     label="Cenário {}".format(j + 1))
-        # Plota o cenário médio
-        cenario_medio = Cenario.cenario_medio(self.cenarios)
-        plt.plot(x,
-                 cenario_medio.deficit,
-                 color=cmap(1),
-                 marker="o",
-                 linewidth=16,
-                 alpha=0.2,
-                 label="Cenário médio")
-        # Salva a imagem e exporta os dados
-        caminho_saida = caminho + "deficit"
-        plt.savefig(caminho_saida + ".png")
-        cabecalho = ["PERIODO", "DEFICIT"]
-        dados = [x, cenario_medio.deficit]
-        self.exporta_dados(caminho_saida, cabecalho, dados)
-        plt.close()
+        return self.__graficos_sistema("deficit/",
+                                       "deficit",
+                                       "DÉFICITS",
+                                       "Geração (MWmed)",
+                                       "DEFICIT",
+                                       lambda c: c.deficit)
 
-    def visualiza_cmo(self):
+    def graficos_cmo(self) -> List[Grafico]:
         """
         Gera os gráficos para acompanhamento do CMO.
         """
         logger.debug("Visualização de CMO...")
-        # Se o diretório para o CMO não existe, cria
-        caminho = self.caminho + "CMO/"
-        if not os.path.exists(caminho):
-            os.makedirs(caminho)
-        # Um gráfico de saída para cada UTE
-        n_periodos = len(self.cenarios[0].volumes_finais[0])
-        n_cenarios = len(self.cenarios)
-        cmap = plt.get_cmap('viridis')
-        # Configurações gerais do gráfico
-        plt.figure(figsize=(12, 6))
-        plt.title("CUSTO MARGINAL DE OPERAÇÂO")
-        # Eixo x:
-        plt.xlabel("Período de estudo")
-        x = np.arange(1, n_periodos + 1, 1)
-        plt.xticks(x)
-        # Eixo y:
-        plt.ylabel("Variação do Custo ($/MWmed)")
-        for j, cen in enumerate(self.cenarios):
-            plt.plot(x,
-                     cen.cmo,
-                     color=cmap(j / n_cenarios),
-                     marker="o",
-                     linewidth=4,
-                     alpha=0.2,
-                     label="Cenário {}".format(j + 1))
-        # Plota o cenário médio
-        cenario_medio = Cenario.cenario_medio(self.cenarios)
-        plt.plot(x,
-                 cenario_medio.cmo,
-                 color=cmap(1),
-                 marker="o",
-                 linewidth=16,
-                 alpha=0.2,
-                 label="Cenário médio")
-        # Salva a imagem e exporta os dados
-        caminho_saida = caminho + "cmo"
-        plt.savefig(caminho_saida + ".png")
-        cabecalho = ["PERIODO", "CMO"]
-        dados = [x, cenario_medio.cmo]
-        self.exporta_dados(caminho_saida, cabecalho, dados)
-        plt.close()
+        return self.__graficos_sistema("CMO/",
+                                       "cmo",
+                                       "CUSTO MARGINAL DE OPERAÇÂO",
+                                       "Variação do Custo ($/MWmed)",
+                                       "CMO",
+                                       lambda c: c.cmo)
 
-    def visualiza_ci(self):
+    def graficos_ci(self) -> List[Grafico]:
         """
         Gera os gráficos para acompanhamento do Custo Imediato.
         """
         logger.debug("Visualização de custos imediatos...")
-        # Se o diretório para o CMO não existe, cria
-        caminho = self.caminho + "custo_imediato/"
-        if not os.path.exists(caminho):
-            os.makedirs(caminho)
-        # Um gráfico de saída para cada UTE
-        n_periodos = len(self.cenarios[0].volumes_finais[0])
-        n_cenarios = len(self.cenarios)
-        cmap = plt.get_cmap('viridis')
-        # Configurações gerais do gráfico
-        plt.figure(figsize=(12, 6))
-        plt.title("CUSTO IMEDIATO DE OPERAÇÃO")
-        # Eixo x:
-        plt.xlabel("Período de estudo")
-        x = np.arange(1, n_periodos + 1, 1)
-        plt.xticks(x)
-        # Eixo y:
-        plt.ylabel("Custo ($/MWmed)")
-        for j, cen in enumerate(self.cenarios):
-            plt.plot(x,
-                     cen.ci,
-                     color=cmap(j / n_cenarios),
-                     marker="o",
-                     linewidth=4,
-                     alpha=0.2,
-                     label="Cenário {}".format(j + 1))
-        # Plota o cenário médio
-        cenario_medio = Cenario.cenario_medio(self.cenarios)
-        plt.plot(x,
-                 cenario_medio.ci,
-                 color=cmap(1),
-                 marker="o",
-                 linewidth=16,
-                 alpha=0.2,
-                 label="Cenário médio")
-        # Salva a imagem e exporta os dados
-        caminho_saida = caminho + "ci"
-        plt.savefig(caminho_saida + ".png")
-        cabecalho = ["PERIODO", "CUSTO_IMEDIATO"]
-        dados = [x, cenario_medio.ci]
-        self.exporta_dados(caminho_saida, cabecalho, dados)
-        plt.close()
+        return self.__graficos_sistema("custo_imediato/",
+                                       "ci",
+                                       "CUSTO IMEDIATO DE OPERAÇÃO",
+                                       "Custo ($/MWmed)",
+                                       "CUSTO_IMEDIATO",
+                                       lambda c: c.ci)
 
-    def visualiza_alpha(self):
+    def graficos_alpha(self) -> List[Grafico]:
         """
         Gera os gráficos para acompanhamento do Custo Futuro.
         """
         logger.debug("Visualização de custos futuros...")
-        # Se o diretório para o CMO não existe, cria
-        caminho = self.caminho + "custo_futuro/"
-        if not os.path.exists(caminho):
-            os.makedirs(caminho)
-        # Um gráfico de saída para cada UTE
-        n_periodos = len(self.cenarios[0].volumes_finais[0])
-        n_cenarios = len(self.cenarios)
-        cmap = plt.get_cmap('viridis')
-        # Configurações gerais do gráfico
-        plt.figure(figsize=(12, 6))
-        plt.title("CUSTO FUTURO DE OPERAÇÃO")
-        # Eixo x:
-        plt.xlabel("Período de estudo")
-        x = np.arange(1, n_periodos + 1, 1)
-        plt.xticks(x)
-        # Eixo y:
-        plt.ylabel("Custo ($/MWmed)")
-        for j, cen in enumerate(self.cenarios):
-            plt.plot(x,
-                     cen.alpha,
-                     color=cmap(j / n_cenarios),
-                     marker="o",
-                     linewidth=4,
-                     alpha=0.2,
-                     label="Cenário {}".format(j + 1))
-        # Plota o cenário médio
-        cenario_medio = Cenario.cenario_medio(self.cenarios)
-        plt.plot(x,
-                 cenario_medio.alpha,
-                 color=cmap(1),
-                 marker="o",
-                 linewidth=16,
-                 alpha=0.2,
-                 label="Cenário médio")
-        # Salva a imagem e exporta os dados
-        caminho_saida = caminho + "alpha"
-        plt.savefig(caminho_saida + ".png")
-        cabecalho = ["PERIODO", "CUSTO_FUTURO"]
-        dados = [x, cenario_medio.alpha]
-        self.exporta_dados(caminho_saida, cabecalho, dados)
-        plt.close()
+        return self.__graficos_sistema("custo_futuro/",
+                                       "alpha",
+                                       "CUSTO FUTURO DE OPERAÇÃO",
+                                       "Custo ($/MWmed)",
+                                       "CUSTO_FUTURO",
+                                       lambda c: c.alpha)
 
-    def visualiza_fobj(self):
+    def graficos_fobj(self) -> List[Grafico]:
         """
         Gera os gráficos para acompanhamento do Custo Total.
         """
         logger.debug("Visualização de custos totais...")
-        # Se o diretório para o CMO não existe, cria
-        caminho = self.caminho + "custo_total/"
-        if not os.path.exists(caminho):
-            os.makedirs(caminho)
-        # Um gráfico de saída para cada UTE
-        n_periodos = len(self.cenarios[0].volumes_finais[0])
-        n_cenarios = len(self.cenarios)
-        cmap = plt.get_cmap('viridis')
-        # Configurações gerais do gráfico
-        plt.figure(figsize=(12, 6))
-        plt.title("CUSTO TOTAL DE OPERAÇÃO")
-        # Eixo x:
-        plt.xlabel("Período de estudo")
-        x = np.arange(1, n_periodos + 1, 1)
-        plt.xticks(x)
-        # Eixo y:
-        plt.ylabel("Custo ($/MWmed)")
-        for j, cen in enumerate(self.cenarios):
-            plt.plot(x,
-                     cen.fobj,
-                     color=cmap(j / n_cenarios),
-                     marker="o",
-                     linewidth=4,
-                     alpha=0.2,
-                     label="Cenário {}".format(j + 1))
-        # Plota o cenário médio
-        cenario_medio = Cenario.cenario_medio(self.cenarios)
-        plt.plot(x,
-                 cenario_medio.fobj,
-                 color=cmap(1),
-                 marker="o",
-                 linewidth=16,
-                 alpha=0.2,
-                 label="Cenário médio")
-        # Salva a imagem e exporta os dados
-        caminho_saida = caminho + "fobj"
-        plt.savefig(caminho_saida + ".png")
-        cabecalho = ["PERIODO", "CUSTO_TOTAL"]
-        dados = [x, cenario_medio.fobj]
-        self.exporta_dados(caminho_saida, cabecalho, dados)
-        plt.close()
+        return self.__graficos_sistema("custo_total/",
+                                       "fobj",
+                                       "CUSTO TOTAL DE OPERAÇÃO",
+                                       "Custo ($/MWmed)",
+                                       "CUSTO_TOTAL",
+                                       lambda c: c.fobj)
 
-    def visualiza_convergencia(self):
+    def graficos_convergencia(self) -> List[Grafico]:
         """
         Gera gráficos para visualização da convergência do método.
         """
         logger.debug("Visualização de convergência...")
         n_iters = len(self.z_sup)
-        cmap = plt.get_cmap('viridis')
-        # Configurações gerais do gráfico
-        plt.figure(figsize=(12, 6))
-        plt.title("CONVERGÊNCIA DA {}".format(self.metodo))
-        # Eixo x:
-        plt.xlabel("Iteração")
         x = np.arange(1, n_iters, 1)
-        plt.xticks(x)
-        # Eixo y:
-        plt.ylabel("Limites do custo ($)")
-        plt.plot(x,
-                 self.z_sup[:n_iters-1],
-                 color=cmap(0.6),
-                 marker="o",
-                 linewidth=4,
-                 alpha=0.8,
-                 label="Z_sup")
-        plt.plot(x,
-                 self.z_inf[:n_iters-1],
-                 color=cmap(0.3),
-                 marker="o",
-                 linewidth=4,
-                 alpha=0.8,
-                 label="Z_inf")
+        grafico = Grafico(self.caminho + "convergencia",
+                          "CONVERGÊNCIA DA {}".format(self.metodo),
+                          "Iteração",
+                          "Limites do custo ($)",
+                          xticks=x,
+                          legenda=True)
+        grafico.series.append(Serie(x,
+                                    np.array(self.z_sup[:n_iters-1]),
+                                    0.6,
+                                    "Z_sup",
+                                    marker="o",
+                                    linewidth=4,
+                                    alpha=0.8))
+        grafico.series.append(Serie(x,
+                                    np.array(self.z_inf[:n_iters-1]),
+                                    0.3,
+                                    "Z_inf",
+                                    marker="o",
+                                    linewidth=4,
+                                    alpha=0.8))
         if self.metodo == "PDDE":
             # Plota o intervalo de confiança
-            limite_inf = [i[0] for i in self.intervalo_conf]
-            limite_sup = [i[1] for i in self.intervalo_conf]
-            plt.fill_between(x,
-                             limite_inf,
-                             limite_sup,
-                             color=cmap(0.6),
-                             alpha=0.2,
-                             label="Área de confiança")
-        plt.legend()
-        # Salva a imagem
-        plt.savefig(self.caminho + "convergencia.png")
-        plt.close()
+            limite_inf = np.array([i[0] for i in self.intervalo_conf])
+            limite_sup = np.array([i[1] for i in self.intervalo_conf])
+            grafico.areas.append(Area(x,
+                                      limite_inf,
+                                      limite_sup,
+                                      0.6,
+                                      "Área de confiança"))
+        return [grafico]
 
-    def visualiza_cortes(self):
+    def graficos_cortes(self) -> List[Grafico]:
         """
+        Gera os gráficos dos cortes de Benders de cada período, em
+        função do volume da primeira UHE.
         """
         logger.debug("Visualização dos Cortes de Benders...")
-        caminho = self.caminho + "cortes/"
-        if not os.path.exists(caminho):
-            os.makedirs(caminho)
+        caminho = self.__diretorio("cortes/")
+        # Calcula sempre para a UHE 1
+        x = np.arange(self.uhes[0].vol_minimo,
+                      self.uhes[0].vol_maximo,
+                      1000)
+        graficos: List[Grafico] = []
         for p, cortes_p in enumerate(self.cortes):
-            if self.metodo == "PDDE":
-                plt.figure(figsize=(12, 6))
-                plt.title("CORTES PARA O PERÍODO {}".format(p + 1))
-                # Calcula sempre para a UHE 1
-                x = np.arange(self.uhes[0].vol_minimo,
-                              self.uhes[0].vol_maximo,
-                              1000)
-                max_y = 0
-                cortes = cortes_p[0]
-                for c in cortes:
-                    y = c.coef_angular[0] * x + c.termo_indep
-                    max_y = max([max_y, np.max(y)])
-                    plt.plot(x, y)
-                plt.ylim(0, max_y)
-                plt.savefig(caminho + "p{}.png".format(p + 1))
-                plt.close()
-            if self.metodo == "PDDD":
-                plt.figure(figsize=(12, 6))
-                plt.title("CORTES PARA O PERÍODO {}".format(p + 1))
-                # Calcula sempre para a UHE 1
-                x = np.arange(self.uhes[0].vol_minimo,
-                              self.uhes[0].vol_maximo,
-                              1000)
-                max_y = 0
-                for cortes in cortes_p:
-                    for c in cortes:
-                        y = c.coef_angular[0] * x + c.termo_indep
-                        max_y = max([max_y, np.max(y)])
-                        plt.plot(x, y)
-                plt.ylim(0, max_y)
-                plt.savefig(caminho + "p{}.png".format(p + 1))
-                plt.close()
-
-    def exporta_dados(self,
-                      caminho: str,
-                      cabecalhos: List[str],
-                      dados: List[list]):
-        """
-        Exporta um conjunto de dados de uma determinada visualização
-        para um formato CSV.
-        """
-        # Confere se o número de cabeçalhos é igual ao de dados
-        n_dados = len(dados[0])
-        # Confere se a quantidade de entradas de cada dado é igual
-        arq = caminho + ".csv"
-        with open(arq, "w", newline="") as arqcsv:
-            escritor = csv.writer(arqcsv,
-                                  delimiter=",",
-                                  quotechar="|",
-                                  quoting=csv.QUOTE_MINIMAL)
-            escritor.writerow(cabecalhos)
-            for i in range(n_dados):
-                escritor.writerow([d[i] for d in dados])
+            grafico = Grafico(caminho + "p{}".format(p + 1),
+                              "CORTES PARA O PERÍODO {}".format(p + 1),
+                              "",
+                              "")
+            # Na PDDE existe um conjunto de cortes por período e na
+            # PDDD um por nó. Cada coluna de y é a reta de um corte.
+            max_y = 0
+            for cortes in cortes_p:
+                if len(cortes) == 0:
+                    continue
+                y = (np.outer(cortes.coefs[:, 0], x) +
+                     cortes.termos[:, np.newaxis])
+                max_y = max([max_y, np.max(y)])
+                grafico.series.append(Serie(x, y.T))
+            grafico.ylim = (0, max_y)
+            graficos.append(grafico)
+        return graficos